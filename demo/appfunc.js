@@ -557,6 +557,11 @@ function setupAdditionalEventListeners() {
         initTerminal();
     }
 
+    // 初始化文件搜索框
+    if (typeof initFileSearch === 'function') {
+        initFileSearch();
+    }
+
     // 测试按钮已移除，不再需要此事件监听器
 }
 
@@ -7,6 +7,11 @@ const fileIcons = {
     document: '<svg viewBox="0 0 24 24" width="20" height="20"><path fill="currentColor" d="M13,9V3.5L18.5,9M6,2C4.89,2 4,2.89 4,4V20A2,2 0 0,0 6,22H18A2,2 0 0,0 20,20V8L14,2H6Z"/></svg>'
 };
 
+// 当前目录未完成的大小计算任务ID（后台计算子目录大小）
+const activeSizeJobIds = new Set();
+// 当前目录的监视任务ID
+let watchJobId = null;
+
 // 当前工作目录
 let currentWorkingDirectory = 'C:\\Users\\Documents';
 // 将当前工作目录暴露给全局作用域
@@ -236,8 +241,12 @@ function selectFolder() {
     }
 }
 
+// 常用路径中仍在探测的挂载点的重新加载间隔（毫秒）和最多重试次数
+const COMMON_PATHS_RETRY_DELAY = 1000;
+const COMMON_PATHS_MAX_RETRIES = 5;
+
 // 加载常用路径
-function loadCommonPaths() {
+function loadCommonPaths(retry = 0) {
     // 检查webview API是否可用
     if (window.pywebview && window.pywebview.api) {
         // 调用list_paths接口获取常用路径
@@ -249,6 +258,10 @@ function loadCommonPaths() {
                 } else if (Array.isArray(response.paths)) {
                     // 创建路径选择下拉菜单
                     createPathSelector(response.paths);
+                    // 响应较慢的挂载点在后台继续探测，稍后重新加载
+                    if (response.pending && retry < COMMON_PATHS_MAX_RETRIES) {
+                        setTimeout(() => loadCommonPaths(retry + 1), COMMON_PATHS_RETRY_DELAY);
+                    }
                 } else {
                     console.error('list_paths返回的数据格式不正确:', response);
                     appendTerminal('获取常用路径失败: 数据格式不正确', 'error');
@@ -282,11 +295,79 @@ function addPathSelectorToPanel(inputSelector, paths) {
     // 这里可以根据需要实现具体的路径选择功能
 }
 
-// 全局函数：加载文件列表
-function loadFileList(path) {
+// 文件列表分页大小
+const FILE_PAGE_SIZE = 500;
+// 下一页游标，为null表示已加载全部条目
+let nextPageCursor = null;
+// 是否正在加载下一页
+let isLoadingPage = false;
+// 已建立文件名索引的根目录（仓库根目录或打开的目录），其子目录不再单独建立索引
+let indexedRoot = null;
+// 当前列表是否为刷新加载，刷新时子目录大小忽略索引中的已有记录重新计算
+let refreshingSizes = false;
+
+// 将后端返回的条目转换为列表数据
+function toFileItem(f) {
+    // 确定文件类型
+    let type = f.is_file ? 'file' : 'folder';
+
+    // 如果是文件，根据扩展名确定类型
+    if (f.is_file) {
+        const ext = f.name.split('.').pop().toLowerCase();
+        if (['pdf', 'doc', 'docx', 'txt'].includes(ext)) {
+            type = 'document';
+        } else if (['jpg', 'jpeg', 'png', 'gif'].includes(ext)) {
+            type = 'image';
+        } else if (['mp4', 'avi', 'mov'].includes(ext)) {
+            type = 'video';
+        }
+    }
+
+    return {
+        name: f.name || '',
+        path: f.path || '',
+        type: type,
+        date: f.modified_time || '',
+        size: f.size_formatted || ''
+    };
+}
+
+// 记录一页返回的目录大小计算任务，并补齐返回前已经推送过的事件
+function trackSizeJob(jobId) {
+    if (!jobId) return;
+    activeSizeJobIds.add(jobId);
+    window.pywebview.api.poll_job(jobId, 0)
+        .then(job => (job.events || []).forEach(onBackendJobEvent));
+}
+
+// 取消当前目录所有未完成的大小计算任务
+function cancelSizeJobs() {
+    activeSizeJobIds.forEach(jobId => window.pywebview.api.cancel_job(jobId));
+    activeSizeJobIds.clear();
+}
+
+// 目录不在已建立索引的根目录下时，为其所属根目录建立索引
+function indexRootOf(path) {
+    if (indexedRoot && isSubPath(path, indexedRoot)) return;
+    window.pywebview.api.index_files(path)
+        .then(response => {
+            if (response.success) indexedRoot = response.root;
+        });
+}
+
+// 判断path是否为root或其子路径
+function isSubPath(path, root) {
+    if (path === root) return true;
+    const prefix = /[\\/]$/.test(root) ? root : root + (root.includes('\\') ? '\\' : '/');
+    return path.startsWith(prefix);
+}
+
+// 全局函数：加载文件列表，重新加载当前目录时视为刷新
+function loadFileList(path, refreshSizes) {
     const p = path.trim();
     if (!p) return; // 如果路径为空，不执行
 
+    refreshingSizes = refreshSizes === undefined ? p === currentWorkingDirectory : refreshSizes;
     // 更新当前工作目录
     currentWorkingDirectory = p;
     // 通知其他模块目录已改变
@@ -297,7 +378,11 @@ function loadFileList(path) {
     appendTerminal(`请求目录: ${p}`);
     // 调用webview的JavaScript API获取文件列表
     if (window.pywebview && window.pywebview.api) {
-        window.pywebview.api.get_files(p)
+        // 切换目录时取消上一个目录的大小计算任务
+        cancelSizeJobs();
+        nextPageCursor = null;
+        // 分页获取第一页，子目录大小在后台计算
+        window.pywebview.api.get_files_page(p, 'name', 'asc', null, FILE_PAGE_SIZE, true, false, refreshingSizes)
             .then(response => {
                 if (response.error) {
                     appendTerminal(`错误: ${response.error}`, 'error');
@@ -305,31 +390,15 @@ function loadFileList(path) {
                     // 使用返回的文件数据渲染文件列表
                     if (Array.isArray(response.contents)) {
                         fileData.length = 0;
-                        response.contents.forEach(f => {
-                            // 确定文件类型
-                            let type = f.is_file ? 'file' : 'folder';
-
-                            // 如果是文件，根据扩展名确定类型
-                            if (f.is_file) {
-                                const ext = f.name.split('.').pop().toLowerCase();
-                                if (['pdf', 'doc', 'docx', 'txt'].includes(ext)) {
-                                    type = 'document';
-                                } else if (['jpg', 'jpeg', 'png', 'gif'].includes(ext)) {
-                                    type = 'image';
-                                } else if (['mp4', 'avi', 'mov'].includes(ext)) {
-                                    type = 'video';
-                                }
-                            }
-
-                            fileData.push({
-                                name: f.name || '',
-                                type: type,
-                                date: f.modified_time || '',
-                                size: f.size_formatted || ''
-                            });
-                        });
+                        response.contents.forEach(f => fileData.push(toFileItem(f)));
+                        nextPageCursor = response.next_cursor || null;
                         renderFileList();
-                        appendTerminal(`列出完成: ${response.path || p}`, 'success');
+                        appendTerminal(`列出完成: ${response.path || p} (共${response.total}项)`, 'success');
+
+                        trackSizeJob(response.size_job_id);
+                        watchCurrentDirectory(p);
+                        // 在后台为所属根目录建立文件名索引，供搜索框查找文件
+                        indexRootOf(p);
 
                         // 检查文件夹内容并更新按钮文字
                         updateButtonText(response.contents);
@@ -344,21 +413,196 @@ function loadFileList(path) {
     }
 }
 
+// 加载下一页文件列表
+function loadNextFilePage() {
+    if (!nextPageCursor || isLoadingPage) return;
+    if (!(window.pywebview && window.pywebview.api)) return;
+
+    isLoadingPage = true;
+    const cursor = nextPageCursor;
+    window.pywebview.api.get_files_page(currentWorkingDirectory, 'name', 'asc', cursor, FILE_PAGE_SIZE, true, false,
+                                        refreshingSizes)
+        .then(response => {
+            // 加载期间已切换目录时丢弃结果
+            if (cursor !== nextPageCursor) return;
+            if (response.error) {
+                nextPageCursor = null;
+                appendTerminal(`错误: ${response.error}`, 'error');
+                return;
+            }
+            const items = (response.contents || []).map(toFileItem);
+            items.forEach(item => fileData.push(item));
+            nextPageCursor = response.next_cursor || null;
+            appendFileRows(items);
+            trackSizeJob(response.size_job_id);
+        })
+        .catch(error => {
+            appendTerminal(`获取文件列表失败: ${error}`, 'error');
+        })
+        .finally(() => {
+            isLoadingPage = false;
+        });
+}
+
+// 创建文件列表行
+function createFileRow(f) {
+    const row = document.createElement('div');
+    row.className = 'file-item-detailed';
+    row.dataset.path = f.path || '';
+    row.innerHTML = `
+        <div class="file-cell file-size">${f.size || ''}</div>
+        <div class="file-cell file-name">${f.name || ''}</div>
+    `;
+    row.addEventListener('click', () => appendTerminal(`点击: ${f.name}`));
+    return row;
+}
+
+// 追加文件列表行
+function appendFileRows(items) {
+    const fileList = document.querySelector('.file-list');
+    if (!fileList) return;
+
+    const fragment = document.createDocumentFragment();
+    items.forEach(f => fragment.appendChild(createFileRow(f)));
+    fileList.appendChild(fragment);
+}
+
 // 渲染文件列表
 function renderFileList() {
     const fileList = document.querySelector('.file-list');
     if (!fileList) return;
 
     fileList.innerHTML = '';
-    fileData.forEach(f => {
-        const row = document.createElement('div');
-        row.className = 'file-item-detailed';
-        row.innerHTML = `
-            <div class="file-cell file-size">${f.size || ''}</div>
-            <div class="file-cell file-name">${f.name || ''}</div>
-        `;
-        row.addEventListener('click', () => appendTerminal(`点击: ${f.name}`));
-        fileList.appendChild(row);
+    appendFileRows(fileData);
+
+    // 滚动到接近底部时加载下一页
+    if (!fileList.dataset.pagingBound) {
+        fileList.dataset.pagingBound = 'true';
+        fileList.addEventListener('scroll', () => {
+            if (fileList.scrollTop + fileList.clientHeight >= fileList.scrollHeight - 200) {
+                loadNextFilePage();
+            }
+        });
+    }
+}
+
+// 监视当前目录，目录变化时由后端推送增量
+function watchCurrentDirectory(path) {
+    watchJobId = null;
+    window.pywebview.api.watch_directory(path)
+        .then(response => {
+            if (response.success && path === currentWorkingDirectory) {
+                watchJobId = response.job_id;
+            }
+        });
+}
+
+// 将监视任务推送的增量应用到文件列表
+function applyDirectoryDelta(event) {
+    const removed = new Set((event.removed || []).map(f => f.path));
+    const changed = new Map();
+    (event.modified || []).concat(event.added || []).forEach(f => changed.set(f.path, toFileItem(f)));
+
+    for (let i = fileData.length - 1; i >= 0; i--) {
+        const item = fileData[i];
+        if (removed.has(item.path)) {
+            fileData.splice(i, 1);
+        } else if (changed.has(item.path)) {
+            fileData[i] = changed.get(item.path);
+            changed.delete(item.path);
+        }
+    }
+    // 新增的条目在所有页加载完成后才插入，避免与后续分页结果重复
+    if (!nextPageCursor) {
+        changed.forEach(item => fileData.push(item));
+    }
+    renderFileList();
+    // 新增或修改的子目录大小在后台计算
+    trackSizeJob(event.size_job_id);
+}
+
+// 处理后端推送的后台任务事件
+function onBackendJobEvent(event) {
+    if (!event) return;
+    if (event.kind === 'watch') {
+        if (event.job_id !== watchJobId) return;
+        if (event.type === 'delta') {
+            applyDirectoryDelta(event);
+        } else if (event.type === 'gone') {
+            appendTerminal(`目录已被删除或移动: ${event.path}`, 'error');
+        }
+        return;
+    }
+    if (!activeSizeJobIds.has(event.job_id)) return;
+
+    if (event.type === 'size' || event.type === 'estimate') {
+        // 更新对应目录的大小（estimate为估算值，总是先于精确值推送）
+        const item = fileData.find(f => f.path === event.path);
+        if (item) {
+            item.size = event.size_formatted || '';
+        }
+        const row = Array.from(document.querySelectorAll('.file-list .file-item-detailed'))
+            .find(r => r.dataset.path === event.path);
+        const sizeCell = row && row.querySelector('.file-size');
+        if (sizeCell) {
+            sizeCell.textContent = event.size_formatted || '';
+        }
+    } else if (event.type === 'done' || event.type === 'cancelled' || event.type === 'error') {
+        activeSizeJobIds.delete(event.job_id);
+        if (event.error) {
+            appendTerminal(`计算目录大小失败: ${event.error}`, 'error');
+        }
+    }
+}
+
+// 文件搜索的防抖定时器
+let fileSearchTimer = null;
+
+// 在当前目录的文件名索引中模糊查找文件，结果显示在文件列表中
+function searchFiles(query) {
+    const root = currentWorkingDirectory;
+    if (!query) {
+        loadFileList(root, false);
+        return;
+    }
+    window.pywebview.api.find_files(root, query, 100)
+        .then(response => {
+            if (!response.success) {
+                appendTerminal(`搜索文件失败: ${response.error}`, 'error');
+                return;
+            }
+            const input = document.getElementById('file-search-input');
+            // 结果返回前输入已变化时丢弃
+            if (!input || input.value.trim() !== query || root !== currentWorkingDirectory) return;
+            fileData.length = 0;
+            response.results.forEach(f => fileData.push(toFileItem({
+                name: f.rel,
+                path: f.path,
+                is_file: true
+            })));
+            nextPageCursor = null;
+            renderFileList();
+            if (response.indexing) {
+                appendTerminal(`文件索引更新中，已索引${response.indexed_files}个文件`, 'info');
+            }
+        })
+        .catch(error => {
+            appendTerminal(`搜索文件失败: ${error}`, 'error');
+        });
+}
+
+// 初始化文件搜索框
+function initFileSearch() {
+    const input = document.getElementById('file-search-input');
+    if (!input) return;
+
+    input.addEventListener('input', () => {
+        clearTimeout(fileSearchTimer);
+        fileSearchTimer = setTimeout(() => {
+            if (window.pywebview && window.pywebview.api) {
+                searchFiles(input.value.trim());
+            }
+        }, 150);
     });
 }
 
@@ -425,4 +669,5 @@ function afterImportSuccess() {
 
 // 将函数暴露给全局作用域，以便其他模块调用
 window.afterImportSuccess = afterImportSuccess;
-window.updateButtonText = updateButtonText;
\ No newline at end of file
+window.updateButtonText = updateButtonText;
+window.onBackendJobEvent = onBackendJobEvent;
\ No newline at end of file
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+归档导出模块
+在后台任务中把目录树流式写入zip或tar.gz文件，文件内容按块读取，内存占用与文件大小无关。
+tar.gz把tar数据流切成固定大小的块，在多个线程中分别压缩为独立的gzip成员后按顺序拼接
+（多成员gzip是标准格式，gzip/tar均可直接解压）；zip按条目顺序压缩
+"""
+
+import os
+import stat
+import gzip
+import time
+import shutil
+import zipfile
+import tarfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from response_utils import create_response_dict
+import format_func
+import gitignore_func
+import job_func
+import scan_func
+import worker_pool
+
+# 支持的归档格式
+ARCHIVE_FORMATS = ("zip", "tar.gz")
+# tar.gz每个gzip成员压缩的数据块大小
+GZIP_CHUNK_SIZE = 1024 * 1024
+# 压缩级别
+COMPRESS_LEVEL = 6
+# 推送进度事件的最小间隔（秒）
+PROGRESS_INTERVAL = 0.5
+
+
+class ParallelGzipWriter:
+    """
+    多线程gzip写入器
+
+    写入的数据按GZIP_CHUNK_SIZE切块，每块在线程池中压缩为一个gzip成员（zlib压缩时释放GIL），
+    按提交顺序写入输出文件；同时压缩的块数量有上限，内存占用有界
+    """
+
+    def __init__(self, fileobj, threads, level=COMPRESS_LEVEL, chunk_size=GZIP_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.level = level
+        self.chunk_size = chunk_size
+        self.max_in_flight = threads * 2
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="gzip")
+        self._buffer = bytearray()
+        self._pending = deque()
+
+    def _submit(self, data):
+        while len(self._pending) >= self.max_in_flight:
+            self.fileobj.write(self._pending.popleft().result())
+        self._pending.append(self._executor.submit(gzip.compress, bytes(data), self.level, mtime=0))
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._submit(self._buffer[:self.chunk_size])
+            del self._buffer[:self.chunk_size]
+        return len(data)
+
+    def close(self):
+        """压缩剩余数据并等待全部块写入输出文件"""
+        try:
+            if self._buffer or not self._pending:
+                self._submit(self._buffer)
+                self._buffer = bytearray()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _ExportProgress:
+    """按时间间隔推送progress事件"""
+
+    def __init__(self, job, total_files, total_bytes):
+        self.job = job
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files = 0
+        self.dirs = 0
+        self.bytes = 0
+        self.skipped = 0
+        self.truncated = 0
+        self._last_emit = time.monotonic()
+
+    def add(self, kind, size):
+        if kind == "dir":
+            self.dirs += 1
+        else:
+            self.files += 1
+        self.bytes += size
+        now = time.monotonic()
+        if now - self._last_emit >= PROGRESS_INTERVAL:
+            self._last_emit = now
+            self.emit()
+
+    def emit(self):
+        self.job.emit(
+            "progress",
+            files=self.files,
+            total_files=self.total_files,
+            bytes=self.bytes,
+            total_bytes=self.total_bytes,
+            bytes_formatted=format_func.format_size(self.bytes),
+            skipped=self.skipped
+        )
+
+
+def _collect_files(root, output_path, respect_gitignore):
+    """
+    列出需要导出的条目，跳过输出文件本身
+
+    Returns:
+        list: (路径, 类型, 大小)列表，类型为"dir"、"file"或"symlink"，父目录总是在其中的条目之前；
+        符号链接不跟随，在zip和tar.gz中都保存为链接本身
+    """
+    ignore = gitignore_func.matcher_for(root) if respect_gitignore else None
+    entries = []
+    for entry in scan_func.iter_tree(root, ignore):
+        if entry.path == output_path:
+            continue
+        try:
+            if entry.is_symlink():
+                entries.append((entry.path, "symlink", 0))
+            elif entry.is_dir(follow_symlinks=False):
+                entries.append((entry.path, "dir", 0))
+            else:
+                entries.append((entry.path, "file", entry.stat(follow_symlinks=False).st_size))
+        except OSError:
+            continue
+    return entries
+
+
+class _PaddedReader:
+    """
+    tar成员的数据源：文件在写入期间变短时用零补齐到头部记录的大小，保证tar数据流不被破坏
+    """
+
+    def __init__(self, file, progress):
+        self.file = file
+        self.progress = progress
+        self.padded = False
+
+    def read(self, size):
+        data = self.file.read(size)
+        if len(data) < size:
+            if not self.padded:
+                self.padded = True
+                self.progress.truncated += 1
+            data += b"\0" * (size - len(data))
+        return data
+
+
+def _zip_link_info(path, arcname):
+    """符号链接的zip条目：按Info-ZIP的约定在外部属性中记录S_IFLNK，数据为链接目标"""
+    st = os.lstat(path)
+    info = zipfile.ZipInfo(arcname, max(time.localtime(st.st_mtime)[:6], (1980, 1, 1, 0, 0, 0)))
+    info.create_system = 3
+    info.external_attr = (stat.S_IFLNK | 0o777) << 16
+    return info
+
+
+def _write_zip(job, root, files, output, progress):
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=COMPRESS_LEVEL) as archive:
+        for path, kind, size in files:
+            if job.cancelled:
+                return
+            arcname = os.path.relpath(path, root).replace(os.sep, "/")
+            # 只跳过写入条目之前的错误（文件已删除、无法打开等），之后的读取错误使导出失败
+            try:
+                if kind == "symlink":
+                    info = _zip_link_info(path, arcname)
+                    target = os.readlink(path)
+                else:
+                    info = zipfile.ZipInfo.from_file(path, arcname)
+                    if kind == "file":
+                        source = open(path, "rb")
+            except OSError:
+                progress.skipped += 1
+                continue
+            if kind == "symlink":
+                archive.writestr(info, os.fsencode(target))
+            elif kind == "dir":
+                archive.writestr(info, b"")
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with source, archive.open(info, "w") as dest:
+                    shutil.copyfileobj(source, dest, GZIP_CHUNK_SIZE)
+            progress.add(kind, size)
+
+
+def _write_tar_gz(job, root, files, output, progress, threads):
+    writer = ParallelGzipWriter(output, threads)
+    try:
+        with tarfile.open(fileobj=writer, mode="w|", format=tarfile.PAX_FORMAT) as archive:
+            for path, kind, size in files:
+                if job.cancelled:
+                    return
+                arcname = os.path.relpath(path, root).replace(os.sep, "/")
+                # tar头写入后数据流中必须紧跟声明大小的数据：只跳过写头之前的错误，
+                # 文件变短时补零，读取出错时使导出失败
+                try:
+                    if kind == "file":
+                        source = open(path, "rb")
+                        info = archive.gettarinfo(path, arcname, source)
+                    else:
+                        # gettarinfo使用lstat，符号链接保存为链接本身
+                        info = archive.gettarinfo(path, arcname)
+                except OSError:
+                    progress.skipped += 1
+                    continue
+                if kind == "file":
+                    with source:
+                        archive.addfile(info, _PaddedReader(source, progress))
+                else:
+                    archive.addfile(info)
+                progress.add(kind, size)
+    finally:
+        writer.close()
+
+
+def _export_job(job, root, output_path, archive_format, respect_gitignore, threads):
+    """
+    导出任务：先列出文件得到总量，写入期间推送progress事件；取消或失败时删除未完成的文件
+    """
+    files = _collect_files(root, output_path, respect_gitignore)
+    progress = _ExportProgress(job, sum(kind != "dir" for _, kind, _ in files), sum(size for _, _, size in files))
+    progress.emit()
+    temp_path = output_path + ".part"
+    try:
+        with open(temp_path, "wb") as output:
+            if archive_format == "zip":
+                _write_zip(job, root, files, output, progress)
+            else:
+                _write_tar_gz(job, root, files, output, progress, threads)
+        if job.cancelled:
+            os.remove(temp_path)
+            return None
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    progress.emit()
+    return {
+        "root": root,
+        "output_path": output_path,
+        "format": archive_format,
+        "files": progress.files,
+        "dirs": progress.dirs,
+        "skipped": progress.skipped,
+        "truncated": progress.truncated,
+        "bytes": progress.bytes,
+        "bytes_formatted": format_func.format_size(progress.bytes),
+        "archive_size": os.path.getsize(output_path),
+        "archive_size_formatted": format_func.format_size(os.path.getsize(output_path))
+    }
+
+
+def export_archive(root, output_path, archive_format="zip", respect_gitignore=False, threads=None, overwrite=False):
+    """
+    在后台把目录导出为归档文件（总是跳过.git等版本控制目录）
+
+    Args:
+        root (str): 要导出的目录
+        output_path (str): 归档文件路径
+        archive_format (str): 归档格式，zip或tar.gz
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+        threads (int): tar.gz的压缩线程数，为None时与磁盘IO线程池的线程数相同
+        overwrite (bool): 归档文件已存在时是否覆盖
+
+    Returns:
+        dict: 包含job_id的响应字典，写入期间推送progress事件，结果在任务结束事件的result中
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        return create_response_dict(success=False, error=f"不支持的归档格式: {archive_format}")
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    output_path = os.path.abspath(output_path)
+    if os.path.isdir(output_path):
+        return create_response_dict(success=False, error="输出路径是目录")
+    if os.path.exists(output_path) and not overwrite:
+        return create_response_dict(success=False, error="输出文件已存在")
+    if not os.path.isdir(os.path.dirname(output_path)):
+        return create_response_dict(success=False, error="输出目录不存在")
+    threads = max(1, int(threads)) if threads else worker_pool.get_max_workers()
+    job = job_func.start_job("export", _export_job, os.path.abspath(root), output_path, archive_format,
+                             bool(respect_gitignore), threads)
+    return create_response_dict(success=True, job_id=job.job_id)
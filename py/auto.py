@@ -15,6 +15,8 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from command_func import GitHubCommand
+import hash_cache
+import tree_snapshot
 from response_utils import create_response_dict
 from data_processing.get_yaml import get_yaml_str_value
 
@@ -47,21 +49,42 @@ class AutoGitHubCommand(GitHubCommand):
                 interval_seconds = 60  # 默认60秒
         def auto_commit_push_task():
             """自动提交推送任务函数"""
+            # 上次提交推送成功时工作区的内容摘要，内容没有变化时跳过本轮
+            last_digest = None
             while not (stop_event and stop_event.is_set()):
                 try:
-                    result = AutoGitHubCommand.git_commit_and_push(repo_path, commit_message, branch)
-                    if result and result.get('success'):
-                        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 自动提交推送成功")
+                    # 先用目录树快照判断自上一轮以来是否有文件变化，没有变化且上一轮的内容已经提交时
+                    # 不需要读取文件计算摘要
+                    try:
+                        changes = tree_snapshot.changed_paths(repo_path, consumer="auto_commit")
+                    except Exception:
+                        changes = None
+                    if changes == [] and last_digest is not None:
+                        digest = last_digest
                     else:
-                        error_msg = "未知错误"
-                        if result:
-                            # 先尝试获取error字段
-                            if 'error' in result:
-                                error_msg = result['error'] or "无错误信息"
-                            # 再尝试获取output字段
-                            elif 'output' in result:
-                                error_msg = result['output'] or "无错误信息"
-                        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 自动提交推送失败: {error_msg}")
+                        try:
+                            digest, _ = hash_cache.get_hash_cache().tree_digest(repo_path)
+                        except Exception:
+                            digest = None
+                    if digest is not None and digest == last_digest:
+                        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 工作区内容没有变化，跳过自动提交推送")
+                    else:
+                        result = AutoGitHubCommand.git_commit_and_push(repo_path, commit_message, branch)
+                        if result and result.get('success'):
+                            last_digest = digest
+                            print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 自动提交推送成功")
+                        else:
+                            # 本轮的内容没有提交，下一轮即使快照没有变化也要重新计算摘要并重试
+                            last_digest = None
+                            error_msg = "未知错误"
+                            if result:
+                                # 先尝试获取error字段
+                                if 'error' in result:
+                                    error_msg = result['error'] or "无错误信息"
+                                # 再尝试获取output字段
+                                elif 'output' in result:
+                                    error_msg = result['output'] or "无错误信息"
+                            print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 自动提交推送失败: {error_msg}")
                 except Exception as e:
                     print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 自动提交推送任务发生异常: {str(e)}")
                 
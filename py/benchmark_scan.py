@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录扫描基准测试脚本
+对比旧版listdir/stat/isfile/walk实现与scandir扫描引擎在同一目录树上的
+文件系统调用次数和耗时
+
+用法:
+    python benchmark_scan.py [文件数量] [已有目录路径]
+
+未指定目录时在临时目录中生成包含指定数量文件（默认100000）的目录树。
+调用次数在Python层统计：os.stat/os.lstat/os.listdir/os.scandir的调用，
+以及每个DirEntry首次获取stat信息（DirEntry会缓存结果，之后不再产生系统调用）。
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from datetime import datetime
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scan_func
+
+
+class SyscallCounter:
+    """通过替换os模块函数统计文件系统调用次数"""
+
+    def __init__(self):
+        self.counts = {}
+        self._originals = {}
+
+    def _count(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def _wrap(self, name):
+        original = getattr(os, name)
+        self._originals[name] = original
+
+        def wrapper(*args, **kwargs):
+            self._count(name)
+            return original(*args, **kwargs)
+        return wrapper
+
+    def _wrap_scandir(self):
+        original = os.scandir
+        self._originals['scandir'] = original
+        counter = self
+
+        class CountingEntry:
+            """代理DirEntry，记录首次真正产生系统调用的stat请求"""
+
+            def __init__(self, entry):
+                self._entry = entry
+                self._fetched = set()
+
+            def __getattr__(self, name):
+                return getattr(self._entry, name)
+
+            def stat(self, *, follow_symlinks=True):
+                # 非符号链接的两种stat共享同一次lstat结果
+                key = follow_symlinks and self._entry.is_symlink()
+                if key not in self._fetched:
+                    self._fetched.add(key)
+                    counter._count('DirEntry.stat')
+                return self._entry.stat(follow_symlinks=follow_symlinks)
+
+        class CountingScandir:
+            def __init__(self, it):
+                self._it = it
+
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                return CountingEntry(next(self._it))
+
+            def close(self):
+                self._it.close()
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._it.close()
+
+        def wrapper(*args, **kwargs):
+            self._count('scandir')
+            return CountingScandir(original(*args, **kwargs))
+        return wrapper
+
+    def __enter__(self):
+        os.scandir = self._wrap_scandir()
+        for name in ('stat', 'lstat', 'listdir'):
+            setattr(os, name, self._wrap(name))
+        return self
+
+    def __exit__(self, *exc):
+        for name, original in self._originals.items():
+            setattr(os, name, original)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+
+def legacy_get_directory_size(path):
+    """旧版实现：os.walk + os.path.exists + os.path.getsize"""
+    total_size = 0
+    try:
+        for dirpath, dirnames, filenames in os.walk(path):
+            for filename in filenames:
+                filepath = os.path.join(dirpath, filename)
+                if os.path.exists(filepath):
+                    total_size += os.path.getsize(filepath)
+    except PermissionError:
+        pass
+    return total_size
+
+
+def legacy_get_directory_contents(path):
+    """旧版实现：os.listdir + os.stat + os.path.isfile，子目录逐个递归统计"""
+    contents = []
+    for item in os.listdir(path):
+        item_path = os.path.join(path, item)
+        stat_info = os.stat(item_path)
+        if os.path.isfile(item_path):
+            size = stat_info.st_size
+        else:
+            size = legacy_get_directory_size(item_path)
+        mtime = datetime.fromtimestamp(stat_info.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+        contents.append({"name": item, "path": item_path, "size": size, "modified_time": mtime})
+    return contents
+
+
+def scandir_get_directory_contents(path):
+    """新版实现：scandir扫描引擎，不使用持久化索引"""
+    contents = []
+    for entry in scan_func.scan_directory(path):
+        size = entry["size"] if entry["is_file"] else scan_func.walk_size(entry["path"])
+        mtime = datetime.fromtimestamp(entry["mtime"]).strftime('%Y-%m-%d %H:%M:%S')
+        contents.append({"name": entry["name"], "path": entry["path"], "size": size, "modified_time": mtime})
+    return contents
+
+
+def build_tree(root, file_count):
+    """生成测试目录树：10个顶层目录，每个10个子目录，文件平均分布"""
+    leaf_dirs = [os.path.join(root, f"top{i}", f"sub{j}") for i in range(10) for j in range(10)]
+    for leaf in leaf_dirs:
+        os.makedirs(leaf, exist_ok=True)
+    for n in range(file_count):
+        with open(os.path.join(leaf_dirs[n % len(leaf_dirs)], f"file{n}.txt"), 'wb') as f:
+            f.write(b'x' * (n % 512))
+
+
+def run_benchmark(root):
+    """在指定目录上分别运行新旧实现并打印结果"""
+    results = {}
+    for label, func in (("旧版 listdir/stat/walk", legacy_get_directory_contents),
+                        ("新版 scandir引擎", scandir_get_directory_contents)):
+        with SyscallCounter() as counter:
+            start = time.perf_counter()
+            contents = func(root)
+            elapsed = time.perf_counter() - start
+        total_size = sum(item["size"] for item in contents)
+        results[label] = (counter, elapsed, total_size)
+        print(f"{label}:")
+        print(f"   调用次数: {counter.total} {counter.counts}")
+        print(f"   耗时: {elapsed:.3f}秒, 统计总大小: {total_size}")
+
+    sizes = {total_size for _, _, total_size in results.values()}
+    print(f"\n结果一致: {'是' if len(sizes) == 1 else '否'}")
+    return results
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    target = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if target:
+        run_benchmark(target)
+    else:
+        tmp_root = tempfile.mkdtemp(prefix="scan_bench_")
+        try:
+            print(f"生成测试目录树: {file_count}个文件 -> {tmp_root}")
+            build_tree(tmp_root, file_count)
+            run_benchmark(tmp_root)
+        finally:
+            shutil.rmtree(tmp_root, ignore_errors=True)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录比较模块
+在磁盘IO线程池中同时遍历两棵目录树并各自生成tree_snapshot快照，再按路径顺序归并比较：
+大小不同的文件直接判定为不同，大小相同且修改时间一致的文件视为相同，
+只有大小相同但修改时间不同的文件才通过hash_cache比较内容；最后生成复制、删除和冲突的同步计划
+"""
+
+import os
+import shutil
+import tempfile
+
+from response_utils import create_response_dict
+import format_func
+import gitignore_func
+import hash_cache
+import job_func
+import tree_snapshot
+import worker_pool
+
+# 同步模式：mirror使b与a一致，two_way双向同步（较新的一方覆盖另一方）
+SYNC_MODES = ("mirror", "two_way")
+# 修改时间相差不超过该值（纳秒）视为相同，兼容FAT和压缩包等只保存2秒精度时间的来源
+MTIME_TOLERANCE_NS = 2 * 10 ** 9
+# 每类计划默认最多返回的条目数量
+DEFAULT_MAX_ITEMS = 5000
+
+
+def _native(root, rel):
+    return os.path.join(root, *rel.split("/"))
+
+
+def _record_info(record):
+    return {"size": record[2], "mtime": record[3] / 1e9, "is_dir": bool(record[1] & tree_snapshot.FLAG_DIR)}
+
+
+class SyncPlan:
+    """
+    同步计划：复制、删除和冲突三类条目，每类最多保留max_items条，数量和复制字节数始终完整统计
+    """
+
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self.items = {"copy": [], "delete": [], "conflicts": []}
+        self.counts = {"copy": 0, "delete": 0, "conflicts": 0, "identical": 0}
+        self.copy_bytes = 0
+
+    def _add(self, kind, item):
+        self.counts[kind] += 1
+        if len(self.items[kind]) < self.max_items:
+            self.items[kind].append(item)
+            return item
+        return None
+
+    def copy(self, rel, source, record, reason):
+        """添加一项复制，返回条目（超出数量时为None），目录的大小在遍历其后代时累加"""
+        self.copy_bytes += record[2] if not record[1] & tree_snapshot.FLAG_DIR else 0
+        return self._add("copy", {
+            "path": rel,
+            "from": source,
+            "is_dir": bool(record[1] & tree_snapshot.FLAG_DIR),
+            "size": 0 if record[1] & tree_snapshot.FLAG_DIR else record[2],
+            "reason": reason
+        })
+
+    def delete(self, rel, side, record):
+        self._add("delete", {"path": rel, "side": side, "is_dir": bool(record[1] & tree_snapshot.FLAG_DIR)})
+
+    def conflict(self, rel, a_record, b_record, reason):
+        self._add("conflicts", {"path": rel, "reason": reason, "a": _record_info(a_record), "b": _record_info(b_record)})
+
+    def result(self):
+        result = dict(self.items)
+        result["counts"] = dict(self.counts)
+        result["copy_bytes"] = self.copy_bytes
+        result["copy_bytes_formatted"] = format_func.format_size(self.copy_bytes)
+        result["truncated"] = any(self.counts[kind] > len(items) for kind, items in self.items.items())
+        return result
+
+
+def _plan_difference(plan, rel, a_record, b_record, mode):
+    """为内容不同的同名文件生成计划"""
+    a_mtime, b_mtime = a_record[3], b_record[3]
+    if mode == "mirror":
+        if b_mtime - a_mtime > MTIME_TOLERANCE_NS:
+            # b中的文件较新，覆盖会丢失修改
+            plan.conflict(rel, a_record, b_record, "target_newer")
+        else:
+            plan.copy(rel, "a", a_record, "different")
+    elif abs(a_mtime - b_mtime) <= MTIME_TOLERANCE_NS:
+        plan.conflict(rel, a_record, b_record, "same_mtime")
+    elif a_mtime > b_mtime:
+        plan.copy(rel, "a", a_record, "newer")
+    else:
+        plan.copy(rel, "b", b_record, "newer")
+
+
+def _compare_job(job, a, b, mode, respect_gitignore, max_items):
+    """
+    比较任务：两侧的快照在线程池中同时生成，完成后推送stage事件，结果为同步计划
+    """
+    temp_dir = tempfile.mkdtemp(prefix="compare-")
+    try:
+        should_stop = lambda: job.cancelled
+        executor = worker_pool.get_io_executor()
+        futures = [
+            executor.submit(tree_snapshot.write_snapshot, root, os.path.join(temp_dir, name),
+                            gitignore_func.matcher_for(root) if respect_gitignore else None, should_stop)
+            for root, name in ((a, "a.snap"), (b, "b.snap"))
+        ]
+        counts = [future.result() for future in futures]
+        if None in counts:
+            return None
+        job.emit("stage", stage="compare", a_entries=counts[0], b_entries=counts[1])
+
+        plan = SyncPlan(max_items)
+        ambiguous = []
+        # 已整体计划的目录前缀，其后代紧随其后且不再单独处理；整体复制时累加后代的大小
+        covered = None
+        covered_copy = False
+        covered_item = None
+        with tree_snapshot.TreeSnapshot(os.path.join(temp_dir, "a.snap")) as a_snapshot, \
+                tree_snapshot.TreeSnapshot(os.path.join(temp_dir, "b.snap")) as b_snapshot:
+            for a_record, b_record in tree_snapshot.merge_snapshots(a_snapshot, b_snapshot):
+                if job.cancelled:
+                    return None
+                record = a_record or b_record
+                if covered is not None and record[0].startswith(covered):
+                    if covered_copy and not record[1] & tree_snapshot.FLAG_DIR:
+                        plan.copy_bytes += record[2]
+                        if covered_item is not None:
+                            covered_item["size"] += record[2]
+                    continue
+                covered = covered_item = None
+                covered_copy = False
+                rel = record[0].decode("utf-8", "surrogateescape")
+                is_dir = bool(record[1] & tree_snapshot.FLAG_DIR)
+
+                if b_record is None or a_record is None:
+                    side = "a" if b_record is None else "b"
+                    if side == "b" and mode == "mirror":
+                        plan.delete(rel, "b", record)
+                    else:
+                        covered_copy = True
+                        covered_item = plan.copy(rel, side, record, "missing")
+                    if is_dir:
+                        covered = record[0] + b"/"
+                    continue
+
+                if (a_record[1] ^ b_record[1]) & tree_snapshot.FLAG_DIR:
+                    plan.conflict(rel, a_record, b_record, "type")
+                    covered = record[0] + b"/"
+                    continue
+                if is_dir:
+                    continue
+                if a_record[2] != b_record[2]:
+                    _plan_difference(plan, rel, a_record, b_record, mode)
+                elif abs(a_record[3] - b_record[3]) <= MTIME_TOLERANCE_NS:
+                    plan.counts["identical"] += 1
+                else:
+                    ambiguous.append((rel, a_record, b_record))
+
+        job.emit("stage", stage="hash", files=len(ambiguous))
+        if ambiguous:
+            a_paths = [_native(a, rel) for rel, _, _ in ambiguous]
+            b_paths = [_native(b, rel) for rel, _, _ in ambiguous]
+            digests = hash_cache.get_hash_cache().get_digests(a_paths + b_paths, job=job)
+            if job.cancelled:
+                return None
+            for (rel, a_record, b_record), a_path, b_path in zip(ambiguous, a_paths, b_paths):
+                a_digest = digests.get(os.path.abspath(a_path))
+                if a_digest is not None and a_digest == digests.get(os.path.abspath(b_path)):
+                    plan.counts["identical"] += 1
+                else:
+                    _plan_difference(plan, rel, a_record, b_record, mode)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    result = plan.result()
+    result.update({"a": a, "b": b, "mode": mode, "hashed": len(ambiguous)})
+    return result
+
+
+def compare_directories(a, b, mode="mirror", respect_gitignore=False, max_items=DEFAULT_MAX_ITEMS):
+    """
+    在后台比较两个目录并生成同步计划
+
+    Args:
+        a (str): 第一个目录（mirror模式下为源目录）
+        b (str): 第二个目录（mirror模式下为目标目录）
+        mode (str): 同步模式，mirror使b与a一致，two_way双向同步
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树（总是跳过.git等版本控制目录）
+        max_items (int): 复制、删除和冲突每类最多返回的条目数量
+
+    Returns:
+        dict: 包含job_id的响应字典，结果在任务结束事件的result中，包含以下键:
+            - copy: 复制条目(path, from, is_dir, size, reason)，整个目录缺失时只有一项
+            - delete: 删除条目(path, side, is_dir)，只在mirror模式下出现
+            - conflicts: 冲突条目(path, reason, a, b)，reason为type/target_newer/same_mtime
+            - counts: 各类条目以及相同文件的完整数量
+            - copy_bytes: 需要复制的字节数
+            - hashed: 需要比较内容的文件数量
+    """
+    if mode not in SYNC_MODES:
+        return create_response_dict(success=False, error=f"不支持的同步模式: {mode}")
+    for path in (a, b):
+        if not os.path.isdir(path):
+            return create_response_dict(success=False, error=f"指定路径不是目录: {path}")
+    a, b = os.path.abspath(a), os.path.abspath(b)
+    if a == b:
+        return create_response_dict(success=False, error="不能比较同一个目录")
+    job = job_func.start_job("compare", _compare_job, a, b, mode, bool(respect_gitignore), max(1, int(max_items)))
+    return create_response_dict(success=True, job_id=job.job_id)
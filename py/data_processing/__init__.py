@@ -16,7 +16,8 @@ from .get_yaml import (
     get_all_configs,
     get_yaml_str_value,
     get_yaml_list_value,
-    set_config_needs_reload  # 新增函数：设置配置需要重新加载的标志
+    set_config_needs_reload,  # 新增函数：设置配置需要重新加载的标志
+    add_reload_listener
 )
 
 # 从save_yaml模块导入YAML保存功能
@@ -49,6 +50,7 @@ __all__ = [
     "get_yaml_str_value",
     "get_yaml_list_value",
     "set_config_needs_reload",  # 导出新增函数
+    "add_reload_listener",
     
     # save_yaml模块
     "save_yaml_config",
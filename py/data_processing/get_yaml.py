@@ -66,6 +66,19 @@ def _load_settings():
     return config
 
 
+# 全局变量：配置更新后需要调用的函数列表
+_reload_listeners = []
+
+def add_reload_listener(listener):
+    """
+    注册配置更新后调用的函数，用于刷新各模块缓存的配置值
+    
+    参数:
+        listener (callable): 无参数的函数，不应抛出异常
+    """
+    _reload_listeners.append(listener)
+
+
 def set_config_needs_reload(needs_reload=True):
     """
     设置配置是否需要重新加载
@@ -76,9 +89,11 @@ def set_config_needs_reload(needs_reload=True):
     global _config_needs_reload, _cached_all_configs
     _config_needs_reload = needs_reload
     
-    # 如果需要重新加载，清除所有配置的缓存
+    # 如果需要重新加载，清除所有配置的缓存并通知注册的模块
     if needs_reload:
         _cached_all_configs = None
+        for listener in list(_reload_listeners):
+            listener()
 
 
 def get_git_config():
@@ -1,39 +1,74 @@
 import os
 import sys
 import json
+import stat
+import time
 from datetime import datetime
+from concurrent.futures import as_completed
 from response_utils import create_response_dict
 import format_func
+import gitignore_func
+import job_func
+import listing_cache
+import listing_snapshot
+import path_probe
+import read_func
+import sniff_func
+import scan_func
+import size_index
+import size_estimate
+import worker_pool
 from data_processing.update_yaml import update_path_config
 
 
-def get_directory_size(path):
+# 异步列表中一页子目录大小估算的总时间预算（秒）
+ESTIMATE_PAGE_BUDGET = 0.2
+# 列出常用路径时等待挂载点探测的最长时间（秒）
+PATH_PROBE_TIMEOUT = 0.3
+
+
+def get_directory_size(path, use_index=True, estimate=False, exclude_ignored=False, dedup_hardlinks=False,
+                       one_filesystem=False, refresh=False):
     """
     递归计算目录大小
 
+    默认使用持久化的目录大小索引，只重新扫描修改时间发生变化的目录
+
     Args:
         path (str): 目录路径
+        use_index (bool): 是否使用目录大小索引，为False时完整遍历目录树
+        estimate (bool): 为True时在毫秒级的时间预算内抽样估算，误差范围见estimate_directory_size
+        exclude_ignored (bool): 为True时按.gitignore规则跳过被忽略的文件和子树（不使用索引）
+        dedup_hardlinks (bool): 为True时硬链接的文件只统计一次，重复出现的目录只遍历一次（不使用索引）
+        one_filesystem (bool): 为True时不进入其他文件系统的目录（不使用索引）
+        refresh (bool): 使用索引时忽略已有记录，重新扫描整棵子树
 
     Returns:
         int: 目录总大小(字节)
     """
-    total_size = 0
-    try:
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                if os.path.exists(filepath):
-                    total_size += os.path.getsize(filepath)
-    except PermissionError:
-        pass  # 忽略权限错误
-    return total_size
-    
-def get_directory_contents(path):
+    if dedup_hardlinks or one_filesystem:
+        dedup = scan_func.InodeDedup(path, one_filesystem)
+        ignore = gitignore_func.matcher_for(path) if exclude_ignored else None
+        return scan_func.walk_tree(path, ignore=ignore, dedup=dedup)
+    if exclude_ignored:
+        return scan_func.walk_tree(path, ignore=gitignore_func.matcher_for(path))
+    if estimate:
+        return size_estimate.estimate_directory_size(path)["size"]
+    if use_index:
+        return size_index.get_indexed_directory_size(path, refresh)
+    return scan_func.walk_size(path)
+
+
+def get_directory_contents(path, compute_dir_sizes=True):
     """
     获取指定路径下的所有文件和文件夹信息
 
+    基于scandir扫描引擎，每个条目只stat一次，目录未变化时直接使用列表缓存；
+    各子目录的大小在全局磁盘IO线程池中并行计算，结果与串行计算一致
+
     Args:
         path (str): 目录路径
+        compute_dir_sizes (bool): 是否计算子目录大小，为False时子目录的size为None
 
     Returns:
         list: 包含文件/文件夹信息的列表
@@ -45,20 +80,20 @@ def get_directory_contents(path):
 
     contents = []
     try:
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
-            stat_info = os.stat(item_path)
+        entries = listing_cache.cached_scan_directory(path)
+        # 并行计算所有子目录的大小
+        dir_paths = [entry["path"] for entry in entries if not entry["is_file"]] if compute_dir_sizes else []
+        dir_sizes = dict(zip(dir_paths, worker_pool.map_in_pool(get_directory_size, dir_paths)))
+        for entry in entries:
             # 获取文件大小
-            if os.path.isfile(item_path):
-                size = stat_info.st_size
-                is_file = True
+            if entry["is_file"]:
+                size = entry["size"]
             else:
-                size = get_directory_size(item_path)
-                is_file = False
+                size = dir_sizes.get(entry["path"])
             # 获取修改时间
-            mtime = datetime.fromtimestamp(stat_info.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+            mtime = datetime.fromtimestamp(entry["mtime"]).strftime('%Y-%m-%d %H:%M:%S')
 
-            contents.append({"name": item,"path": item_path,"size": size,"modified_time": mtime,"is_file": is_file })
+            contents.append({"name": entry["name"],"path": entry["path"],"size": size,"modified_time": mtime,"is_file": entry["is_file"] })
     except PermissionError:
         return create_response_dict(success=False, error="权限不足，无法访问该目录")
     return create_response_dict(success=True, contents=contents)
@@ -69,6 +104,10 @@ def read_file(file_path):
     """
     读取文件内容
 
+    超过storage.max_file_size的文件只返回开头部分的预览（truncated为True），
+    其余部分可以通过read_func.read_range按next_offset继续读取；
+    二进制文件只返回元数据和十六进制窗口（binary为True）
+
     Args:
         file_path (str): 文件路径
 
@@ -83,10 +122,19 @@ def read_file(file_path):
         # 检查是否为文件
         if not os.path.isfile(file_path):
             return create_response_dict(success=False, error="指定路径不是文件")
+
+        # 先根据文件开头的字节判断类型和编码，二进制文件不做解码
+        sniffed = sniff_func.sniff_file(file_path)
+        if sniffed["kind"] == "binary":
+            return read_func.binary_response(file_path, sniffed)
+
+        # 大文件只读取预览
+        if sniffed["size"] > read_func.get_max_file_size():
+            return read_func.read_preview(file_path, encoding=sniffed["encoding"])
         # 读取文件内容
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with open(file_path, 'r', encoding=sniffed["encoding"]) as file:
             content = file.read()
-        return create_response_dict(success=True, content=content)
+        return create_response_dict(success=True, content=content, encoding=sniffed["encoding"])
     except Exception as e:
         return create_response_dict(success=False, error=f"读取文件失败: {str(e)}")
 
@@ -108,11 +156,229 @@ def is_git_repository(path):
     git_dir = os.path.join(path, '.git')
     return os.path.exists(git_dir) and os.path.isdir(git_dir)
 
-def get_files(path):
+def stat_path(path):
+    """
+    获取单个路径的类型、大小、修改时间、是否为Git仓库以及是否可读
+
+    Args:
+        path (str): 文件或目录路径
+
+    Returns:
+        dict: 路径信息，路径不存在或无法访问时exists为False并包含error
+    """
+    item = {"path": path, "exists": False, "type": None, "size": None, "modified_time": None,
+            "mtime": None, "is_git_repo": False, "readable": False}
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        item["error"] = e.strerror or str(e)
+        return item
+    item["exists"] = True
+    if stat.S_ISDIR(st.st_mode):
+        item["type"] = "directory"
+        item["is_git_repo"] = os.path.isdir(os.path.join(path, '.git'))
+    elif stat.S_ISREG(st.st_mode):
+        item["type"] = "file"
+        item["size"] = st.st_size
+        item["size_formatted"] = format_func.format_size(st.st_size)
+    else:
+        item["type"] = "other"
+    item["mtime"] = st.st_mtime
+    item["modified_time"] = datetime.fromtimestamp(st.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+    item["readable"] = os.access(path, os.R_OK)
+    return item
+
+
+def stat_many(paths):
+    """
+    批量获取多个路径的信息，在全局磁盘IO线程池中并行stat，
+    页面一次调用即可得到全部结果，不需要为每个路径单独往返
+
+    Args:
+        paths (list): 路径列表
+
+    Returns:
+        dict: 包含items列表的响应字典，顺序与paths一致，目录的size为None
+    """
+    if not isinstance(paths, (list, tuple)):
+        return create_response_dict(success=False, error="paths必须是路径列表")
+    try:
+        items = worker_pool.map_in_pool(stat_path, [str(path) for path in paths])
+    except Exception as e:
+        return create_response_dict(success=False, error=f"获取路径信息失败: {str(e)}")
+    return create_response_dict(success=True, items=items)
+
+def _format_item_size(item):
+    """生成条目的大小显示文本"""
+    if item['is_file']:
+        return format_func.format_size(item['size'])
+    return format_func.format_size(item['size']) + " (目录)"
+
+
+def _format_estimate(estimate):
+    """生成估算大小的显示文本"""
+    if estimate["exact"]:
+        return _format_item_size({"is_file": False, "size": estimate["size"]})
+    return f"≈{format_func.format_size(estimate['size'])} ±{format_func.format_size(estimate['error_bound'])} (目录)"
+
+
+def _emit_size_estimates(job, dir_paths):
+    """
+    为等待精确计算的目录推送estimate事件，整批目录共享ESTIMATE_PAGE_BUDGET的时间预算
+
+    预算用尽后不再开始新的估算；误差范围不小于估算值本身的结果没有参考价值，不推送
+
+    Args:
+        job (job_func.Job): 当前任务
+        dir_paths (list): 需要估算大小的目录路径列表
+    """
+    deadline = time.monotonic() + ESTIMATE_PAGE_BUDGET
+    budget = min(size_estimate.DEFAULT_TIME_BUDGET,
+                 ESTIMATE_PAGE_BUDGET * worker_pool.get_max_workers() / len(dir_paths))
+
+    def estimate(dir_path):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or job.cancelled:
+            return None
+        return size_estimate.estimate_directory_size(dir_path, min(budget, remaining))
+
+    for dir_path, result in zip(dir_paths, worker_pool.map_in_pool(estimate, dir_paths)):
+        if result is None or (not result["exact"] and result["error_bound"] >= result["size"]):
+            continue
+        job.emit("estimate", path=dir_path, size=result["size"], error_bound=result["error_bound"],
+                 exact=result["exact"], size_formatted=_format_estimate(result))
+
+
+def get_deduplicated_size(path, one_filesystem=False):
+    """
+    按inode去重统计目录大小，硬链接的文件只统计一次
+
+    Args:
+        path (str): 目录路径
+        one_filesystem (bool): 是否只统计与path位于同一文件系统的目录
+
+    Returns:
+        dict: 包含size、size_formatted以及去重统计（重复硬链接的数量和字节数、
+            跳过的重复目录和挂载点数量）的响应字典
+    """
+    if not os.path.isdir(path):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    dedup = scan_func.InodeDedup(path, one_filesystem)
+    size = scan_func.walk_size(path, dedup)
+    return create_response_dict(
+        success=True,
+        path=path,
+        size=size,
+        size_formatted=format_func.format_size(size),
+        **dedup.stats()
+    )
+
+
+def get_size_report(path):
+    """
+    统计目录的总大小以及排除.gitignore忽略内容后的大小
+
+    目录位于Git仓库中时使用仓库根目录及各层的.gitignore规则，.git目录始终视为被忽略
+
+    Args:
+        path (str): 目录路径
+
+    Returns:
+        dict: 包含size、size_excluding_ignored、ignored_size及对应格式化文本的响应字典
+    """
+    if not os.path.isdir(path):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    total_size, ignored_size = scan_func.walk_ignored_sizes(path, gitignore_func.matcher_for(path))
+    return create_response_dict(
+        success=True,
+        path=path,
+        size=total_size,
+        size_formatted=format_func.format_size(total_size),
+        size_excluding_ignored=total_size - ignored_size,
+        size_excluding_ignored_formatted=format_func.format_size(total_size - ignored_size),
+        ignored_size=ignored_size,
+        ignored_size_formatted=format_func.format_size(ignored_size)
+    )
+
+
+def estimate_directory_size(path, time_budget_ms=size_estimate.DEFAULT_TIME_BUDGET * 1000):
+    """
+    在时间预算内估算目录大小，并在后台计算精确值
+
+    Args:
+        path (str): 目录路径
+        time_budget_ms (float): 估算的时间预算（毫秒）
+
+    Returns:
+        dict: 包含size、error_bound（95%置信度误差范围）、exact和size_formatted的响应字典；
+            不是精确值时包含size_job_id，精确值通过该任务的size事件推送
+    """
+    if not os.path.isdir(path):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    estimate = size_estimate.estimate_directory_size(path, max(0.0, float(time_budget_ms)) / 1000)
+    result = create_response_dict(success=True, path=path, size_formatted=_format_estimate(estimate), **estimate)
+    if not estimate["exact"]:
+        result["size_job_id"] = start_size_job([path]).job_id
+    return result
+
+
+def _compute_sizes_job(job, dir_paths, refresh=False, estimate=False):
+    """
+    后台计算目录大小的任务，每完成一个目录就发送一条size事件
+
+    Args:
+        job (job_func.Job): 当前任务
+        dir_paths (list): 需要计算大小的目录路径列表
+        refresh (bool): 是否忽略目录大小索引中的已有记录
+        estimate (bool): 是否先为各目录推送抽样估算的estimate事件
+
+    Returns:
+        dict: 目录路径到大小的映射
+    """
+    if estimate and dir_paths:
+        _emit_size_estimates(job, dir_paths)
+    executor = worker_pool.get_io_executor()
+    futures = {executor.submit(get_directory_size, dir_path, refresh=refresh): dir_path for dir_path in dir_paths}
+    sizes = {}
+    try:
+        for future in as_completed(futures):
+            dir_path = futures[future]
+            size = future.result()
+            sizes[dir_path] = size
+            job.emit("size", path=dir_path, size=size,
+                     size_formatted=_format_item_size({"is_file": False, "size": size}))
+            if job.cancelled:
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+    return sizes
+
+
+def start_size_job(dir_paths, refresh=False, estimate=False):
+    """
+    启动后台计算目录大小的任务
+
+    Args:
+        dir_paths (list): 需要计算大小的目录路径列表
+        refresh (bool): 是否忽略目录大小索引中的已有记录
+        estimate (bool): 是否先推送抽样估算的estimate事件
+
+    Returns:
+        Job: 大小计算任务，每完成一个目录推送一条size事件
+    """
+    return job_func.start_job("size", _compute_sizes_job, list(dir_paths), refresh, estimate)
+
+
+def get_files(path, async_sizes=False, estimate_sizes=False, refresh_sizes=False):
     """
     获取指定路径下的文件列表，并自动保存当前路径
     Args:
         path (str): 目录路径
+        async_sizes (bool): 为True时立即返回列表，子目录大小标记为待计算（size_pending），
+            并在后台任务中逐个计算，结果通过任务事件推送或由size_job_id轮询获取
+        estimate_sizes (bool): 与async_sizes同时使用，后台任务先推送抽样估算大小的estimate事件，再推送精确值
+        refresh_sizes (bool): 与async_sizes同时使用，后台计算时忽略目录大小索引中的已有记录（用于刷新当前目录）
     Returns:
         dict: 文件列表信息
     """
@@ -123,32 +389,201 @@ def get_files(path):
         # 忽略保存路径配置失败的情况
         pass
     
-    contents = get_directory_contents(path)
+    contents = get_directory_contents(path, compute_dir_sizes=not async_sizes)
 
     # 如果返回的是错误信息，直接返回
     if isinstance(contents, dict) and "error" in contents:
         return contents
 
     # 格式化大小信息
+    pending_dirs = []
     for item in contents['contents']:
-        if item['is_file']:
-            item['size_formatted'] = format_func.format_size(item['size'])
+        if async_sizes and not item['is_file']:
+            item['size_pending'] = True
+            item['size_formatted'] = "计算中... (目录)"
+            pending_dirs.append(item['path'])
         else:
-            item['size_formatted'] = format_func.format_size(item['size']) + " (目录)"
+            item['size_formatted'] = _format_item_size(item)
 
-    return {
+    result = {
         "success": True,
         "path": path,
         "contents": contents['contents']
     }
+    if pending_dirs:
+        result["size_job_id"] = start_size_job(pending_dirs, refresh_sizes, estimate_sizes).job_id
+    return result
+
+
+def get_files_page(path, sort_key="name", direction="asc", cursor=None, page_size=200, async_sizes=False,
+                   estimate_sizes=False, refresh_sizes=False):
+    """
+    分页获取目录列表，排序在服务端完成
+
+    首次请求（cursor为None）时扫描目录并创建排序快照，之后的请求使用返回的
+    next_cursor直接从快照中切片，开销只与页面大小有关。
+    子目录大小只为当前页计算（按大小排序时除外）。
+
+    Args:
+        path (str): 目录路径
+        sort_key (str): 排序字段，可选name/size/mtime/type
+        direction (str): 排序方向，asc或desc
+        cursor (str): 上一页返回的next_cursor，也可以传入整数偏移量
+        page_size (int): 每页条目数量
+        async_sizes (bool): 为True时当前页的子目录大小在后台任务中计算
+        estimate_sizes (bool): 与async_sizes同时使用，后台任务先推送抽样估算大小的estimate事件，再推送精确值
+        refresh_sizes (bool): 计算子目录大小时忽略目录大小索引中的已有记录（用于刷新当前目录）
+    Returns:
+        dict: 包含当前页条目、总数和下一页游标的响应字典
+    """
+    if sort_key not in listing_snapshot.SORT_KEYS:
+        return create_response_dict(success=False, error=f"不支持的排序字段: {sort_key}")
+    try:
+        page_size = max(1, int(page_size))
+    except (TypeError, ValueError):
+        return create_response_dict(success=False, error=f"无效的页面大小: {page_size}")
+    snapshot = None
+    offset = 0
+    if isinstance(cursor, str):
+        decoded = listing_snapshot.decode_cursor(cursor)
+        if decoded is None:
+            return create_response_dict(success=False, error="无效的分页游标")
+        snapshot = listing_snapshot.get_snapshot(decoded[0])
+        if snapshot is None:
+            return create_response_dict(success=False, error="列表快照已失效，请重新加载")
+        offset = decoded[1]
+    elif cursor is not None:
+        try:
+            offset = max(0, int(cursor))
+        except (TypeError, ValueError):
+            return create_response_dict(success=False, error="无效的分页游标")
+
+    size_of = lambda dir_path: get_directory_size(dir_path, refresh=refresh_sizes)
+    if snapshot is None:
+        if not os.path.exists(path):
+            return create_response_dict(success=False, error="路径不存在")
+        if not os.path.isdir(path):
+            return create_response_dict(success=False, error="指定路径不是目录")
+        # 首页请求时自动保存当前路径
+        if offset == 0:
+            try:
+                update_path_config({'path': path})
+            except Exception:
+                pass
+        try:
+            snapshot = listing_snapshot.create_snapshot(
+                path, sort_key, direction == "desc",
+                size_func=lambda dir_paths: worker_pool.map_in_pool(size_of, dir_paths)
+            )
+        except PermissionError:
+            return create_response_dict(success=False, error="权限不足，无法访问该目录")
+
+    page = snapshot.page(offset, page_size)
+    contents = []
+    for name, is_file, size, mtime in page:
+        contents.append({
+            "name": name,
+            "path": os.path.join(snapshot.path, name),
+            "size": size,
+            "modified_time": datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S'),
+            "is_file": is_file
+        })
+
+    pending_dirs = [item["path"] for item in contents if not item["is_file"] and item["size"] is None]
+    if not async_sizes and pending_dirs:
+        dir_sizes = dict(zip(pending_dirs, worker_pool.map_in_pool(size_of, pending_dirs)))
+        for item in contents:
+            if item["path"] in dir_sizes:
+                item["size"] = dir_sizes[item["path"]]
+        pending_dirs = []
+    for item in contents:
+        if item["size"] is None:
+            item["size_pending"] = True
+            item["size_formatted"] = "计算中... (目录)"
+        else:
+            item["size_formatted"] = _format_item_size(item)
+
+    next_offset = offset + len(page)
+    result = {
+        "success": True,
+        "path": snapshot.path,
+        "contents": contents,
+        "total": len(snapshot.entries),
+        "offset": offset,
+        "snapshot_id": snapshot.snapshot_id,
+        "next_cursor": listing_snapshot.encode_cursor(snapshot.snapshot_id, next_offset)
+        if next_offset < len(snapshot.entries) else None
+    }
+    if pending_dirs:
+        result["size_job_id"] = start_size_job(pending_dirs, refresh_sizes, estimate_sizes).job_id
+    return result
+
+
+def get_cache_stats():
+    """
+    获取磁盘相关缓存的统计信息
+
+    Returns:
+        dict: 包含目录列表缓存命中/未命中等统计的响应字典
+    """
+    return create_response_dict(success=True, listing_cache=listing_cache.get_cache_stats())
+
+
+def _isdir_probe(path):
+    return lambda: os.path.isdir(path)
+
+
+def _exists_probe(path):
+    return lambda: os.path.exists(path)
+
+
+def _listdir_probe(path):
+    def probe():
+        try:
+            return sorted(os.listdir(path))
+        except OSError:
+            return []
+    return probe
+
+
+def _drive_probe(letter):
+    """检查驱动器是否存在，存在时返回带卷标的显示名称"""
+    def probe():
+        import ctypes
+        drive_path = f"{letter}:\\"
+        if not os.path.exists(drive_path):
+            return False
+        try:
+            volume_name = ctypes.create_unicode_buffer(256)
+            ctypes.windll.kernel32.GetVolumeInformationW(
+                ctypes.c_wchar_p(drive_path),
+                volume_name, ctypes.sizeof(volume_name),
+                None, None, None, None, 0
+            )
+            return f"{volume_name.value} ({letter}:)" if volume_name.value else f"本地磁盘 ({letter}:)"
+        except Exception:
+            return f"本地磁盘 ({letter}:)"
+    return probe
+
+
+def _append_probed(paths, result, item):
+    """按探测结果添加路径，探测超时的路径标记为pending"""
+    if result is path_probe.PENDING:
+        item["pending"] = True
+        paths.append(item)
+    elif result:
+        paths.append(item)
 
 
 def list_common_paths():
     """
     列出系统中的常用路径
     
+    挂载点和驱动器在后台线程中探测，结果缓存一段时间；超过PATH_PROBE_TIMEOUT仍未返回的
+    路径标记为pending并继续在后台探测，页面稍后重新请求即可得到结果
+    
     Returns:
-        dict: 包含常用路径的响应字典
+        dict: 包含常用路径的响应字典，pending为True表示仍有路径在探测中
     """
     paths = []
     try:
@@ -208,64 +643,60 @@ def list_common_paths():
                 # 忽略添加Windows特殊文件夹失败的情况
                 pass
             
-            # 添加Windows磁盘驱动器
+            # 添加Windows磁盘驱动器，断开的网络驱动器可能长时间阻塞，在探测线程中检查
             try:
                 import string
+                probes = {("drive", letter): _drive_probe(letter) for letter in string.ascii_uppercase}
+                results = path_probe.probe_many(probes, PATH_PROBE_TIMEOUT)
                 for letter in string.ascii_uppercase:
+                    result = results[("drive", letter)]
                     drive_path = f"{letter}:\\"
-                    if os.path.exists(drive_path):
-                        # 尝试获取驱动器卷标
-                        try:
-                            volume_name = windll.kernel32.GetVolumeInformationW(
-                                ctypes.c_wchar_p(drive_path),
-                                None, 0, None, None, None, None, 0
-                            )
-                            volume_name = ctypes.create_unicode_buffer(256)
-                            windll.kernel32.GetVolumeInformationW(
-                                ctypes.c_wchar_p(drive_path),
-                                volume_name, ctypes.sizeof(volume_name),
-                                None, None, None, None, 0
-                            )
-                            display_name = f"{volume_name.value} ({letter}:)" if volume_name.value else f"本地磁盘 ({letter}:)"
-                        except:
-                            display_name = f"本地磁盘 ({letter}:)"
-                        
-                        paths.append({"name": display_name,"path": drive_path,"type": "drive" })
+                    if result is path_probe.PENDING:
+                        paths.append({"name": f"磁盘 ({letter}:)", "path": drive_path, "type": "drive", "pending": True})
+                    elif result:
+                        paths.append({"name": result, "path": drive_path, "type": "drive"})
             except Exception:
                 # 忽略添加Windows磁盘驱动器失败的情况
                 pass
         
-        # 添加类Unix系统常见路径
+        # 添加类Unix系统常见路径，失效的网络挂载点可能长时间阻塞，在探测线程中检查
         else:
             try:
+                deadline = time.monotonic() + PATH_PROBE_TIMEOUT
                 # 常见挂载点
                 common_mounts = ["/", "/home", "/usr", "/var", "/tmp", "/opt", "/mnt", "/media"]
+                media_dir = "/media"
+                links = ["bin", "sbin", "etc"]
+                probes = {("isdir", mount): _isdir_probe(mount) for mount in common_mounts}
+                probes[("listdir", media_dir)] = _listdir_probe(media_dir)
+                probes.update({("exists", "/" + name): _exists_probe("/" + name) for name in links})
+                results = path_probe.probe_many(probes, PATH_PROBE_TIMEOUT)
                 for mount in common_mounts:
-                    if os.path.exists(mount) and os.path.isdir(mount):
-                        paths.append({"name": mount,"path": mount,"type": "directory"})
+                    _append_probed(paths, results[("isdir", mount)], {"name": mount, "path": mount, "type": "directory"})
                 
                 # 添加挂载的媒体设备
-                media_dir = "/media"
-                if os.path.exists(media_dir):
-                    for user_dir in os.listdir(media_dir):
-                        user_media_path = os.path.join(media_dir, user_dir)
-                        if os.path.isdir(user_media_path):
-                            paths.append({
-                                "name": f"媒体/{user_dir}",
-                                "path": user_media_path,
-                                "type": "directory"
-                            })
+                media_names = results[("listdir", media_dir)]
+                if media_names is path_probe.PENDING:
+                    paths.append({"name": "媒体", "path": media_dir, "type": "directory", "pending": True})
+                elif media_names:
+                    media_paths = [os.path.join(media_dir, name) for name in media_names]
+                    media_results = path_probe.probe_many(
+                        {("isdir", p): _isdir_probe(p) for p in media_paths},
+                        max(0.0, deadline - time.monotonic())
+                    )
+                    for name, user_media_path in zip(media_names, media_paths):
+                        _append_probed(paths, media_results[("isdir", user_media_path)], {
+                            "name": f"媒体/{name}",
+                            "path": user_media_path,
+                            "type": "directory"
+                        })
                 
                 # 添加常用符号链接
-                if os.path.exists("/bin"):
-                    paths.append({"name": "bin", "path": "/bin", "type": "directory"})
-                if os.path.exists("/sbin"):
-                    paths.append({"name": "sbin", "path": "/sbin", "type": "directory"})
-                if os.path.exists("/etc"):
-                    paths.append({"name": "etc", "path": "/etc", "type": "directory"})
+                for name in links:
+                    _append_probed(paths, results[("exists", "/" + name)], {"name": name, "path": "/" + name, "type": "directory"})
             except Exception:
                 # 忽略添加类Unix系统路径失败的情况
                 pass
     except Exception as e:
         return create_response_dict(success=False, error=f"列出常用路径失败: {str(e)}")
-    return create_response_dict(success=True, paths=paths)
\ No newline at end of file
+    return create_response_dict(success=True, paths=paths, pending=any(item.get("pending") for item in paths))
\ No newline at end of file
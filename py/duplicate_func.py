@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+重复文件查找模块
+分三个阶段缩小候选范围：先按大小分组，再比较文件首尾数据块的部分摘要，
+最后只对仍然相同的文件计算完整摘要（使用hash_cache的持久化缓存和进程池），
+大多数文件只需要一次stat或读取两个数据块，不必完整读取
+"""
+
+import os
+import hashlib
+
+from response_utils import create_response_dict
+import format_func
+import gitignore_func
+import hash_cache
+import job_func
+import scan_func
+import usage_func
+import worker_pool
+
+# 部分摘要读取的首尾数据块大小
+PARTIAL_BLOCK_SIZE = 64 * 1024
+# 默认参与比较的最小文件大小（空文件不算重复）
+DEFAULT_MIN_SIZE = 1
+# 默认最多返回的重复组数量
+DEFAULT_MAX_GROUPS = 1000
+# 每批计算部分摘要的文件数量，批次之间检查任务是否已取消
+PARTIAL_BATCH_SIZE = 256
+
+
+def partial_hash(file_path):
+    """
+    计算文件首尾数据块的摘要
+
+    不超过两个数据块的文件直接读取全部内容，此时结果与hash_cache.hash_file相同
+
+    Args:
+        file_path (str): 文件路径
+
+    Returns:
+        tuple: (摘要, 是否覆盖了全部内容)，无法读取时返回(None, False)
+    """
+    digest = hashlib.new(hash_cache.HASH_ALGORITHM)
+    try:
+        with open(file_path, 'rb') as file:
+            head = file.read(PARTIAL_BLOCK_SIZE * 2)
+            if len(head) < PARTIAL_BLOCK_SIZE * 2:
+                digest.update(head)
+                return digest.hexdigest(), True
+            digest.update(head[:PARTIAL_BLOCK_SIZE])
+            file.seek(-PARTIAL_BLOCK_SIZE, os.SEEK_END)
+            digest.update(file.read(PARTIAL_BLOCK_SIZE))
+    except OSError:
+        return None, False
+    return digest.hexdigest(), False
+
+
+def _duplicates_job(job, root, min_size, max_groups, respect_gitignore=False):
+    """
+    重复文件查找任务：遍历期间推送progress事件，每个阶段开始时推送stage事件
+    """
+    progress = usage_func.Progress(job, root)
+    by_size = {}
+
+    def on_file(path, size, depth):
+        progress.add_file(size)
+        # 硬链接在InodeDedup中第二次出现时大小为0，不会作为重复文件
+        if size >= min_size:
+            by_size.setdefault(size, []).append(path)
+
+    def on_dir(path, size, depth):
+        progress.add_directory()
+
+    ignore = gitignore_func.matcher_for(root) if respect_gitignore else None
+    scan_func.walk_tree(root, on_file, on_dir, lambda: job.cancelled, ignore, scan_func.InodeDedup(root))
+    progress.emit()
+
+    # 第一阶段：按大小分组，跳过指向文件的符号链接
+    candidates = []
+    for size, paths in by_size.items():
+        if len(paths) > 1:
+            paths = [path for path in paths if not os.path.islink(path)]
+        if len(paths) > 1:
+            candidates.extend((size, path) for path in paths)
+    by_size = None
+    job.emit("stage", stage="partial", files=len(candidates))
+
+    # 第二阶段：比较首尾数据块
+    by_partial = {}
+    complete = set()
+    for start in range(0, len(candidates), PARTIAL_BATCH_SIZE):
+        if job.cancelled:
+            break
+        batch = candidates[start:start + PARTIAL_BATCH_SIZE]
+        partials = worker_pool.map_in_pool(partial_hash, [path for _, path in batch])
+        for (size, path), (digest, whole) in zip(batch, partials):
+            if digest is None:
+                continue
+            by_partial.setdefault((size, digest), []).append(path)
+            if whole:
+                complete.add((size, digest))
+
+    # 第三阶段：只对部分摘要相同且未完整读取的文件计算完整摘要
+    groups = {}
+    full_candidates = []
+    for key, paths in by_partial.items():
+        if len(paths) < 2:
+            continue
+        if key in complete:
+            groups[key] = paths
+        else:
+            full_candidates.extend((key[0], path) for path in paths)
+    job.emit("stage", stage="full", files=len(full_candidates))
+    if full_candidates and not job.cancelled:
+        digests = hash_cache.get_hash_cache().get_digests([path for _, path in full_candidates], job=job)
+        for size, path in full_candidates:
+            digest = digests.get(os.path.abspath(path))
+            if digest is not None:
+                groups.setdefault((size, digest), []).append(path)
+
+    result_groups = []
+    wasted_bytes = 0
+    for (size, digest), paths in groups.items():
+        if len(paths) < 2:
+            continue
+        wasted = size * (len(paths) - 1)
+        wasted_bytes += wasted
+        result_groups.append({
+            "size": size,
+            "size_formatted": format_func.format_size(size),
+            "digest": digest,
+            "paths": sorted(paths),
+            "wasted": wasted,
+            "wasted_formatted": format_func.format_size(wasted)
+        })
+    result_groups.sort(key=lambda group: (-group["wasted"], group["paths"][0]))
+    return {
+        "root": root,
+        "file_count": progress.files,
+        "group_count": len(result_groups),
+        "groups": result_groups[:max_groups],
+        "wasted_bytes": wasted_bytes,
+        "wasted_bytes_formatted": format_func.format_size(wasted_bytes),
+        "partial_hashed": len(candidates),
+        "full_hashed": len(full_candidates),
+        "complete": not job.cancelled
+    }
+
+
+def find_duplicates(root, min_size=DEFAULT_MIN_SIZE, max_groups=DEFAULT_MAX_GROUPS, respect_gitignore=False):
+    """
+    在后台查找目录树中内容相同的文件
+
+    Args:
+        root (str): 根目录
+        min_size (int): 参与比较的最小文件大小(字节)
+        max_groups (int): 最多返回的重复组数量，按可回收的空间从大到小排序
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+
+    Returns:
+        dict: 包含job_id的响应字典，结果（groups、wasted_bytes等）在任务结束事件的result中
+    """
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    job = job_func.start_job("duplicates", _duplicates_job, os.path.abspath(root), max(1, int(min_size)),
+                             max(1, int(max_groups)), bool(respect_gitignore))
+    return create_response_dict(success=True, job_id=job.job_id)
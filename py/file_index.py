@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文件名索引模块
+使用SQLite持久化保存每个打开过的根目录下的全部文件名，并建立trigram全文索引，
+用于"转到文件"的模糊查找。索引在后台任务中建立，之后只重新列出mtime发生变化的目录。
+根目录为所在的Git仓库根目录或打开的目录本身；已有祖先根目录的索引时直接查询该索引的子树，
+不再为子目录单独建立索引
+"""
+
+import os
+import re
+import json
+import heapq
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from response_utils import create_response_dict
+import gitignore_func
+import job_func
+
+# 默认索引文件路径（与settings.yaml同目录）
+DEFAULT_INDEX_PATH = os.path.join(Path(__file__).parent.parent, 'data', 'file_index.db')
+# 建立索引时跳过的版本控制目录
+SKIP_DIRS = {".git", ".svn", ".hg"}
+# 查询时距离上次刷新超过该时间（秒）则在后台增量刷新
+REFRESH_INTERVAL = 30.0
+# 默认返回的结果数量
+DEFAULT_LIMIT = 50
+# trigram查询最多取出参与排序的候选数量
+MAX_CANDIDATES = 20000
+# 刷新索引时每处理多少个目录提交一次
+COMMIT_EVERY = 500
+# trigram索引要求的最短查询长度
+TRIGRAM_LENGTH = 3
+
+_SEPARATORS = "/\\_-. "
+
+
+def _tokens(query):
+    """将查询拆分为小写的关键词，路径分隔符统一为当前系统的分隔符"""
+    query = query.replace("/", os.sep).replace("\\", os.sep)
+    return [token.lower() for token in query.split() if token]
+
+
+def fuzzy_score(token, candidate):
+    """
+    计算关键词与候选路径的模糊匹配得分
+
+    关键词的字符需要按顺序出现在候选路径中；连续匹配、单词开头匹配和
+    文件名部分的匹配得分更高
+
+    Args:
+        token (str): 小写的关键词
+        candidate (str): 小写的相对路径
+
+    Returns:
+        float: 得分，不匹配时返回None
+    """
+    base_start = candidate.rfind(os.sep) + 1
+    if token in candidate[base_start:]:
+        # 文件名直接包含关键词时优先，文件名越短越靠前
+        return 100.0 + len(token) * 10 - (len(candidate) - base_start) * 0.1
+    score = 0.0
+    index = 0
+    previous = -2
+    for position, char in enumerate(candidate):
+        if index < len(token) and char == token[index]:
+            score += 1
+            if position == previous + 1:
+                score += 5
+            if position == 0 or candidate[position - 1] in _SEPARATORS:
+                score += 3
+            if position >= base_start:
+                score += 2
+            previous = position
+            index += 1
+    if index < len(token):
+        return None
+    return score - len(candidate) * 0.01
+
+
+class FileNameIndex:
+    """
+    文件名索引类
+
+    dirs表以(根目录, 目录路径)为键保存目录的mtime和子目录列表，
+    files表保存每个文件的相对路径，names为files的trigram全文索引。
+    目录的mtime只会在其直接条目增删或重命名时变化，因此刷新时mtime未变的目录无需重新列出。
+    SQLite不支持trigram分词器时退回到逐条模糊匹配。
+    """
+
+    def __init__(self, db_path=None):
+        """
+        初始化文件名索引
+
+        Args:
+            db_path (str): 索引数据库路径，为None时使用默认路径
+        """
+        self.db_path = db_path or DEFAULT_INDEX_PATH
+        self._lock = threading.RLock()
+        self.has_trigram = False
+        self._conn = self._connect()
+
+    def _connect(self):
+        """打开数据库连接，无法写入磁盘时退回到内存数据库"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        except (OSError, sqlite3.Error):
+            conn = sqlite3.connect(':memory:', check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS roots ("
+            "root TEXT PRIMARY KEY, "
+            "refreshed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "root TEXT NOT NULL, "
+            "path TEXT NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "subdirs TEXT NOT NULL, "
+            "PRIMARY KEY (root, path))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "id INTEGER PRIMARY KEY, "
+            "root TEXT NOT NULL, "
+            "dir TEXT NOT NULL, "
+            "rel TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS files_dir ON files (root, dir)")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(rel, tokenize='trigram')")
+            self.has_trigram = True
+        except sqlite3.OperationalError:
+            self.has_trigram = False
+        conn.commit()
+        return conn
+
+    def _delete_files(self, where, params):
+        """删除符合条件的文件记录及其全文索引"""
+        if self.has_trigram:
+            self._conn.execute(f"DELETE FROM names WHERE rowid IN (SELECT id FROM files WHERE {where})", params)
+        self._conn.execute(f"DELETE FROM files WHERE {where}", params)
+
+    def _forget_subtree(self, root, path):
+        """删除目录及其全部后代的记录"""
+        prefix = path.rstrip(os.sep) + os.sep
+        params = (root, path, len(prefix), prefix)
+        self._conn.execute(
+            "DELETE FROM dirs WHERE root = ? AND (path = ? OR substr(path, 1, ?) = ?)", params
+        )
+        self._delete_files("root = ? AND (dir = ? OR substr(dir, 1, ?) = ?)", params)
+
+    def _replace_dir(self, root, path, mtime_ns, file_names, subdirs, old_subdirs):
+        """用新的列表替换目录的记录"""
+        with self._lock:
+            for name in set(old_subdirs) - set(subdirs):
+                self._forget_subtree(root, os.path.join(path, name))
+            self._delete_files("root = ? AND dir = ?", (root, path))
+            rel_dir = os.path.relpath(path, root)
+            for name in file_names:
+                rel = name if rel_dir == os.curdir else os.path.join(rel_dir, name)
+                cursor = self._conn.execute(
+                    "INSERT INTO files (root, dir, rel) VALUES (?, ?, ?)", (root, path, rel)
+                )
+                if self.has_trigram:
+                    self._conn.execute("INSERT INTO names (rowid, rel) VALUES (?, ?)", (cursor.lastrowid, rel))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dirs (root, path, mtime_ns, subdirs) VALUES (?, ?, ?, ?)",
+                (root, path, mtime_ns, json.dumps(subdirs, ensure_ascii=False))
+            )
+
+    def _lookup_dir(self, root, path):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, subdirs FROM dirs WHERE root = ? AND path = ?", (root, path)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def refresh(self, root, job=None):
+        """
+        建立或增量刷新根目录的索引，只重新列出mtime发生变化的目录
+
+        Args:
+            root (str): 根目录
+            job (Job): 可选，用于推送进度和响应取消
+
+        Returns:
+            dict: 本次重新列出(scanned)和复用(reused)的目录数量以及文件总数
+        """
+        root = os.path.abspath(root)
+        stats = {"scanned": 0, "reused": 0}
+        stack = [root]
+        processed = 0
+        while stack:
+            if job is not None and job.cancelled:
+                break
+            path = stack.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                with self._lock:
+                    self._forget_subtree(root, path)
+                continue
+
+            cached = self._lookup_dir(root, path)
+            if cached is not None and cached[0] == mtime_ns:
+                subdirs = cached[1]
+                stats["reused"] += 1
+            else:
+                file_names, subdirs = [], []
+                try:
+                    with os.scandir(path) as it:
+                        for entry in it:
+                            try:
+                                is_dir = entry.is_dir(follow_symlinks=False)
+                            except OSError:
+                                is_dir = False
+                            if is_dir:
+                                if entry.name not in SKIP_DIRS:
+                                    subdirs.append(entry.name)
+                            else:
+                                file_names.append(entry.name)
+                except OSError:
+                    continue
+                subdirs.sort()
+                self._replace_dir(root, path, mtime_ns, file_names, subdirs,
+                                  cached[1] if cached is not None else [])
+                stats["scanned"] += 1
+            stack.extend(os.path.join(path, name) for name in reversed(subdirs))
+
+            processed += 1
+            if processed % COMMIT_EVERY == 0:
+                with self._lock:
+                    self._conn.commit()
+                if job is not None:
+                    job.emit("progress", root=root, directories=processed)
+
+        with self._lock:
+            if job is None or not job.cancelled:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO roots (root, refreshed_at) VALUES (?, ?)", (root, time.time())
+                )
+                # 后代根目录的文件已包含在本索引中
+                for nested in self._nested_roots(root):
+                    self._forget_root(nested)
+            self._conn.commit()
+        stats["files"] = self.file_count(root)
+        return stats
+
+    def _nested_roots(self, root):
+        """已建立索引且位于root之下的其他根目录"""
+        prefix = root.rstrip(os.sep) + os.sep
+        rows = self._conn.execute(
+            "SELECT root FROM roots WHERE substr(root, 1, ?) = ? AND root != ?", (len(prefix), prefix, root)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _forget_root(self, root):
+        self._conn.execute("DELETE FROM roots WHERE root = ?", (root,))
+        self._conn.execute("DELETE FROM dirs WHERE root = ?", (root,))
+        self._delete_files("root = ?", (root,))
+
+    def covering_root(self, path):
+        """
+        查找已建立索引且包含path的根目录
+
+        Args:
+            path (str): 目录路径
+
+        Returns:
+            str: 最近的根目录（可以是path自身），没有时返回None
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            roots = [row[0] for row in self._conn.execute("SELECT root FROM roots")]
+        return _nearest_ancestor(path, roots)
+
+    def file_count(self, root):
+        """根目录下已索引的文件数量"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM files WHERE root = ?", (os.path.abspath(root),)
+            ).fetchone()[0]
+
+    def refreshed_at(self, root):
+        """根目录上次完成刷新的时间，从未建立索引时返回None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT refreshed_at FROM roots WHERE root = ?", (os.path.abspath(root),)
+            ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _scope(root, under):
+        """限定查询范围的SQL条件及参数，under为None时查询整个根目录"""
+        if under is None or under == root:
+            return "root = ?", (root,)
+        prefix = under.rstrip(os.sep) + os.sep
+        return "root = ? AND (dir = ? OR substr(dir, 1, ?) = ?)", (root, under, len(prefix), prefix)
+
+    def _candidates(self, root, tokens, under=None):
+        """用trigram索引取出包含全部关键词的候选，无法使用索引或没有结果时返回None"""
+        long_tokens = [token for token in tokens if len(token) >= TRIGRAM_LENGTH]
+        if not self.has_trigram or not long_tokens:
+            return None
+        match = " AND ".join('"{}"'.format(token.replace('"', '""')) for token in long_tokens)
+        where, params = self._scope(root, under)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rel FROM files WHERE id IN (SELECT rowid FROM names WHERE names MATCH ?) "
+                f"AND {where} LIMIT ?",
+                (match, *params, MAX_CANDIDATES)
+            ).fetchall()
+        return [row[0] for row in rows] or None
+
+    def search(self, root, query, limit=DEFAULT_LIMIT, under=None):
+        """
+        模糊查找文件
+
+        先用trigram索引查找路径中包含关键词的文件，没有结果时对全部文件做子序列模糊匹配
+
+        Args:
+            root (str): 根目录
+            query (str): 查询，多个关键词用空格分隔
+            limit (int): 最多返回的结果数量
+            under (str): 可选，只查找该子目录下的文件
+
+        Returns:
+            list: 按得分从高到低排序的相对路径（相对于root）
+        """
+        root = os.path.abspath(root)
+        under = os.path.abspath(under) if under is not None else None
+        tokens = _tokens(query)
+        if not tokens:
+            return []
+        candidates = self._candidates(root, tokens, under)
+        if candidates is None:
+            where, params = self._scope(root, under)
+            with self._lock:
+                candidates = [row[0] for row in self._conn.execute(
+                    f"SELECT rel FROM files WHERE {where}", params
+                )]
+
+        # 先用正则表达式筛选出包含全部关键词子序列的路径，只对这些路径计算得分
+        patterns = [re.compile(".*?".join(re.escape(char) for char in token)) for token in tokens]
+        scored = []
+        for rel in candidates:
+            lowered = rel.lower()
+            if not all(pattern.search(lowered) for pattern in patterns):
+                continue
+            total = 0.0
+            for token in tokens:
+                score = fuzzy_score(token, lowered)
+                if score is None:
+                    break
+                total += score
+            else:
+                scored.append((total, -len(rel), rel))
+        return [item[2] for item in heapq.nlargest(limit, scored)]
+
+    def clear(self, root=None):
+        """
+        清空索引
+
+        Args:
+            root (str): 根目录，为None时清空全部根目录的索引
+        """
+        with self._lock:
+            if root is None:
+                self._conn.execute("DELETE FROM roots")
+                self._conn.execute("DELETE FROM dirs")
+                self._delete_files("1 = 1", ())
+            else:
+                self._forget_root(os.path.abspath(root))
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+# 全局索引实例（延迟创建）
+_global_index = None
+_global_index_lock = threading.Lock()
+# 正在刷新的根目录到任务的映射
+_refresh_jobs = {}
+
+
+def _nearest_ancestor(path, roots):
+    """返回roots中等于path或为其祖先的最长路径"""
+    best = None
+    for root in roots:
+        if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+            if best is None or len(root) > len(best):
+                best = root
+    return best
+
+
+def get_file_index():
+    """获取全局文件名索引实例"""
+    global _global_index
+    with _global_index_lock:
+        if _global_index is None:
+            _global_index = FileNameIndex()
+        return _global_index
+
+
+def _refresh_job(job, root):
+    return get_file_index().refresh(root, job)
+
+
+def resolve_root(path):
+    """
+    确定目录所属的索引根目录
+
+    优先使用正在刷新或已建立索引的祖先根目录，其次使用所在的Git仓库根目录，最后使用目录本身
+
+    Args:
+        path (str): 打开的目录
+
+    Returns:
+        str: 索引根目录
+    """
+    path = os.path.abspath(path)
+    with _global_index_lock:
+        running = [root for root, job in _refresh_jobs.items() if job.status == "running"]
+    return (_nearest_ancestor(path, running) or get_file_index().covering_root(path)
+            or gitignore_func.find_repo_root(path) or path)
+
+
+def index_root(root):
+    """
+    在后台建立或刷新根目录的文件名索引，同一根目录同时只有一个刷新任务
+
+    Args:
+        root (str): 根目录
+
+    Returns:
+        Job: 刷新任务
+    """
+    root = os.path.abspath(root)
+    with _global_index_lock:
+        job = _refresh_jobs.get(root)
+        if job is None or job.status != "running":
+            job = job_func.start_job("file_index", _refresh_job, root)
+            _refresh_jobs[root] = job
+        return job
+
+
+def index_files(path):
+    """
+    开始为目录所属的根目录（见resolve_root）建立或刷新文件名索引
+
+    Args:
+        path (str): 打开的目录
+
+    Returns:
+        dict: 包含job_id和实际建立索引的root的响应字典
+    """
+    if not os.path.isdir(path):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    root = resolve_root(path)
+    return create_response_dict(success=True, job_id=index_root(root).job_id, root=root)
+
+
+def find_files(root, query, limit=DEFAULT_LIMIT):
+    """
+    在目录所属根目录的文件名索引中模糊查找该目录下的文件
+
+    索引过期时在后台增量刷新，本次查询使用已有的索引
+
+    Args:
+        root (str): 要查找的目录
+        query (str): 查询
+        limit (int): 最多返回的结果数量
+
+    Returns:
+        dict: 包含以下键的响应字典:
+            - results: 结果列表，每项包含name、rel（相对于root）和path
+            - indexing: 索引是否正在后台建立或刷新
+            - indexed_files: 当前已索引的文件数量
+    """
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    root = os.path.abspath(root)
+    index_root_path = resolve_root(root)
+    index = get_file_index()
+    refreshed_at = index.refreshed_at(index_root_path)
+    indexing = False
+    if refreshed_at is None or time.time() - refreshed_at > REFRESH_INTERVAL:
+        indexing = index_root(index_root_path).status == "running"
+    results = []
+    for rel in index.search(index_root_path, query, int(limit), under=root):
+        path = os.path.join(index_root_path, rel)
+        results.append({"name": os.path.basename(rel), "rel": os.path.relpath(path, root), "path": path})
+    return create_response_dict(
+        success=True,
+        results=results,
+        indexing=indexing,
+        indexed_files=index.file_count(index_root_path)
+    )
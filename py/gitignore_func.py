@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.gitignore匹配模块
+将.gitignore中的模式编译为正则表达式，支持嵌套的.gitignore、否定模式(!)、
+只匹配目录的模式(末尾/)、锚定模式和**通配符；目录遍历时逐层加载规则，
+不需要为每个路径调用git check-ignore
+"""
+
+import os
+import re
+
+# 仓库中始终忽略的名称（git自身从不跟踪.git）
+BUILTIN_PATTERNS = (".git",)
+IGNORE_FILE_NAME = ".gitignore"
+
+
+def _translate_glob(pattern):
+    """将gitignore的通配符模式转换为正则表达式（不含首尾锚点）"""
+    result = []
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if char == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = i + 2 == length
+                if at_start and at_end:
+                    # a/** 或单独的 **：匹配其下的全部内容
+                    result.append(".*")
+                    i += 2
+                    continue
+                if at_start and pattern.startswith("**/", i):
+                    # **/a 或 a/**/b：匹配零个或多个目录
+                    result.append("(?:.*/)?")
+                    i += 3
+                    continue
+            result.append("[^/]*")
+            while i < length and pattern[i] == "*":
+                i += 1
+            continue
+        if char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            start = i + 2 if pattern.startswith("[!", i) or pattern.startswith("[^", i) else i + 1
+            # 紧跟在[或[!之后的]是字符集合中的普通字符，不结束集合
+            end = pattern.find("]", start + 1)
+            if end < 0:
+                result.append(re.escape(char))
+            else:
+                body = pattern[start:end].replace("\\", "\\\\").replace("[", "\\[").replace("]", "\\]")
+                result.append("[" + ("^" if start > i + 1 else "") + body + "]")
+                i = end
+        elif char == "\\" and i + 1 < length:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return "".join(result)
+
+
+def compile_pattern(line):
+    """
+    编译一行.gitignore模式
+
+    Args:
+        line (str): .gitignore中的一行
+
+    Returns:
+        tuple: (编译后的正则表达式, 是否为否定模式, 是否只匹配目录)，空行和注释返回None
+    """
+    line = line.rstrip("\r\n")
+    # 去掉末尾未转义的空格
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negate = False
+    if line.startswith("!"):
+        negate = True
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # 除末尾以外包含/的模式相对于.gitignore所在目录锚定，否则匹配任意层级的名称
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _translate_glob(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    try:
+        return re.compile("^" + regex + "$", re.DOTALL), negate, dir_only
+    except re.error:
+        # 与git一致，无法解析的模式视为不匹配任何路径
+        return None
+
+
+def parse_patterns(text):
+    """编译.gitignore文件内容中的全部模式，保持原有顺序"""
+    patterns = []
+    for line in text.splitlines():
+        compiled = compile_pattern(line)
+        if compiled is not None:
+            patterns.append(compiled)
+    return patterns
+
+
+class RuleSet:
+    """
+    某个目录生效的忽略规则
+
+    每个RuleSet保存一个.gitignore的模式和所在目录，并链接到上层目录的规则；
+    匹配时先检查本层（后出现的模式优先），本层没有匹配时再检查上层
+    """
+
+    __slots__ = ("parent", "base", "patterns")
+
+    def __init__(self, base, patterns, parent=None):
+        self.parent = parent
+        self.base = base
+        self.patterns = patterns
+
+    def match(self, path, is_dir):
+        """
+        判断路径是否匹配规则
+
+        Args:
+            path (str): 位于base之下的完整路径
+            is_dir (bool): 是否为目录
+
+        Returns:
+            bool: True表示忽略，False表示被否定模式重新包含，None表示没有规则匹配
+        """
+        rules = self
+        while rules is not None:
+            rel = path[len(rules.base) + 1:]
+            if os.sep != "/":
+                rel = rel.replace(os.sep, "/")
+            for regex, negate, dir_only in reversed(rules.patterns):
+                if dir_only and not is_dir:
+                    continue
+                if regex.match(rel):
+                    return not negate
+            rules = rules.parent
+        return None
+
+    def ignored(self, path, is_dir):
+        """路径是否被忽略"""
+        return self.match(path, is_dir) is True
+
+
+class IgnoreMatcher:
+    """
+    仓库根目录的忽略规则匹配器
+
+    规则在遍历时按目录逐层加载：rules_for(目录, 上层规则)返回该目录生效的规则，
+    目录下没有.gitignore时直接复用上层规则。已忽略的目录不再向下遍历，
+    因此与git一样，无法用否定模式重新包含已忽略目录中的文件
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root (str): 仓库根目录，会加载其.git/info/exclude
+        """
+        self.root = os.path.abspath(root)
+        patterns = [compile_pattern(pattern) for pattern in BUILTIN_PATTERNS]
+        try:
+            with open(os.path.join(self.root, ".git", "info", "exclude"), "r", encoding="utf-8",
+                      errors="replace") as file:
+                patterns.extend(parse_patterns(file.read()))
+        except OSError:
+            pass
+        self.base_rules = RuleSet(self.root, patterns)
+
+    def rules_for(self, dir_path, parent=None, names=None):
+        """
+        获取目录生效的规则
+
+        Args:
+            dir_path (str): 目录的完整路径
+            parent (RuleSet): 上层目录的规则，为None时使用仓库级规则
+            names (iterable): 可选，目录中的条目名称，用于避免不必要的文件打开
+
+        Returns:
+            RuleSet: 目录生效的规则
+        """
+        parent = parent or self.base_rules
+        if names is not None and IGNORE_FILE_NAME not in names:
+            return parent
+        try:
+            with open(os.path.join(dir_path, IGNORE_FILE_NAME), "r", encoding="utf-8", errors="replace") as file:
+                patterns = parse_patterns(file.read())
+        except OSError:
+            return parent
+        if not patterns:
+            return parent
+        return RuleSet(dir_path, patterns, parent)
+
+    def rules_for_path(self, dir_path):
+        """
+        从仓库根目录逐层加载到dir_path，获取其生效的规则
+
+        Args:
+            dir_path (str): 仓库根目录或其下的目录
+
+        Returns:
+            RuleSet: 目录生效的规则
+        """
+        dir_path = os.path.abspath(dir_path)
+        rules = self.rules_for(self.root)
+        if dir_path == self.root:
+            return rules
+        current = self.root
+        for part in os.path.relpath(dir_path, self.root).split(os.sep):
+            current = os.path.join(current, part)
+            rules = self.rules_for(current, rules)
+        return rules
+
+    def is_ignored(self, path, is_dir=None):
+        """
+        判断路径是否被忽略，祖先目录被忽略时其下的路径也视为被忽略
+
+        Args:
+            path (str): 仓库中的路径
+            is_dir (bool): 是否为目录，为None时检查文件系统
+
+        Returns:
+            bool: 是否被忽略
+        """
+        path = os.path.abspath(path)
+        if path == self.root:
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        rules = self.rules_for(self.root)
+        current = self.root
+        parts = os.path.relpath(path, self.root).split(os.sep)
+        for index, part in enumerate(parts):
+            current = os.path.join(current, part)
+            last = index == len(parts) - 1
+            if rules.ignored(current, is_dir if last else True):
+                return True
+            if not last:
+                rules = self.rules_for(current, rules)
+        return False
+
+
+def find_repo_root(path):
+    """
+    向上查找包含.git的目录
+
+    Args:
+        path (str): 起始路径
+
+    Returns:
+        str: 仓库根目录，不在仓库中时返回None
+    """
+    current = os.path.abspath(path)
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def matcher_for(path):
+    """
+    获取适用于path的匹配器：path位于仓库中时以仓库根目录为根，否则以path自身为根
+
+    Args:
+        path (str): 需要遍历的目录
+
+    Returns:
+        IgnoreMatcher: 匹配器
+    """
+    return IgnoreMatcher(find_repo_root(path) or path)
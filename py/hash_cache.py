@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文件内容摘要缓存模块
+使用SQLite持久化保存每个文件的内容摘要，以(路径, inode, 大小, mtime_ns)为键，
+键不变时直接复用摘要而不重新读取文件；大批量的文件在进程池中计算摘要。
+目录树摘要由全部文件的相对路径和内容摘要组合而成，可以判断整棵树的内容是否发生变化
+"""
+
+import os
+import stat
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+from response_utils import create_response_dict
+import gitignore_func
+import job_func
+import scan_func
+import worker_pool
+
+# 默认缓存文件路径（与settings.yaml同目录）
+DEFAULT_CACHE_PATH = os.path.join(Path(__file__).parent.parent, 'data', 'hash_cache.db')
+# 摘要算法
+HASH_ALGORITHM = "blake2b"
+# 读取文件的块大小
+READ_CHUNK_SIZE = 1024 * 1024
+# 需要计算摘要的文件数量达到该值时使用进程池，否则在线程池中计算
+PROCESS_POOL_MIN_FILES = 64
+# 每个进程任务处理的文件数量
+BATCH_SIZE = 32
+# mtime距离计算时间不足该值（秒）的文件不写入缓存：同一时间粒度内的再次修改不会改变mtime
+RACY_WINDOW = 2.0
+
+
+def hash_file(file_path):
+    """
+    计算单个文件的内容摘要
+
+    Args:
+        file_path (str): 文件路径
+
+    Returns:
+        str: 十六进制摘要，无法读取时返回None
+    """
+    digest = hashlib.new(HASH_ALGORITHM)
+    try:
+        with open(file_path, 'rb') as file:
+            while True:
+                chunk = file.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_files(file_paths):
+    """计算一批文件的内容摘要，在进程池中执行"""
+    return [hash_file(file_path) for file_path in file_paths]
+
+
+def _stat_file(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _cache_key(st):
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class ContentHashCache:
+    """
+    文件内容摘要缓存类
+
+    inode、大小或mtime_ns任一发生变化都视为文件已修改并重新计算摘要；
+    文件被替换（如编辑器先写临时文件再重命名）时inode变化，即使大小和mtime相同也能识别
+    """
+
+    def __init__(self, db_path=None):
+        """
+        初始化内容摘要缓存
+
+        Args:
+            db_path (str): 缓存数据库路径，为None时使用默认路径
+        """
+        self.db_path = db_path or DEFAULT_CACHE_PATH
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+
+    def _connect(self):
+        """打开数据库连接，无法写入磁盘时退回到内存数据库"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        except (OSError, sqlite3.Error):
+            conn = sqlite3.connect(':memory:', check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "path TEXT PRIMARY KEY, "
+            "ino INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "digest TEXT NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def _lookup(self, paths):
+        """批量查询缓存记录"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(paths), 500):
+                chunk = paths[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT path, ino, size, mtime_ns, digest FROM file_hashes WHERE path IN (%s)"
+                    % ",".join("?" * len(chunk)), chunk
+                ).fetchall()
+                for path, ino, size, mtime_ns, digest in rows:
+                    found[path] = ((ino, size, mtime_ns), digest)
+        return found
+
+    def _compute(self, paths, job=None):
+        """计算一批文件的摘要，数量较多时使用进程池"""
+        if len(paths) < PROCESS_POOL_MIN_FILES:
+            return worker_pool.map_in_pool(hash_file, paths)
+        executor = worker_pool.get_process_executor()
+        batches = [paths[start:start + BATCH_SIZE] for start in range(0, len(paths), BATCH_SIZE)]
+        futures = [executor.submit(hash_files, batch) for batch in batches]
+        digests = []
+        try:
+            for future in futures:
+                if job is not None and job.cancelled:
+                    break
+                digests.extend(future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+        return digests + [None] * (len(paths) - len(digests))
+
+    def get_digests(self, paths, stats=None, job=None):
+        """
+        获取多个文件的内容摘要，只重新计算键发生变化的文件
+
+        Args:
+            paths (list): 文件路径列表
+            stats (dict): 可选，用于接收本次计算/复用的文件数量
+            job (Job): 可选，所属的后台任务，取消后停止计算
+
+        Returns:
+            dict: 路径到十六进制摘要的映射，不存在、不是文件或无法读取的路径为None
+        """
+        if stats is None:
+            stats = {}
+        stats.setdefault('hashed', 0)
+        stats.setdefault('reused', 0)
+        paths = [os.path.abspath(path) for path in paths]
+        file_stats = dict(zip(paths, worker_pool.map_in_pool(_stat_file, paths)))
+        cached = self._lookup(paths)
+
+        digests = {}
+        missing = []
+        for path in paths:
+            st = file_stats[path]
+            if st is None or not stat.S_ISREG(st.st_mode):
+                digests[path] = None
+                continue
+            record = cached.get(path)
+            if record is not None and record[0] == _cache_key(st):
+                digests[path] = record[1]
+                stats['reused'] += 1
+            else:
+                missing.append(path)
+
+        if missing:
+            computed = self._compute(missing, job)
+            now = time.time()
+            rows = []
+            for path, digest in zip(missing, computed):
+                digests[path] = digest
+                st = file_stats[path]
+                if digest is None:
+                    continue
+                stats['hashed'] += 1
+                if now - st.st_mtime >= RACY_WINDOW:
+                    rows.append((path, *_cache_key(st), digest))
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO file_hashes (path, ino, size, mtime_ns, digest) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+        return digests
+
+    def tree_digest(self, root, respect_gitignore=True, stats=None, job=None):
+        """
+        计算目录树的内容摘要，由全部文件的相对路径和内容摘要组合而成
+
+        Args:
+            root (str): 根目录
+            respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树（总是跳过.git等版本控制目录）
+            stats (dict): 可选，用于接收本次计算/复用的文件数量
+            job (Job): 可选，所属的后台任务，取消后停止计算
+
+        Returns:
+            tuple: (十六进制摘要, 文件数量)
+        """
+        root = os.path.abspath(root)
+        ignore = gitignore_func.matcher_for(root) if respect_gitignore else None
+        paths = list(scan_func.iter_files(root, (), ignore))
+        digests = self.get_digests(paths, stats, job)
+        tree = hashlib.new(HASH_ALGORITHM)
+        for path in sorted(paths):
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            tree.update(f"{rel}\0{digests.get(path) or ''}\n".encode("utf-8", "surrogateescape"))
+        return tree.hexdigest(), len(paths)
+
+    def clear(self):
+        """清空整个缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM file_hashes")
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+# 全局缓存实例（延迟创建）
+_global_cache = None
+_global_cache_lock = threading.Lock()
+
+
+def get_hash_cache():
+    """获取全局内容摘要缓存实例"""
+    global _global_cache
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = ContentHashCache()
+        return _global_cache
+
+
+def get_file_digests(paths):
+    """
+    获取多个文件的内容摘要
+
+    Args:
+        paths (list): 文件路径列表
+
+    Returns:
+        dict: 包含digests映射（路径到摘要，无法读取时为None）和hashed/reused统计的响应字典
+    """
+    if not isinstance(paths, (list, tuple)):
+        return create_response_dict(success=False, error="paths必须是路径列表")
+    stats = {}
+    try:
+        digests = get_hash_cache().get_digests([str(path) for path in paths], stats)
+    except Exception as e:
+        return create_response_dict(success=False, error=f"计算文件摘要失败: {str(e)}")
+    return create_response_dict(success=True, digests=digests, algorithm=HASH_ALGORITHM, **stats)
+
+
+def _tree_digest_job(job, root, respect_gitignore):
+    stats = {}
+    digest, files = get_hash_cache().tree_digest(root, respect_gitignore, stats, job)
+    return {"path": root, "digest": digest, "files": files, "algorithm": HASH_ALGORITHM, **stats}
+
+
+def get_tree_digest(root, respect_gitignore=True):
+    """
+    在后台任务中计算目录树的内容摘要
+
+    Args:
+        root (str): 根目录
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+
+    Returns:
+        dict: 包含job_id的响应字典，结果（digest、files、hashed、reused）通过任务完成事件返回
+    """
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    job = job_func.start_job("tree_digest", _tree_digest_job, os.path.abspath(root), bool(respect_gitignore))
+    return create_response_dict(success=True, job_id=job.job_id)
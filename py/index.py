@@ -7,6 +7,17 @@ from response_utils import create_response_dict
 import disk_func
 import format_func
 import command_func
+import job_func
+import read_func
+import watch_func
+import search_func
+import file_index
+import hash_cache
+import usage_func
+import duplicate_func
+import tree_snapshot
+import compare_func
+import archive_func
 from data_processing.update_yaml import update_path_config
 from data_processing.get_yaml import get_path_config
 # 全局窗口变量
@@ -22,14 +33,100 @@ class Func:
     def create_response_dict(*args, **kwargs):
         return create_response_dict(*args, **kwargs)
 
+def push_job_event(event):
+    """
+    将后台任务事件推送到页面，由页面中的window.onBackendJobEvent处理
+
+    Args:
+        event (dict): 任务事件
+    """
+    if global_window:
+        global_window.evaluate_js(
+            f"window.onBackendJobEvent && window.onBackendJobEvent({json.dumps(event, ensure_ascii=False)})"
+        )
+
 class Api:
-    def get_files(self, path):
-        return disk_func.get_files(path)
+    def get_files(self, path, async_sizes=False, estimate_sizes=False, refresh_sizes=False):
+        return disk_func.get_files(path, async_sizes, estimate_sizes, refresh_sizes)
+
+    def get_files_page(self, path, sort_key="name", direction="asc", cursor=None, page_size=200, async_sizes=False,
+                       estimate_sizes=False, refresh_sizes=False):
+        return disk_func.get_files_page(path, sort_key, direction, cursor, page_size, async_sizes, estimate_sizes,
+                                        refresh_sizes)
+
+    def get_deduplicated_size(self, path, one_filesystem=False):
+        return disk_func.get_deduplicated_size(path, one_filesystem)
+
+    def get_size_report(self, path):
+        return disk_func.get_size_report(path)
+
+    def estimate_directory_size(self, path, time_budget_ms=50):
+        return disk_func.estimate_directory_size(path, time_budget_ms)
+
+    def tail_file(self, file_path, cursor=None):
+        return read_func.tail_file(file_path, cursor)
+
+    def follow_file(self, file_path, interval=read_func.DEFAULT_FOLLOW_INTERVAL):
+        return read_func.follow_file(file_path, interval)
+
+    def get_cache_stats(self):
+        return disk_func.get_cache_stats()
+
+    def watch_directory(self, path):
+        return watch_func.watch_directory(path)
+
+    def unwatch_directory(self):
+        return watch_func.unwatch_directory()
+
+    def index_files(self, path):
+        return file_index.index_files(path)
+
+    def find_files(self, root, query, limit=file_index.DEFAULT_LIMIT):
+        return file_index.find_files(root, query, limit)
+
+    def get_largest_items(self, root, n=usage_func.DEFAULT_TOP_N, respect_gitignore=False):
+        return usage_func.get_largest_items(root, n, respect_gitignore)
+
+    def get_treemap(self, root, depth=usage_func.DEFAULT_TREEMAP_DEPTH, max_children=usage_func.DEFAULT_MAX_CHILDREN,
+                    respect_gitignore=False):
+        return usage_func.get_treemap(root, depth, max_children, respect_gitignore)
+
+    def find_duplicates(self, root, min_size=duplicate_func.DEFAULT_MIN_SIZE, respect_gitignore=False):
+        return duplicate_func.find_duplicates(root, min_size, respect_gitignore=respect_gitignore)
+
+    def search_content(self, root, pattern, regex=False, case_sensitive=False, max_matches=search_func.DEFAULT_MAX_MATCHES,
+                       respect_gitignore=False):
+        return search_func.search_content(root, pattern, regex, case_sensitive, max_matches=max_matches,
+                                          respect_gitignore=respect_gitignore)
+
+    def poll_job(self, job_id, cursor=0):
+        return job_func.poll_job(job_id, cursor)
+
+    def cancel_job(self, job_id):
+        return job_func.cancel_job(job_id)
     
     def read(self,file_path):
         result = disk_func.read_file(file_path)
         return result
 
+    def read_range(self, file_path, offset=0, length=None):
+        return read_func.read_range(file_path, offset, length)
+
+    def read_lines(self, file_path, start_line=0, line_count=100):
+        return read_func.read_lines(file_path, start_line, line_count)
+
+    def read_hex(self, file_path, offset=0, length=256):
+        return read_func.read_hex(file_path, offset, length)
+
+    def get_line_info(self, file_path, offset=None):
+        return read_func.get_line_info(file_path, offset)
+
+    def read_preview(self, file_path, max_bytes=read_func.DEFAULT_PREVIEW_SIZE):
+        return read_func.read_preview(file_path, max_bytes)
+
+    def stream_file(self, file_path, chunk_size=read_func.DEFAULT_CHUNK_SIZE):
+        return read_func.stream_file(file_path, chunk_size)
+
     def list_paths(self) -> dict:
         return disk_func.list_common_paths()
     def open_folder_dialog(self):
@@ -57,6 +154,18 @@ class Api:
             return None
     def is_git_repository(self, path):
         return disk_func.is_git_repository(path)
+    def stat_many(self, paths):
+        return disk_func.stat_many(paths)
+    def get_file_digests(self, paths):
+        return hash_cache.get_file_digests(paths)
+    def get_tree_digest(self, root, respect_gitignore=True):
+        return hash_cache.get_tree_digest(root, respect_gitignore)
+    def get_changes_since_last(self, root, respect_gitignore=False):
+        return tree_snapshot.get_changes_since_last(root, respect_gitignore)
+    def compare_directories(self, a, b, mode="mirror", respect_gitignore=False):
+        return compare_func.compare_directories(a, b, mode, respect_gitignore)
+    def export_archive(self, root, output_path, archive_format="zip", respect_gitignore=False, overwrite=False):
+        return archive_func.export_archive(root, output_path, archive_format, respect_gitignore, overwrite=overwrite)
     def execute_command(self, command, cwd=None):
         return command_func.execute_command(command, cwd)
     def handle_github_import(self, github_url):
@@ -161,6 +270,9 @@ if __name__ == '__main__':
             resizable=True
         )
         
+        # 后台任务事件推送到页面
+        job_func.set_event_pusher(push_job_event)
+
         # 启动应用程序
         webview.start(on_window_loaded, debug=True)
         
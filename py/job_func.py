@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+后台任务模块
+管理在后台线程中运行的长耗时任务，任务产生的事件既可以通过推送函数
+实时发送到页面，也可以由前端按游标轮询获取
+"""
+
+import time
+import uuid
+import threading
+
+from response_utils import create_response_dict
+
+# 最多保留的任务数量，超过时清理最早结束的任务
+MAX_JOBS = 64
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+# 事件推送函数，由窗口创建后设置，参数为事件字典
+_event_pusher = None
+
+
+def set_event_pusher(pusher):
+    """
+    设置事件推送函数
+
+    Args:
+        pusher (callable): 接收事件字典的函数，为None时只保留轮询方式
+    """
+    global _event_pusher
+    _event_pusher = pusher
+
+
+class Job:
+    """
+    后台任务类
+
+    任务事件按顺序追加到events列表中，前端通过游标（已读取的事件数量）增量获取；
+    长期运行的任务可以设置max_events，只保留最近的事件，游标仍按事件总数计算
+    """
+
+    def __init__(self, kind, max_events=None):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.max_events = max_events
+        # 因超过max_events而被丢弃的事件数量
+        self.dropped_events = 0
+        self.status = "running"
+        self.error = None
+        self.result = None
+        self.events = []
+        self.created_at = time.time()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        """任务是否已被请求取消"""
+        return self.cancel_event.is_set()
+
+    def emit(self, event_type, keep=True, **data):
+        """
+        记录一条任务事件并推送到页面
+
+        Args:
+            event_type (str): 事件类型
+            keep (bool): 是否保留在事件列表中供轮询，数据量大的事件可只推送不保留
+            **data: 事件数据
+        """
+        event = {"job_id": self.job_id, "kind": self.kind, "type": event_type}
+        event.update(data)
+        if keep:
+            with self._lock:
+                self.events.append(event)
+                if self.max_events is not None and len(self.events) > self.max_events:
+                    overflow = len(self.events) - self.max_events
+                    del self.events[:overflow]
+                    self.dropped_events += overflow
+        pusher = _event_pusher
+        if pusher is not None:
+            try:
+                pusher(event)
+            except Exception:
+                # 推送失败时前端仍可通过轮询获取事件
+                pass
+
+    def finish(self, result=None, error=None):
+        """
+        结束任务并发送结束事件
+
+        Args:
+            result: 任务最终结果
+            error (str): 错误信息，为None表示成功
+        """
+        self.result = result
+        self.error = error
+        if error:
+            self.status = "error"
+        elif self.cancelled:
+            self.status = "cancelled"
+        else:
+            self.status = "done"
+        self.finished_at = time.time()
+        self.emit(self.status, result=result, error=error)
+
+    def snapshot(self, cursor=0):
+        """
+        获取任务状态和游标之后的事件
+
+        Args:
+            cursor (int): 已经读取的事件数量
+
+        Returns:
+            dict: 任务状态和新事件
+        """
+        with self._lock:
+            events = self.events[max(0, cursor - self.dropped_events):]
+            next_cursor = self.dropped_events + len(self.events)
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "events": events,
+            "cursor": next_cursor
+        }
+
+
+def _prune_jobs():
+    """清理超出数量上限的已结束任务"""
+    finished = sorted((job for job in _jobs.values() if job.finished_at is not None),
+                      key=lambda job: job.finished_at)
+    while len(_jobs) > MAX_JOBS and finished:
+        _jobs.pop(finished.pop(0).job_id, None)
+
+
+def start_job(kind, target, *args, max_events=None, **kwargs):
+    """
+    创建任务并在后台线程中运行
+
+    target的第一个参数为Job对象，其返回值作为任务结果；
+    抛出的异常会记录为任务错误
+
+    Args:
+        kind (str): 任务类型
+        target (callable): 任务函数
+        *args: 传给任务函数的位置参数
+        max_events (int): 最多保留的事件数量，为None时不限制
+        **kwargs: 传给任务函数的关键字参数
+
+    Returns:
+        Job: 新创建的任务
+    """
+    job = Job(kind, max_events)
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+        _prune_jobs()
+
+    def run():
+        try:
+            result = target(job, *args, **kwargs)
+        except Exception as e:
+            job.finish(error=str(e))
+        else:
+            job.finish(result=result)
+
+    thread = threading.Thread(target=run, daemon=True, name=f"job-{kind}")
+    thread.start()
+    return job
+
+
+def get_job(job_id):
+    """根据任务ID获取任务对象，不存在时返回None"""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def poll_job(job_id, cursor=0):
+    """
+    轮询任务状态和新事件
+
+    Args:
+        job_id (str): 任务ID
+        cursor (int): 已经读取的事件数量
+
+    Returns:
+        dict: 包含任务状态和新事件的响应字典
+    """
+    job = get_job(job_id)
+    if job is None:
+        return create_response_dict(success=False, error="任务不存在")
+    return create_response_dict(success=True, **job.snapshot(cursor))
+
+
+def cancel_job(job_id):
+    """
+    请求取消任务
+
+    Args:
+        job_id (str): 任务ID
+
+    Returns:
+        dict: 响应字典
+    """
+    job = get_job(job_id)
+    if job is None:
+        return create_response_dict(success=False, error="任务不存在")
+    job.cancel_event.set()
+    return create_response_dict(success=True, message="已请求取消任务")
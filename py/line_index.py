@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+行偏移索引模块
+单次流式扫描记录文件中每一行的起始字节偏移，之后定位任意行只需一次查表和一次seek；
+文件只在末尾追加内容时只扫描新增的部分。
+UTF-16/32等定长代码单元的编码按编码后的换行符扫描，只接受与代码单元对齐的位置
+"""
+
+import os
+import array
+import bisect
+import threading
+from collections import OrderedDict
+
+# 扫描时每次读取的字节数
+SCAN_CHUNK_SIZE = 1024 * 1024
+# 用于确认文件只是追加而非被改写的末尾样本长度
+TAIL_SAMPLE_SIZE = 64
+# 最多缓存的索引数量
+MAX_CACHED_INDEXES = 16
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class LineIndex:
+    """
+    文件的行偏移索引
+
+    offsets保存每一行的起始偏移（第一行为0），使用紧凑的8字节整数数组；
+    如果文件以换行符结尾，最后一个偏移等于已索引的大小，不对应实际的行
+    """
+
+    def __init__(self, file_path, newline=b"\n", origin=0):
+        """
+        Args:
+            file_path (str): 文件路径
+            newline (bytes): 编码后的换行符，长度即代码单元的字节数
+            origin (int): 第一行的起始偏移（跳过BOM），必须是代码单元字节数的整数倍
+        """
+        self.file_path = file_path
+        self.newline = newline
+        self.origin = origin
+        self.device = None
+        self.inode = None
+        self.mtime_ns = None
+        self.size = 0
+        self.offsets = array.array('q', [origin])
+        self.tail_sample = b""
+        # 刷新和查询索引时持有，避免查询时读到正在更新的数组
+        self.lock = threading.Lock()
+
+    @property
+    def line_count(self):
+        """文件的总行数"""
+        if self.offsets[-1] >= self.size:
+            return len(self.offsets) - 1
+        return len(self.offsets)
+
+    def _scan(self, file, start):
+        """从start开始扫描换行符并追加行偏移"""
+        newline = self.newline
+        unit = len(newline)
+        # 从代码单元边界开始读取，且每块都是代码单元的整数倍，换行符不会跨块
+        start -= (start - self.origin) % unit
+        file.seek(start)
+        base = start
+        offsets = self.offsets
+        while True:
+            chunk = file.read(SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            pos = chunk.find(newline)
+            while pos >= 0:
+                if unit == 1 or (base + pos - self.origin) % unit == 0:
+                    offsets.append(base + pos + unit)
+                pos = chunk.find(newline, pos + 1)
+            base += len(chunk)
+        return base
+
+    def _read_tail_sample(self, file, size):
+        start = max(0, size - TAIL_SAMPLE_SIZE)
+        file.seek(start)
+        return file.read(size - start)
+
+    def _is_append_of(self, st, file):
+        """判断文件是否只是在已索引内容之后追加了数据"""
+        if self.mtime_ns is None or (st.st_dev, st.st_ino) != (self.device, self.inode):
+            return False
+        if st.st_size < self.size:
+            return False
+        return self._read_tail_sample(file, self.size) == self.tail_sample
+
+    def refresh(self):
+        """
+        使索引与文件当前内容一致
+
+        文件未变化时直接返回；只追加内容时只扫描新增部分；其他情况重新建立索引
+
+        Returns:
+            LineIndex: 当前索引
+        """
+        st = os.stat(self.file_path)
+        if (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size) == \
+                (self.device, self.inode, self.mtime_ns, self.size):
+            return self
+        with open(self.file_path, 'rb') as file:
+            if self._is_append_of(st, file):
+                start = self.size
+            else:
+                self.offsets = array.array('q', [self.origin])
+                start = self.origin
+            self.size = self._scan(file, start)
+            self.tail_sample = self._read_tail_sample(file, self.size)
+        self.device, self.inode, self.mtime_ns = st.st_dev, st.st_ino, st.st_mtime_ns
+        return self
+
+    def line_range(self, start_line, line_count):
+        """
+        获取行窗口对应的字节范围
+
+        Args:
+            start_line (int): 起始行号（从0开始）
+            line_count (int): 行数
+
+        Returns:
+            tuple: (起始偏移, 结束偏移)
+        """
+        total = self.line_count
+        start_line = min(max(0, start_line), total)
+        end_line = min(total, start_line + max(0, line_count))
+        start = self.offsets[start_line] if start_line < len(self.offsets) else self.size
+        end = self.offsets[end_line] if end_line < len(self.offsets) else self.size
+        return start, end
+
+    def line_at_offset(self, offset):
+        """
+        获取字节偏移所在的行号
+
+        Args:
+            offset (int): 字节偏移
+
+        Returns:
+            int: 行号（从0开始）
+        """
+        return max(0, bisect.bisect_right(self.offsets, offset) - 1)
+
+
+def get_line_index(file_path, newline=b"\n", origin=0):
+    """
+    获取文件的行偏移索引，按(路径, mtime, 大小)缓存并在文件追加后增量更新
+
+    Args:
+        file_path (str): 文件路径
+        newline (bytes): 编码后的换行符，UTF-16/32文件为对应编码的换行符
+        origin (int): 第一行的起始偏移（BOM的长度）
+
+    Returns:
+        LineIndex: 已刷新的索引
+
+    Raises:
+        OSError: 文件不存在或无法读取
+    """
+    key = (os.path.abspath(file_path), newline, origin)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is None:
+            index = LineIndex(key[0], newline, origin)
+            _cache[key] = index
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    with index.lock:
+        return index.refresh()
+
+
+def get_line_range(file_path, start_line, line_count, newline=b"\n", origin=0):
+    """
+    获取行窗口对应的字节范围
+
+    Args:
+        file_path (str): 文件路径
+        start_line (int): 起始行号（从0开始）
+        line_count (int): 行数
+        newline (bytes): 编码后的换行符
+        origin (int): 第一行的起始偏移（BOM的长度）
+
+    Returns:
+        tuple: (起始偏移, 结束偏移, 总行数)
+
+    Raises:
+        OSError: 文件不存在或无法读取
+    """
+    index = get_line_index(file_path, newline, origin)
+    with index.lock:
+        start, end = index.line_range(start_line, line_count)
+        return start, end, index.line_count
+
+
+def drop_line_index(file_path=None):
+    """
+    删除缓存的行索引
+
+    Args:
+        file_path (str): 文件路径，为None时清空全部缓存
+    """
+    with _cache_lock:
+        if file_path is None:
+            _cache.clear()
+        else:
+            path = os.path.abspath(file_path)
+            for key in [key for key in _cache if key[0] == path]:
+                del _cache[key]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录列表缓存模块
+在进程内以LRU方式缓存scandir扫描结果，每次使用前用目录自身的
+设备号、inode和mtime校验，未变化的目录再次访问只需一次stat
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+import scan_func
+
+# 默认最多缓存的目录数量和估算占用的字节数
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# 目录mtime距离扫描时间小于该值（秒）时不缓存：
+# 文件系统时间戳精度有限，同一时间片内的后续修改不会改变mtime
+RACY_WINDOW = 2.0
+# 估算单个条目字典的固定开销（字节）
+_ENTRY_OVERHEAD = 400
+
+
+def _estimate_bytes(entries):
+    """粗略估算扫描结果占用的内存"""
+    return sum(_ENTRY_OVERHEAD + 2 * (len(entry["name"]) + len(entry["path"])) for entry in entries)
+
+
+class ListingCache:
+    """
+    目录列表LRU缓存
+
+    缓存的条目列表由多个调用方共享，调用方不能修改其中的内容
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self):
+        while self._items and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+            _, item = self._items.popitem(last=False)
+            self._bytes -= item[1]
+            self.evictions += 1
+
+    def scan(self, path):
+        """
+        获取目录的扫描结果，目录未变化时直接返回缓存
+
+        Args:
+            path (str): 目录路径
+
+        Returns:
+            list: 与scan_func.scan_directory相同的条目列表
+
+        Raises:
+            OSError: 目录不存在或无法读取
+        """
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        validator = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] == validator:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[2]
+            self.misses += 1
+
+        entries = scan_func.scan_directory(path)
+        if time.time() - st.st_mtime < RACY_WINDOW:
+            return entries
+
+        size = _estimate_bytes(entries)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size <= self.max_bytes:
+                self._items[key] = (validator, size, entries)
+                self._bytes += size
+                self._evict()
+        return entries
+
+    def invalidate(self, path=None):
+        """
+        删除缓存
+
+        Args:
+            path (str): 目录路径，为None时清空全部缓存
+        """
+        with self._lock:
+            if path is None:
+                self._items.clear()
+                self._bytes = 0
+                return
+            item = self._items.pop(os.path.abspath(path), None)
+            if item is not None:
+                self._bytes -= item[1]
+
+    def stats(self):
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 命中、未命中、淘汰次数以及当前条目数和估算字节数
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes
+            }
+
+
+# 全局目录列表缓存
+listing_cache = ListingCache()
+
+
+def cached_scan_directory(path):
+    """使用全局缓存扫描目录"""
+    return listing_cache.scan(path)
+
+
+def invalidate_listing(path=None):
+    """使全局缓存中某个目录（或全部目录）的列表失效"""
+    listing_cache.invalidate(path)
+
+
+def get_cache_stats():
+    """获取全局缓存的统计信息"""
+    return listing_cache.stats()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录列表快照模块
+将目录扫描结果按指定字段排序后保存在服务端，分页请求只需按偏移量切片，
+后续页面的开销与页面大小成正比，不再重新列出整个目录
+"""
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+import listing_cache
+
+# 支持的排序字段
+SORT_KEYS = ("name", "size", "mtime", "type")
+# 最多保留的快照数量和快照有效期（秒）
+MAX_SNAPSHOTS = 8
+SNAPSHOT_TTL = 600
+
+# 快照条目使用元组保存以降低内存占用：(名称, 是否为文件, 大小, 修改时间)
+NAME, IS_FILE, SIZE, MTIME = range(4)
+
+_snapshots = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+class ListingSnapshot:
+    """已排序的目录列表快照"""
+
+    def __init__(self, path, entries, sort_key, descending):
+        self.snapshot_id = uuid.uuid4().hex
+        self.path = path
+        self.entries = entries
+        self.sort_key = sort_key
+        self.descending = descending
+        self.created_at = time.time()
+
+    @property
+    def expired(self):
+        return time.time() - self.created_at > SNAPSHOT_TTL
+
+    def page(self, offset, page_size):
+        """获取从offset开始的一页条目"""
+        return self.entries[offset:offset + page_size]
+
+
+def _sort_entries(entries, sort_key, descending):
+    """按字段排序，名称作为次要排序字段保证结果稳定"""
+    entries.sort(key=lambda entry: entry[NAME].lower())
+    if sort_key == "size":
+        entries.sort(key=lambda entry: entry[SIZE] or 0, reverse=descending)
+    elif sort_key == "mtime":
+        entries.sort(key=lambda entry: entry[MTIME], reverse=descending)
+    elif sort_key == "type":
+        # 目录在前，文件按扩展名分组
+        entries.sort(key=lambda entry: (entry[IS_FILE], entry[NAME].rpartition('.')[2].lower()
+                                        if entry[IS_FILE] and '.' in entry[NAME] else ''),
+                     reverse=descending)
+    elif descending:
+        entries.reverse()
+    return entries
+
+
+def create_snapshot(path, sort_key="name", descending=False, size_func=None):
+    """
+    扫描目录并创建排序快照
+
+    Args:
+        path (str): 目录路径
+        sort_key (str): 排序字段，可选name/size/mtime/type
+        descending (bool): 是否降序
+        size_func (callable): 按大小排序时用于计算目录大小的函数，参数为目录路径列表，
+            返回与之对应的大小列表
+
+    Returns:
+        ListingSnapshot: 新创建的快照
+
+    Raises:
+        OSError: 目录不存在或无法读取
+        ValueError: 不支持的排序字段
+    """
+    if sort_key not in SORT_KEYS:
+        raise ValueError(f"不支持的排序字段: {sort_key}")
+
+    scanned = listing_cache.cached_scan_directory(path)
+    entries = [[entry["name"], entry["is_file"], entry["size"], entry["mtime"]] for entry in scanned]
+    if sort_key == "size" and size_func is not None:
+        # 按大小排序需要先知道所有子目录的大小
+        dir_indexes = [i for i, item in enumerate(scanned) if not item["is_file"]]
+        sizes = size_func([scanned[i]["path"] for i in dir_indexes])
+        for i, size in zip(dir_indexes, sizes):
+            entries[i][SIZE] = size
+    entries = [tuple(entry) for entry in _sort_entries(entries, sort_key, descending)]
+
+    snapshot = ListingSnapshot(path, entries, sort_key, descending)
+    with _snapshots_lock:
+        _snapshots[snapshot.snapshot_id] = snapshot
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def get_snapshot(snapshot_id):
+    """
+    获取快照，快照不存在或已过期时返回None
+
+    Args:
+        snapshot_id (str): 快照ID
+
+    Returns:
+        ListingSnapshot: 快照对象或None
+    """
+    with _snapshots_lock:
+        snapshot = _snapshots.get(snapshot_id)
+        if snapshot is None:
+            return None
+        if snapshot.expired:
+            del _snapshots[snapshot_id]
+            return None
+        _snapshots.move_to_end(snapshot_id)
+        return snapshot
+
+
+def drop_snapshots(path=None):
+    """
+    删除快照
+
+    Args:
+        path (str): 只删除该目录的快照，为None时删除全部
+    """
+    with _snapshots_lock:
+        for snapshot_id in [key for key, snapshot in _snapshots.items()
+                            if path is None or snapshot.path == path]:
+            del _snapshots[snapshot_id]
+
+
+def encode_cursor(snapshot_id, offset):
+    """生成分页游标"""
+    return f"{snapshot_id}:{offset}"
+
+
+def decode_cursor(cursor):
+    """
+    解析分页游标
+
+    Returns:
+        tuple: (快照ID, 偏移量)，游标格式错误时返回None
+    """
+    snapshot_id, _, offset = str(cursor).partition(':')
+    if not snapshot_id or not offset.isdigit():
+        return None
+    return snapshot_id, int(offset)
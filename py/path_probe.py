@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+路径探测模块
+在独立的守护线程中并发探测路径是否可访问，每个探测有超时时间，结果按TTL缓存；
+失效的NFS/FUSE挂载点或网络驱动器会让stat长时间阻塞，超时的探测标记为pending，
+在后台继续执行，完成后写入缓存，不会阻塞调用方
+"""
+
+import time
+import threading
+
+# 默认的探测超时时间（秒）和缓存有效期（秒）
+DEFAULT_TIMEOUT = 0.3
+DEFAULT_TTL = 30.0
+# 表示探测仍在进行的结果
+PENDING = object()
+
+
+class ProbeCache:
+    """
+    带TTL的探测结果缓存
+
+    同一个键同时只有一个探测在执行，其他调用方等待同一个探测的结果；
+    阻塞的探测线程为守护线程，不影响程序退出
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._results = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _run(self, key, func, done):
+        try:
+            value = func()
+        except Exception:
+            value = None
+        with self._lock:
+            self._results[key] = (time.monotonic(), value)
+            self._inflight.pop(key, None)
+        done.set()
+
+    def _start(self, key, func):
+        """返回键对应的缓存结果，没有有效缓存时启动（或复用）探测并返回其完成事件"""
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.ttl:
+                return cached[1], None
+            done = self._inflight.get(key)
+            if done is None:
+                done = self._inflight[key] = threading.Event()
+                threading.Thread(
+                    target=self._run, args=(key, func, done), daemon=True, name="path-probe"
+                ).start()
+            return PENDING, done
+
+    def probe_many(self, probes, timeout=DEFAULT_TIMEOUT):
+        """
+        并发执行多个探测，最多等待timeout秒
+
+        Args:
+            probes (dict): 键到无参探测函数的映射，函数抛出异常时结果为None
+            timeout (float): 所有探测共享的等待时间（秒）
+
+        Returns:
+            dict: 键到探测结果的映射，超时未完成的为PENDING
+        """
+        results = {}
+        waiting = {}
+        for key, func in probes.items():
+            value, done = self._start(key, func)
+            if done is None:
+                results[key] = value
+            else:
+                waiting[key] = done
+        deadline = time.monotonic() + timeout
+        for key, done in waiting.items():
+            if done.wait(max(0.0, deadline - time.monotonic())):
+                with self._lock:
+                    results[key] = self._results[key][1]
+            else:
+                results[key] = PENDING
+        return results
+
+    def clear(self):
+        """清空缓存，正在执行的探测不受影响"""
+        with self._lock:
+            self._results.clear()
+
+
+# 全局探测缓存
+probe_cache = ProbeCache()
+
+
+def probe_many(probes, timeout=DEFAULT_TIMEOUT):
+    """使用全局缓存并发执行探测"""
+    return probe_cache.probe_many(probes, timeout)
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文件读取模块
+基于mmap按字节范围、基于行偏移索引按行窗口读取大文件，只复制请求的部分；
+并提供预览模式和分块推送的流式读取，避免一次性把整个文件读入内存
+"""
+
+import os
+import sys
+import mmap
+import codecs
+
+from config import get_config
+from response_utils import create_response_dict
+import job_func
+import line_index
+import sniff_func
+
+# storage.max_file_size未配置时的默认值（10MB）
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+# 预览模式默认读取的字节数
+DEFAULT_PREVIEW_SIZE = 64 * 1024
+# 流式读取默认的分块大小
+DEFAULT_CHUNK_SIZE = 256 * 1024
+# 跟踪模式首次读取时返回的末尾字节数
+DEFAULT_TAIL_BYTES = 16 * 1024
+# 跟踪模式推送时检查文件变化的间隔（秒）
+DEFAULT_FOLLOW_INTERVAL = 1.0
+
+
+def get_max_file_size():
+    """
+    读取demo/config.yaml中的storage.max_file_size
+
+    Returns:
+        int: 允许一次性读取的最大文件大小(字节)
+    """
+    try:
+        return int(get_config('storage.max_file_size', DEFAULT_MAX_FILE_SIZE))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_FILE_SIZE
+
+
+def _check_file(file_path):
+    """检查路径是否为存在的文件，返回错误响应或None"""
+    if not os.path.exists(file_path):
+        return create_response_dict(success=False, error="文件不存在")
+    if not os.path.isfile(file_path):
+        return create_response_dict(success=False, error="指定路径不是文件")
+    return None
+
+
+def _resolve_encoding(file_path, encoding):
+    """
+    确定读取文件使用的编码
+
+    Args:
+        file_path (str): 文件路径
+        encoding (str): 指定的编码，为None时根据文件开头的字节自动探测
+
+    Returns:
+        tuple: (编码, 探测结果)，二进制文件的编码为None；指定了编码时探测结果为None
+    """
+    if encoding:
+        return encoding, None
+    sniffed = sniff_func.sniff_file(file_path)
+    return sniffed["encoding"], sniffed
+
+
+def binary_response(file_path, sniffed, offset=0, length=sniff_func.DEFAULT_HEX_LENGTH):
+    """
+    生成二进制文件的响应：只返回元数据和一段十六进制窗口，不解码文件内容
+
+    Args:
+        file_path (str): 文件路径
+        sniffed (dict): sniff_func.sniff_file的结果
+        offset (int): 十六进制窗口的起始偏移
+        length (int): 十六进制窗口的字节数
+
+    Returns:
+        dict: 包含binary、file_format、size和hex的响应字典
+    """
+    return create_response_dict(
+        success=True,
+        binary=True,
+        content="",
+        file_format=sniffed.get("format"),
+        size=sniffed.get("size", os.path.getsize(file_path)),
+        hex=sniff_func.hex_window(file_path, offset, length)
+    )
+
+
+def read_hex(file_path, offset=0, length=sniff_func.DEFAULT_HEX_LENGTH):
+    """
+    以十六进制窗口读取文件的一段字节
+
+    Args:
+        file_path (str): 文件路径
+        offset (int): 起始偏移
+        length (int): 字节数，最多不超过storage.max_file_size
+
+    Returns:
+        dict: 包含hex、offset和size的响应字典
+    """
+    error = _check_file(file_path)
+    if error:
+        return error
+    try:
+        length = max(0, min(int(length), get_max_file_size()))
+        return create_response_dict(
+            success=True,
+            hex=sniff_func.hex_window(file_path, offset, length),
+            offset=max(0, int(offset)),
+            size=os.path.getsize(file_path)
+        )
+    except Exception as e:
+        return create_response_dict(success=False, error=f"读取文件失败: {str(e)}")
+
+
+def _utf8_bounds(data, at_start, at_end):
+    """
+    调整字节范围使其不截断UTF-8多字节字符
+
+    Args:
+        data (bytes): 原始字节
+        at_start (bool): 范围是否从文件开头开始
+        at_end (bool): 范围是否到达文件末尾
+
+    Returns:
+        tuple: (跳过的开头字节数, 保留的结尾位置)
+    """
+    start = 0
+    if not at_start:
+        # 跳过开头的UTF-8后续字节（10xxxxxx）
+        while start < min(3, len(data)) and (data[start] & 0xC0) == 0x80:
+            start += 1
+    end = len(data)
+    if not at_end:
+        # 回退到最后一个完整字符之后
+        for back in range(1, min(4, len(data) - start) + 1):
+            byte = data[end - back]
+            if (byte & 0xC0) == 0x80:
+                continue
+            if byte >= 0xC0:
+                needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+                if needed > back:
+                    end -= back
+            break
+    return start, end
+
+
+def _wide_codec(file_path, encoding):
+    """
+    获取UTF-16/32等定长代码单元编码的读取参数
+
+    按范围读取时偏移必须与代码单元对齐，且只有文件开头有BOM，
+    因此需要确定字节序并使用不处理BOM的编码
+
+    Args:
+        file_path (str): 文件路径
+        encoding (str): 文本编码
+
+    Returns:
+        tuple: (确定字节序的编码, 代码单元字节数, BOM长度)，不是UTF-16/32时返回None
+    """
+    name = codecs.lookup(encoding).name
+    if name.startswith("utf-16"):
+        unit, boms = 2, ((codecs.BOM_UTF16_LE, "le"), (codecs.BOM_UTF16_BE, "be"))
+    elif name.startswith("utf-32"):
+        unit, boms = 4, ((codecs.BOM_UTF32_LE, "le"), (codecs.BOM_UTF32_BE, "be"))
+    else:
+        return None
+    if name.endswith(("-le", "-be")):
+        return name, unit, 0
+    with open(file_path, 'rb') as file:
+        head = file.read(4)
+    for bom, order in boms:
+        if head.startswith(bom):
+            return f"{name}-{order}", unit, len(bom)
+    # 没有BOM时与Python的解码器一致，使用本机字节序
+    return f"{name}-{'le' if sys.byteorder == 'little' else 'be'}", unit, 0
+
+
+def _wide_bounds(data, codec, unit, at_start, at_end):
+    """
+    调整已对齐的字节范围使其不截断UTF-16代理对
+
+    Returns:
+        tuple: (跳过的开头字节数, 保留的结尾位置)
+    """
+    start, end = 0, len(data)
+    if unit == 2 and end >= 2:
+        order = 'little' if codec.endswith("-le") else 'big'
+        if not at_start and 0xDC00 <= int.from_bytes(data[:2], order) <= 0xDFFF:
+            start = 2
+        if not at_end and end - start >= 2 and 0xD800 <= int.from_bytes(data[end - 2:end], order) <= 0xDBFF:
+            end -= 2
+    return start, end
+
+
+class MappedFile:
+    """
+    只读内存映射文件的上下文管理器
+
+    空文件无法映射，此时data为空字节串
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = None
+        self.data = b""
+
+    def __enter__(self):
+        self._file = open(self.file_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size > 0:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *exc):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __len__(self):
+        return len(self.data)
+
+
+def read_range(file_path, offset=0, length=None, encoding=None):
+    """
+    按字节范围读取文件
+
+    范围边界会调整到完整的UTF-8字符或UTF-16/32代码单元上，实际读取的范围通过offset和next_offset返回；
+    二进制文件只返回元数据和十六进制窗口
+
+    Args:
+        file_path (str): 文件路径
+        offset (int): 起始字节偏移
+        length (int): 读取的字节数，为None时使用storage.max_file_size
+        encoding (str): 文本编码，为None时自动探测
+
+    Returns:
+        dict: 包含content、offset、next_offset、size和eof的响应字典
+    """
+    error = _check_file(file_path)
+    if error:
+        return error
+    if length is None:
+        length = get_max_file_size()
+    offset = max(0, int(offset))
+    length = max(0, min(int(length), get_max_file_size()))
+    try:
+        encoding, sniffed = _resolve_encoding(file_path, encoding)
+        if encoding is None:
+            return binary_response(file_path, sniffed, offset)
+        wide = _wide_codec(file_path, encoding)
+        with MappedFile(file_path) as mapped:
+            size = len(mapped)
+            offset = min(offset, size)
+            end = min(size, offset + length)
+            if wide is not None:
+                encoding, unit, bom_length = wide
+                offset = max(offset - offset % unit, bom_length)
+                if end < size:
+                    end -= (end - offset) % unit
+                end = max(offset, end)
+            data = mapped.data[offset:end]
+        start_skip, keep = (0, len(data))
+        if wide is not None:
+            start_skip, keep = _wide_bounds(data, encoding, wide[1], offset == wide[2], end == size)
+        elif codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig'):
+            start_skip, keep = _utf8_bounds(data, offset == 0, end == size)
+        content = data[start_skip:keep].decode(encoding, errors='replace')
+        return create_response_dict(
+            success=True,
+            content=content,
+            offset=offset + start_skip,
+            next_offset=offset + keep,
+            size=size,
+            eof=offset + keep >= size
+        )
+    except Exception as e:
+        return create_response_dict(success=False, error=f"读取文件失败: {str(e)}")
+
+
+def read_preview(file_path, max_bytes=DEFAULT_PREVIEW_SIZE, encoding=None):
+    """
+    预览模式：只读取文件开头的max_bytes字节
+
+    Args:
+        file_path (str): 文件路径
+        max_bytes (int): 最多读取的字节数
+        encoding (str): 文本编码，为None时自动探测
+
+    Returns:
+        dict: 与read_range相同，额外包含truncated字段
+    """
+    result = read_range(file_path, 0, max_bytes, encoding)
+    if result.get("success") and not result.get("binary"):
+        result["truncated"] = not result["eof"]
+    return result
+
+
+def _last_line_end(chunk, newline, unit):
+    """返回chunk中最后一个完整行的结束位置（换行符之后），没有完整行时返回0"""
+    pos = chunk.rfind(newline)
+    while pos >= 0 and pos % unit:
+        pos = chunk.rfind(newline, 0, pos + len(newline) - 1)
+    return pos + len(newline) if pos >= 0 else 0
+
+
+def read_lines(file_path, start_line=0, line_count=100, encoding=None):
+    """
+    按行窗口读取文件
+
+    通过行偏移索引直接定位起始行，索引按文件缓存，追加内容后只扫描新增部分
+
+    Args:
+        file_path (str): 文件路径
+        start_line (int): 起始行号（从0开始）
+        line_count (int): 读取的行数
+        encoding (str): 文本编码，为None时自动探测
+
+    Returns:
+        dict: 包含lines、start_line、total_lines、offset、next_offset和eof的响应字典
+    """
+    error = _check_file(file_path)
+    if error:
+        return error
+    start_line = max(0, int(start_line))
+    line_count = max(0, int(line_count))
+    try:
+        encoding, sniffed = _resolve_encoding(file_path, encoding)
+        if encoding is None:
+            return binary_response(file_path, sniffed)
+        newline, origin, unit = b"\n", 0, 1
+        wide = _wide_codec(file_path, encoding)
+        if wide is not None:
+            encoding, unit, origin = wide
+            newline = "\n".encode(encoding)
+        offset, window_end, total_lines = line_index.get_line_range(file_path, start_line, line_count, newline, origin)
+        end = window_end
+        # 行窗口的总字节数受storage.max_file_size限制
+        if end - offset > get_max_file_size():
+            end = offset + get_max_file_size() - get_max_file_size() % unit
+        with open(file_path, 'rb') as file:
+            file.seek(offset)
+            chunk = file.read(end - offset)
+        if end < window_end:
+            # 截断时在最后一个完整行处结束，单行超过上限时只能返回该行的前一部分
+            cut = _last_line_end(chunk, newline, unit)
+            if cut:
+                chunk = chunk[:cut]
+                end = offset + cut
+        # 与行索引一致只按\n分行，\r\n的\r属于换行符
+        lines = chunk.decode(encoding, errors='replace').split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+        return create_response_dict(
+            success=True,
+            lines=lines,
+            start_line=start_line,
+            total_lines=total_lines,
+            offset=offset,
+            next_offset=end,
+            size=os.path.getsize(file_path),
+            eof=end == window_end and start_line + len(lines) >= total_lines
+        )
+    except Exception as e:
+        return create_response_dict(success=False, error=f"读取文件失败: {str(e)}")
+
+
+def get_line_info(file_path, offset=None, encoding=None):
+    """
+    获取文件的总行数，以及可选的字节偏移所在的行号
+
+    Args:
+        file_path (str): 文件路径
+        offset (int): 字节偏移，为None时不计算所在行号
+        encoding (str): 文本编码，为None时自动探测（只影响UTF-16/32文件的换行符）
+
+    Returns:
+        dict: 包含total_lines、size和line的响应字典
+    """
+    error = _check_file(file_path)
+    if error:
+        return error
+    try:
+        newline, origin = b"\n", 0
+        encoding, _ = _resolve_encoding(file_path, encoding)
+        wide = _wide_codec(file_path, encoding) if encoding else None
+        if wide is not None:
+            newline, origin = "\n".encode(wide[0]), wide[2]
+        index = line_index.get_line_index(file_path, newline, origin)
+        with index.lock:
+            line = index.line_at_offset(int(offset)) if offset is not None else None
+            return create_response_dict(success=True, total_lines=index.line_count, size=index.size, line=line)
+    except Exception as e:
+        return create_response_dict(success=False, error=f"读取文件失败: {str(e)}")
+
+
+def _stream_job(job, file_path, chunk_size, encoding):
+    """
+    流式读取任务：按块读取文件并通过chunk事件推送到页面
+
+    chunk事件只推送不保留在任务事件列表中，避免大文件在内存中累积；
+    轮询方式的调用方应使用read_range按next_offset继续读取
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    offset = 0
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file:
+        while not job.cancelled:
+            data = file.read(chunk_size)
+            final = len(data) < chunk_size
+            text = decoder.decode(data, final=final)
+            if text:
+                job.emit("chunk", keep=False, content=text, offset=offset)
+            offset += len(data)
+            job.emit("progress", offset=offset, size=size)
+            if final:
+                break
+    return {"bytes_read": offset, "size": size}
+
+
+def stream_file(file_path, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+    """
+    流式读取文件，分块内容通过后台任务事件推送到页面
+
+    Args:
+        file_path (str): 文件路径
+        chunk_size (int): 每块的字节数
+        encoding (str): 文本编码
+
+    Returns:
+        dict: 包含job_id和文件大小的响应字典
+    """
+    error = _check_file(file_path)
+    if error:
+        return error
+    chunk_size = max(4096, int(chunk_size))
+    job = job_func.start_job("read", _stream_job, file_path, chunk_size, encoding)
+    return create_response_dict(success=True, job_id=job.job_id, size=os.path.getsize(file_path))
+
+
+def tail_file(file_path, cursor=None, initial_bytes=DEFAULT_TAIL_BYTES, encoding='utf-8'):
+    """
+    跟踪模式（类似tail -f）：只返回上次读取位置之后新增的内容
+
+    cursor记录上次读取到的偏移以及文件的设备号和inode：
+    inode变化说明文件被轮转（rotated），文件变小说明被截断（truncated），
+    两种情况都从新文件开头重新读取。
+
+    Args:
+        file_path (str): 文件路径
+        cursor (dict): 上次调用返回的cursor，为None时从文件末尾的initial_bytes处开始
+        initial_bytes (int): 首次调用时返回的末尾字节数
+        encoding (str): 文本编码
+
+    Returns:
+        dict: 包含content、cursor、rotated、truncated和more的响应字典，
+            more为True表示新增内容超过storage.max_file_size，需要立即再次调用
+    """
+    error = _check_file(file_path)
+    if error:
+        return error
+    try:
+        with open(file_path, 'rb') as file:
+            st = os.fstat(file.fileno())
+            rotated = truncated = False
+            if not cursor:
+                offset = max(0, st.st_size - max(0, int(initial_bytes)))
+            else:
+                offset = int(cursor.get("offset", 0))
+                if (cursor.get("device"), cursor.get("inode")) != (st.st_dev, st.st_ino):
+                    rotated = True
+                    offset = 0
+                elif st.st_size < offset:
+                    truncated = True
+                    offset = 0
+            end = min(st.st_size, offset + get_max_file_size())
+            file.seek(offset)
+            data = file.read(end - offset)
+        start_skip, keep = 0, len(data)
+        if codecs.lookup(encoding).name == 'utf-8':
+            # 首次从文件中间开始时跳过不完整的字符，结尾保留到完整字符为止
+            start_skip, keep = _utf8_bounds(data, bool(cursor) or offset == 0, end == st.st_size)
+        content = data[start_skip:keep].decode(encoding, errors='replace')
+        next_offset = offset + keep
+        return create_response_dict(
+            success=True,
+            content=content,
+            cursor={"offset": next_offset, "device": st.st_dev, "inode": st.st_ino},
+            rotated=rotated,
+            truncated=truncated,
+            more=end < st.st_size,
+            size=st.st_size
+        )
+    except Exception as e:
+        return create_response_dict(success=False, error=f"读取文件失败: {str(e)}")
+
+
+def _follow_job(job, file_path, interval, initial_bytes, encoding):
+    """
+    跟踪任务：定期检查文件，有新增内容时推送append事件
+
+    文件未变化时只产生一次stat调用，不会重新读取文件
+    """
+    cursor = None
+    last_state = None
+    while not job.cancelled:
+        try:
+            st = os.stat(file_path)
+            state = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            # 轮转过程中文件可能暂时不存在
+            state = None
+        if state is not None and state != last_state:
+            result = tail_file(file_path, cursor, initial_bytes, encoding)
+            if not result.get("success"):
+                job.emit("error", message=result.get("error"))
+            else:
+                cursor = result["cursor"]
+                if result["rotated"] or result["truncated"]:
+                    job.emit("reset", rotated=result["rotated"], truncated=result["truncated"])
+                if result["content"]:
+                    job.emit("append", keep=False, content=result["content"], offset=cursor["offset"])
+                if result["more"]:
+                    continue
+                last_state = state
+        job.cancel_event.wait(interval)
+    return {"cursor": cursor}
+
+
+def follow_file(file_path, interval=DEFAULT_FOLLOW_INTERVAL, initial_bytes=DEFAULT_TAIL_BYTES, encoding='utf-8'):
+    """
+    以推送方式跟踪文件，新增内容通过后台任务的append事件发送到页面，取消任务即停止跟踪
+
+    Args:
+        file_path (str): 文件路径
+        interval (float): 检查文件变化的间隔（秒）
+        initial_bytes (int): 开始跟踪时推送的末尾字节数
+        encoding (str): 文本编码
+
+    Returns:
+        dict: 包含job_id的响应字典
+    """
+    error = _check_file(file_path)
+    if error:
+        return error
+    interval = max(0.1, float(interval))
+    job = job_func.start_job("follow", _follow_job, file_path, interval, initial_bytes, encoding)
+    return create_response_dict(success=True, job_id=job.job_id)
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录扫描引擎模块
+基于os.scandir和DirEntry缓存的stat信息，每个条目最多stat一次，
+供目录列表和目录大小统计共同使用
+"""
+
+import os
+import stat
+
+# 遍历时总是跳过的版本控制目录
+SKIP_DIRS = {".git", ".svn", ".hg"}
+
+
+def _entry_stat(entry):
+    """
+    获取条目的stat信息（跟随符号链接），失效的符号链接退回到链接自身的信息
+
+    DirEntry会缓存stat结果，对非符号链接只产生一次系统调用
+
+    Returns:
+        os.stat_result: stat信息，条目已不存在时返回None
+    """
+    try:
+        return entry.stat()
+    except OSError:
+        try:
+            return entry.stat(follow_symlinks=False)
+        except OSError:
+            return None
+
+
+class InodeDedup:
+    """
+    按(设备号, inode)去重的遍历状态
+
+    硬链接（链接数大于1）的文件只统计第一次出现的大小；同一个目录（例如通过
+    bind mount再次出现）只遍历一次；one_filesystem为True时不进入其他文件系统的目录。
+    Windows上DirEntry可能不提供inode（为0），此时不去重
+    """
+
+    def __init__(self, root=None, one_filesystem=False):
+        """
+        Args:
+            root (str): 遍历的根目录，one_filesystem为True时以其所在的文件系统为准
+            one_filesystem (bool): 是否只统计与root位于同一文件系统的目录
+        """
+        self.one_filesystem = one_filesystem
+        self.device = None
+        self._files = set()
+        self._dirs = set()
+        self.duplicate_files = 0
+        self.duplicate_bytes = 0
+        self.skipped_dirs = 0
+        self.skipped_mounts = 0
+        if root is not None:
+            st = os.stat(root)
+            self.device = st.st_dev
+            self.enter_dir(st)
+
+    def file_size(self, st):
+        """返回文件应计入的大小，已统计过的硬链接返回0"""
+        if st.st_nlink > 1 and st.st_ino:
+            key = (st.st_dev, st.st_ino)
+            if key in self._files:
+                self.duplicate_files += 1
+                self.duplicate_bytes += st.st_size
+                return 0
+            self._files.add(key)
+        return st.st_size
+
+    def enter_dir(self, st):
+        """判断是否应进入目录，同一目录第二次出现或位于其他文件系统时返回False"""
+        if self.one_filesystem and self.device is not None and st.st_dev != self.device:
+            self.skipped_mounts += 1
+            return False
+        if st.st_ino:
+            key = (st.st_dev, st.st_ino)
+            if key in self._dirs:
+                self.skipped_dirs += 1
+                return False
+            self._dirs.add(key)
+        return True
+
+    def stats(self):
+        """去重统计：重复的硬链接数量和字节数、跳过的重复目录和挂载点数量"""
+        return {
+            "duplicate_files": self.duplicate_files,
+            "duplicate_bytes": self.duplicate_bytes,
+            "skipped_dirs": self.skipped_dirs,
+            "skipped_mounts": self.skipped_mounts
+        }
+
+
+def scan_directory(path):
+    """
+    扫描目录的直接条目
+
+    Args:
+        path (str): 目录路径
+
+    Returns:
+        list: 条目信息字典列表，包含以下键:
+            - name: 名称
+            - path: 完整路径
+            - is_file: 是否为文件（跟随符号链接）
+            - is_symlink: 是否为符号链接
+            - size: 文件大小(字节)，目录为None
+            - mtime: 修改时间戳
+            - mtime_ns: 纳秒精度的修改时间
+            - inode: inode编号
+            - device: 设备编号
+
+    Raises:
+        OSError: 目录不存在或无法读取
+    """
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            st = _entry_stat(entry)
+            if st is None:
+                continue
+            is_file = not stat.S_ISDIR(st.st_mode)
+            entries.append({
+                "name": entry.name,
+                "path": entry.path,
+                "is_file": is_file,
+                "is_symlink": entry.is_symlink(),
+                "size": st.st_size if is_file else None,
+                "mtime": st.st_mtime,
+                "mtime_ns": st.st_mtime_ns,
+                "inode": st.st_ino,
+                "device": st.st_dev
+            })
+    return entries
+
+
+def scan_sizes(path):
+    """
+    统计单个目录直接包含的文件大小，并列出需要继续向下遍历的子目录
+
+    与os.walk(followlinks=False) + os.path.getsize的语义一致：
+    文件符号链接按目标大小计算，不进入指向目录的符号链接，忽略失效链接。
+    子目录只依赖DirEntry的类型信息判断，不产生额外的stat调用。
+
+    Args:
+        path (str): 目录路径
+
+    Returns:
+        tuple: (直接文件大小之和, 按名称排序的子目录名称列表)
+
+    Raises:
+        OSError: 目录不存在或无法读取
+    """
+    files_size = 0
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.name)
+                else:
+                    files_size += entry.stat().st_size
+            except OSError:
+                pass
+    subdirs.sort()
+    return files_size, subdirs
+
+
+def scan_files(path, dedup=None):
+    """
+    列出单个目录直接包含的文件及其大小，以及需要继续向下遍历的子目录
+
+    语义与scan_sizes一致，只是保留每个文件的大小
+
+    Args:
+        path (str): 目录路径
+        dedup (InodeDedup): 可选，按inode去重硬链接并跳过重复目录和其他文件系统，
+            此时每个子目录多一次stat
+
+    Returns:
+        tuple: ((文件名, 大小)列表, 按名称排序的子目录名称列表)
+
+    Raises:
+        OSError: 目录不存在或无法读取
+    """
+    files = []
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        if dedup is None or dedup.enter_dir(entry.stat(follow_symlinks=False)):
+                            subdirs.append(entry.name)
+                elif dedup is None:
+                    files.append((entry.name, entry.stat().st_size))
+                else:
+                    files.append((entry.name, dedup.file_size(entry.stat())))
+            except OSError:
+                pass
+    subdirs.sort()
+    return files, subdirs
+
+
+def walk_size(path, dedup=None):
+    """
+    不使用索引，单次遍历计算目录总大小
+
+    Args:
+        path (str): 目录路径
+        dedup (InodeDedup): 可选，按inode去重硬链接并跳过重复目录和其他文件系统
+
+    Returns:
+        int: 目录总大小(字节)，无法读取的子目录按0计算
+    """
+    total_size = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            if dedup is None:
+                files_size, subdirs = scan_sizes(current)
+            else:
+                files, subdirs = scan_files(current, dedup)
+                files_size = sum(size for _, size in files)
+        except OSError:
+            continue
+        total_size += files_size
+        stack.extend(os.path.join(current, name) for name in subdirs)
+    return total_size
+
+
+def walk_tree(root, on_file=None, on_dir=None, should_stop=None, ignore=None, dedup=None):
+    """
+    单次后序遍历目录树，逐个报告文件大小和每个目录的聚合大小
+
+    遍历只保存当前路径上各目录的状态，内存占用与目录深度有关而与文件数量无关。
+    文件和目录的语义与scan_sizes一致，无法读取的目录按0计算。
+
+    Args:
+        root (str): 根目录
+        on_file (callable): on_file(路径, 大小, 深度)，深度为文件所在目录相对root的层数
+        on_dir (callable): on_dir(路径, 聚合大小, 深度)，在目录的全部后代处理完后调用，root的深度为0
+        should_stop (callable): 返回True时停止遍历
+        ignore (IgnoreMatcher): 可选，gitignore_func的匹配器，被忽略的文件和子树不参与遍历
+        dedup (InodeDedup): 可选，按inode去重硬链接并跳过重复目录和其他文件系统
+
+    Returns:
+        int: root的聚合大小(字节)，提前停止时为已遍历部分的大小
+    """
+    def open_dir(path, depth, parent_rules=None):
+        try:
+            files, subdirs = scan_files(path, dedup)
+        except OSError:
+            files, subdirs = [], []
+        rules = None
+        if ignore is not None:
+            if parent_rules is None:
+                rules = ignore.rules_for_path(path)
+            else:
+                rules = ignore.rules_for(path, parent_rules, [name for name, _ in files])
+            files = [(name, size) for name, size in files if not rules.ignored(os.path.join(path, name), False)]
+            subdirs = [name for name in subdirs if not rules.ignored(os.path.join(path, name), True)]
+        total = 0
+        for name, size in files:
+            total += size
+            if on_file is not None:
+                on_file(os.path.join(path, name), size, depth)
+        # [路径, 深度, 聚合大小, 子目录名称列表, 下一个子目录的下标, 忽略规则]
+        return [path, depth, total, subdirs, 0, rules]
+
+    stack = [open_dir(root, 0)]
+    total_size = 0
+    while stack:
+        frame = stack[-1]
+        if frame[4] < len(frame[3]) and not (should_stop is not None and should_stop()):
+            name = frame[3][frame[4]]
+            frame[4] += 1
+            stack.append(open_dir(os.path.join(frame[0], name), frame[1] + 1, frame[5]))
+            continue
+        stack.pop()
+        if on_dir is not None:
+            on_dir(frame[0], frame[2], frame[1])
+        if stack:
+            stack[-1][2] += frame[2]
+        else:
+            total_size = frame[2]
+    return total_size
+
+
+def _is_dir(entry, follow_symlinks=True):
+    try:
+        return entry.is_dir(follow_symlinks=follow_symlinks)
+    except OSError:
+        return False
+
+
+def iter_tree(root, ignore=None, should_stop=None):
+    """
+    先序遍历目录树，逐个生成root下的条目（不包括root本身）
+
+    每个目录的条目按名称排序，目录总是先于其中的条目生成。总是跳过.git等版本控制目录；
+    不进入目录符号链接，符号链接（无论指向文件、目录还是已失效）作为普通条目生成，
+    由调用方通过DirEntry.is_symlink()区分。
+
+    Args:
+        root (str): 根目录
+        ignore (IgnoreMatcher): 可选，gitignore_func的匹配器，被忽略的条目和子树不生成
+        should_stop (callable): 返回True时停止遍历
+
+    Yields:
+        os.DirEntry: 目录条目
+    """
+    stack = [(root, None)]
+    while stack:
+        if should_stop is not None and should_stop():
+            return
+        path, parent_rules = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        entries = [entry for entry in entries if not (entry.name in SKIP_DIRS and _is_dir(entry))]
+        rules = None
+        if ignore is not None:
+            if parent_rules is None:
+                rules = ignore.rules_for_path(path)
+            else:
+                rules = ignore.rules_for(path, parent_rules, [entry.name for entry in entries if not _is_dir(entry)])
+            entries = [entry for entry in entries if not rules.ignored(entry.path, _is_dir(entry, False))]
+        subdirs = []
+        for entry in entries:
+            yield entry
+            if _is_dir(entry, False):
+                subdirs.append((entry.path, rules))
+        stack.extend(reversed(subdirs))
+
+
+def iter_files(root, extensions=(), ignore=None):
+    """
+    遍历目录树，生成扩展名符合条件的文件路径
+
+    包括指向文件的符号链接和失效的符号链接，不包括目录符号链接；顺序与iter_tree一致
+
+    Args:
+        root (str): 根目录
+        extensions (tuple): 小写并以.开头的扩展名，为空时不过滤
+        ignore (IgnoreMatcher): 可选，gitignore_func的匹配器，被忽略的文件和子树不生成
+    """
+    for entry in iter_tree(root, ignore):
+        if _is_dir(entry):
+            continue
+        if not extensions or os.path.splitext(entry.name)[1].lower() in extensions:
+            yield entry.path
+
+
+def walk_ignored_sizes(root, ignore):
+    """
+    单次遍历同时统计目录的总大小和其中被忽略部分的大小
+
+    被忽略的子目录整体计入忽略部分，不再对其中的路径逐个匹配规则
+
+    Args:
+        root (str): 根目录
+        ignore (IgnoreMatcher): gitignore_func的匹配器
+
+    Returns:
+        tuple: (总大小, 被忽略的大小)
+    """
+    total_size = 0
+    ignored_size = 0
+    stack = [(root, ignore.rules_for_path(root))]
+    while stack:
+        path, rules = stack.pop()
+        try:
+            files, subdirs = scan_files(path)
+        except OSError:
+            continue
+        if path != root:
+            rules = ignore.rules_for(path, rules, [name for name, _ in files])
+        for name, size in files:
+            total_size += size
+            if rules.ignored(os.path.join(path, name), False):
+                ignored_size += size
+        for name in subdirs:
+            child = os.path.join(path, name)
+            if rules.ignored(child, True):
+                size = walk_size(child)
+                total_size += size
+                ignored_size += size
+            else:
+                stack.append((child, rules))
+    return total_size, ignored_size
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文件内容搜索模块
+在后台任务中遍历目录树，按userSettings.allowed_extensions过滤文件后分批提交到进程池搜索，
+找到的匹配通过任务事件逐批推送到页面；二进制文件只读取开头的少量字节即跳过，搜索可随时取消
+"""
+
+import os
+import re
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from response_utils import create_response_dict
+from data_processing.get_yaml import get_path_config
+import gitignore_func
+import job_func
+import scan_func
+import sniff_func
+import worker_pool
+
+# 每个进程任务处理的文件数量
+BATCH_SIZE = 32
+# 默认最多返回的匹配数量
+DEFAULT_MAX_MATCHES = 1000
+# 单个文件最多返回的匹配数量
+MAX_MATCHES_PER_FILE = 100
+# 返回的匹配行最多保留的字符数
+MAX_LINE_LENGTH = 300
+
+
+def normalize_extensions(extensions):
+    """
+    规范化扩展名列表（小写并以.开头）
+
+    Args:
+        extensions (list): 扩展名列表，为空时表示不过滤
+
+    Returns:
+        tuple: 规范化后的扩展名，为空表示不过滤
+    """
+    normalized = []
+    for ext in extensions or []:
+        ext = str(ext).strip().lower()
+        if ext:
+            normalized.append(ext if ext.startswith(".") else "." + ext)
+    return tuple(normalized)
+
+
+def _clip_line(line, start, end):
+    """截取匹配位置附近的文本，避免超长行占用过多内存"""
+    line = line.rstrip("\r\n")
+    if len(line) <= MAX_LINE_LENGTH:
+        return line, start
+    left = max(0, min(start - MAX_LINE_LENGTH // 3, len(line) - MAX_LINE_LENGTH))
+    return line[left:left + MAX_LINE_LENGTH], start - left
+
+
+def search_file(file_path, regex, max_matches=MAX_MATCHES_PER_FILE):
+    """
+    在单个文件中搜索
+
+    Args:
+        file_path (str): 文件路径
+        regex (re.Pattern): 编译后的正则表达式
+        max_matches (int): 最多返回的匹配数量
+
+    Returns:
+        list: 匹配列表，二进制文件返回None
+    """
+    with open(file_path, 'rb') as file:
+        sniffed = sniff_func.sniff_bytes(file.read(sniff_func.SNIFF_SIZE))
+    if sniffed["kind"] == "binary":
+        return None
+    matches = []
+    with open(file_path, 'r', encoding=sniffed["encoding"], errors='replace') as file:
+        for line_number, line in enumerate(file, 1):
+            found = regex.search(line)
+            if found is None:
+                continue
+            text, column = _clip_line(line, found.start(), found.end())
+            matches.append({
+                "path": file_path,
+                "line": line_number,
+                "column": column,
+                "length": found.end() - found.start(),
+                "text": text
+            })
+            if len(matches) >= max_matches:
+                break
+    return matches
+
+
+def search_files(file_paths, pattern, flags):
+    """
+    在一批文件中搜索，在进程池中执行
+
+    Args:
+        file_paths (list): 文件路径列表
+        pattern (str): 正则表达式
+        flags (int): 正则表达式标志
+
+    Returns:
+        tuple: (匹配列表, 已搜索文件数, 跳过的文件数)
+    """
+    regex = re.compile(pattern, flags)
+    matches = []
+    searched = skipped = 0
+    for file_path in file_paths:
+        try:
+            found = search_file(file_path, regex)
+        except OSError:
+            found = None
+        if found is None:
+            skipped += 1
+            continue
+        searched += 1
+        matches.extend(found)
+    return matches, searched, skipped
+
+
+def _search_job(job, root, pattern, flags, extensions, max_matches, respect_gitignore=False):
+    """
+    搜索任务：逐批推送matches事件，每批完成后推送progress事件
+    """
+    executor = worker_pool.get_process_executor()
+    max_in_flight = worker_pool.get_max_workers() * 2
+    totals = {"matches": 0, "searched": 0, "skipped": 0}
+    pending = set()
+
+    def limit_reached():
+        return totals["matches"] >= max_matches
+
+    def collect(done):
+        for future in done:
+            matches, searched, skipped = future.result()
+            totals["searched"] += searched
+            totals["skipped"] += skipped
+            matches = matches[:max_matches - totals["matches"]]
+            if matches:
+                totals["matches"] += len(matches)
+                job.emit("matches", matches=matches)
+            job.emit("progress", **totals)
+
+    def submit(batch):
+        pending.add(executor.submit(search_files, batch, pattern, flags))
+
+    batch = []
+    ignore = gitignore_func.matcher_for(root) if respect_gitignore else None
+    for file_path in scan_func.iter_files(root, extensions, ignore):
+        if job.cancelled or limit_reached():
+            break
+        batch.append(file_path)
+        if len(batch) >= BATCH_SIZE:
+            submit(batch)
+            batch = []
+        while len(pending) >= max_in_flight and not job.cancelled:
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            collect(done)
+    if batch and not job.cancelled and not limit_reached():
+        submit(batch)
+    while pending and not job.cancelled and not limit_reached():
+        done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+        collect(done)
+    for future in pending:
+        future.cancel()
+
+    totals["truncated"] = limit_reached()
+    return totals
+
+
+def search_content(root, pattern, regex=False, case_sensitive=False, extensions=None,
+                   max_matches=DEFAULT_MAX_MATCHES, respect_gitignore=False):
+    """
+    在目录树中搜索文件内容，结果通过后台任务事件推送
+
+    Args:
+        root (str): 搜索的根目录
+        pattern (str): 搜索的文本或正则表达式
+        regex (bool): pattern是否为正则表达式
+        case_sensitive (bool): 是否区分大小写
+        extensions (list): 搜索的扩展名，为None时使用userSettings.allowed_extensions，为空列表时搜索全部文件
+        max_matches (int): 最多返回的匹配数量
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+
+    Returns:
+        dict: 包含job_id的响应字典，匹配通过matches事件推送，可用cancel_job取消
+    """
+    if not pattern:
+        return create_response_dict(success=False, error="搜索内容不能为空")
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    if not regex:
+        pattern = re.escape(pattern)
+    flags = 0 if case_sensitive else re.IGNORECASE
+    try:
+        re.compile(pattern, flags)
+    except re.error as e:
+        return create_response_dict(success=False, error=f"正则表达式无效: {str(e)}")
+    if extensions is None:
+        extensions = get_path_config()["allowed_extensions"]
+
+    job = job_func.start_job(
+        "search", _search_job, os.path.abspath(root), pattern, flags,
+        normalize_extensions(extensions), max(1, int(max_matches)), bool(respect_gitignore)
+    )
+    return create_response_dict(success=True, job_id=job.job_id)
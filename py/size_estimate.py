@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录大小估算模块
+在给定的时间预算内估算目录总大小：先按广度优先精确扫描，
+预算内扫描完整棵树时直接返回精确值；否则用随机路径抽样（Knuth估计）外推，
+并根据各次抽样的方差给出95%置信度的误差范围
+"""
+
+import os
+import math
+import time
+import random
+from collections import deque
+
+import scan_func
+
+# 默认时间预算（秒）
+DEFAULT_TIME_BUDGET = 0.05
+# 预算中用于广度优先精确扫描的比例
+EXACT_FRACTION = 0.5
+# 95%置信度对应的z值
+Z_95 = 1.96
+
+
+class TreeSampler:
+    """
+    目录树抽样器，缓存已扫描目录的结果，多次抽样共享同一份缓存
+    """
+
+    def __init__(self, root, rng=None):
+        self.root = root
+        self.rng = rng or random.Random()
+        self._scans = {}
+
+    @property
+    def scanned(self):
+        """已扫描的目录数量"""
+        return len(self._scans)
+
+    def scan(self, path):
+        """扫描目录，无法读取的目录按空目录处理"""
+        result = self._scans.get(path)
+        if result is None:
+            try:
+                result = scan_func.scan_sizes(path)
+            except OSError:
+                result = (0, [])
+            self._scans[path] = result
+        return result
+
+    def exact(self, deadline):
+        """
+        广度优先精确统计，超过deadline时放弃
+
+        Returns:
+            int: 目录总大小，未在期限内完成时返回None
+        """
+        total = 0
+        queue = deque([self.root])
+        while queue:
+            if time.monotonic() > deadline:
+                return None
+            path = queue.popleft()
+            files_size, subdirs = self.scan(path)
+            total += files_size
+            queue.extend(os.path.join(path, name) for name in subdirs)
+        return total
+
+    def probe(self):
+        """
+        从根目录随机走到一个叶子目录，按路径上各层的分支数外推总大小
+
+        每个目录被选中的概率为路径上各层分支数乘积的倒数，因此估计是无偏的
+
+        Returns:
+            float: 一次抽样的总大小估计
+        """
+        path = self.root
+        weight = 1
+        estimate = 0
+        while True:
+            files_size, subdirs = self.scan(path)
+            estimate += weight * files_size
+            if not subdirs:
+                return estimate
+            weight *= len(subdirs)
+            path = os.path.join(path, self.rng.choice(subdirs))
+
+
+def estimate_directory_size(path, time_budget=DEFAULT_TIME_BUDGET, rng=None):
+    """
+    在时间预算内估算目录总大小
+
+    Args:
+        path (str): 目录路径
+        time_budget (float): 时间预算（秒），至少完成一次抽样
+        rng (random.Random): 可选，随机数生成器
+
+    Returns:
+        dict: 包含以下键:
+            - size: 估算的总大小(字节)
+            - error_bound: 95%置信度的误差范围(字节)，精确值时为0
+            - exact: 是否为精确值
+            - samples: 抽样次数
+            - scanned_dirs: 扫描的目录数量
+    """
+    start = time.monotonic()
+    deadline = start + time_budget
+    sampler = TreeSampler(os.path.abspath(path), rng)
+
+    exact = sampler.exact(start + time_budget * EXACT_FRACTION)
+    if exact is not None:
+        return {"size": exact, "error_bound": 0, "exact": True, "samples": 0, "scanned_dirs": sampler.scanned}
+
+    samples = []
+    while not samples or time.monotonic() < deadline:
+        samples.append(sampler.probe())
+    mean = sum(samples) / len(samples)
+    if len(samples) > 1:
+        variance = sum((value - mean) ** 2 for value in samples) / (len(samples) - 1)
+        error = Z_95 * math.sqrt(variance / len(samples))
+    else:
+        # 只有一次抽样时无法估计方差，误差按估计值本身计算
+        error = mean
+    return {
+        "size": int(round(mean)),
+        "error_bound": int(round(error)),
+        "exact": False,
+        "samples": len(samples),
+        "scanned_dirs": sampler.scanned
+    }
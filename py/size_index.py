@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录大小索引模块
+使用SQLite持久化保存每个目录的修改时间、直接文件总大小和子目录列表，
+再次访问同一目录树时只重新扫描修改时间发生变化的目录
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import scan_func
+
+# 默认索引文件路径（与settings.yaml同目录）
+DEFAULT_INDEX_PATH = os.path.join(Path(__file__).parent.parent, 'data', 'size_index.db')
+
+
+class DirectorySizeIndex:
+    """
+    目录大小索引类
+
+    每条记录以目录路径为键，保存目录自身的mtime、直接包含的文件大小之和、
+    直接子目录名称列表以及上次计算出的聚合大小。
+    目录的mtime只会在其直接条目增删或重命名时变化，因此命中索引的目录
+    不需要重新列出，只需一次stat即可确认。
+    原地修改文件内容不会改变父目录的mtime：目录监视通过invalidate使对应记录失效，
+    用户刷新目录时传入refresh=True重新扫描。
+    """
+
+    def __init__(self, db_path=None):
+        """
+        初始化目录大小索引
+
+        Args:
+            db_path (str): 索引数据库路径，为None时使用默认路径
+        """
+        self.db_path = db_path or DEFAULT_INDEX_PATH
+        # 只在访问数据库时持有锁，目录扫描本身可以在多个线程中并行进行
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+
+    def _connect(self):
+        """打开数据库连接，无法写入磁盘时退回到内存数据库"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        except (OSError, sqlite3.Error):
+            conn = sqlite3.connect(':memory:', check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dir_sizes ("
+            "path TEXT PRIMARY KEY, "
+            "mtime_ns INTEGER NOT NULL, "
+            "files_size INTEGER NOT NULL, "
+            "subdirs TEXT NOT NULL, "
+            "total_size INTEGER NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def _lookup(self, path):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, files_size, subdirs, total_size FROM dir_sizes WHERE path = ?",
+                (path,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2]), row[3]
+
+    def _forget_children(self, path, names):
+        """删除已经不存在的子目录及其后代的索引记录"""
+        with self._lock:
+            for name in names:
+                child = os.path.join(path, name)
+                prefix = child.rstrip(os.sep) + os.sep
+                self._conn.execute(
+                    "DELETE FROM dir_sizes WHERE path = ? OR substr(path, 1, ?) = ?",
+                    (child, len(prefix), prefix)
+                )
+
+    def _size_of(self, path, refresh, stats, ancestors):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return 0
+        mtime_ns = st.st_mtime_ns
+        # 通过bind mount等方式回到祖先目录时停止，避免无限递归
+        key = (st.st_dev, st.st_ino)
+        if st.st_ino and key in ancestors:
+            stats['loops'] += 1
+            return 0
+
+        cached = None if refresh else self._lookup(path)
+        reused = cached is not None and cached[0] == mtime_ns
+        if reused:
+            files_size, subdirs = cached[1], cached[2]
+            stats['reused'] += 1
+        else:
+            try:
+                files_size, subdirs = scan_func.scan_sizes(path)
+            except OSError:
+                # 权限不足等情况，与原实现一致按0处理且不写入索引
+                return 0
+            stats['scanned'] += 1
+            if cached is not None:
+                self._forget_children(path, set(cached[2]) - set(subdirs))
+
+        total_size = files_size
+        ancestors.add(key)
+        try:
+            for name in subdirs:
+                total_size += self._size_of(os.path.join(path, name), refresh, stats, ancestors)
+        finally:
+            ancestors.discard(key)
+
+        if reused:
+            # 复用的记录只有聚合大小可能变化，未变化时不需要写入
+            if total_size != cached[3]:
+                with self._lock:
+                    self._conn.execute("UPDATE dir_sizes SET total_size = ? WHERE path = ?", (total_size, path))
+            return total_size
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dir_sizes (path, mtime_ns, files_size, subdirs, total_size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, mtime_ns, files_size, json.dumps(subdirs, ensure_ascii=False), total_size)
+            )
+        return total_size
+
+    def get_size(self, path, refresh=False, stats=None):
+        """
+        获取目录的聚合大小，只重新扫描mtime发生变化或记录已失效的目录
+
+        Args:
+            path (str): 目录路径
+            refresh (bool): 为True时忽略已有索引，强制重新扫描整棵子树
+            stats (dict): 可选，用于接收本次调用重新扫描/复用的目录数量以及跳过的目录环数量
+
+        Returns:
+            int: 目录总大小(字节)
+        """
+        if stats is None:
+            stats = {}
+        stats.setdefault('scanned', 0)
+        stats.setdefault('reused', 0)
+        stats.setdefault('loops', 0)
+        path = os.path.abspath(path)
+        try:
+            return self._size_of(path, refresh, stats, set())
+        finally:
+            with self._lock:
+                self._conn.commit()
+
+    def invalidate(self, path):
+        """
+        使某个目录的索引记录失效，下次计算时重新扫描该目录
+
+        聚合大小每次都会沿子树重新累加，因此无需同时清除祖先目录的记录。
+
+        Args:
+            path (str): 发生变化的目录路径
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM dir_sizes WHERE path = ?", (os.path.abspath(path),))
+            self._conn.commit()
+
+    def clear(self):
+        """清空整个索引"""
+        with self._lock:
+            self._conn.execute("DELETE FROM dir_sizes")
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+# 全局索引实例（延迟创建）
+_global_index = None
+_global_index_lock = threading.Lock()
+
+
+def get_size_index():
+    """获取全局目录大小索引实例"""
+    global _global_index
+    with _global_index_lock:
+        if _global_index is None:
+            _global_index = DirectorySizeIndex()
+        return _global_index
+
+
+def get_indexed_directory_size(path, refresh=False):
+    """使用全局索引计算目录大小"""
+    return get_size_index().get_size(path, refresh=refresh)
+
+
+def invalidate_directory_size(path):
+    """使全局索引中某个目录的记录失效"""
+    return get_size_index().invalidate(path)
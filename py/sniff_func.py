@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文件类型探测模块
+只读取文件开头的少量字节判断文件是文本还是二进制以及文本编码，
+二进制文件返回元数据和十六进制窗口，避免对大文件整体解码
+"""
+
+import os
+import codecs
+
+# 探测时读取的字节数
+SNIFF_SIZE = 8192
+# 十六进制窗口默认字节数和每行字节数
+DEFAULT_HEX_LENGTH = 256
+HEX_ROW_SIZE = 16
+# 控制字符比例超过该值时视为二进制
+CONTROL_RATIO_LIMIT = 0.3
+
+# 字节顺序标记，长的在前以免UTF-32 LE被识别为UTF-16 LE
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# 常见二进制格式的文件头
+MAGIC_NUMBERS = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"%PDF-", "pdf"),
+    (b"PK\x03\x04", "zip"),
+    (b"PK\x05\x06", "zip"),
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+    (b"Rar!\x1a\x07", "rar"),
+    (b"\x7fELF", "elf"),
+    (b"SQLite format 3\x00", "sqlite"),
+)
+
+# 文本中允许出现的控制字符：\b \t \n \f \r 和ESC
+_TEXT_CONTROLS = {8, 9, 10, 12, 13, 27}
+
+
+def _control_ratio(sample):
+    """计算样本中非文本控制字符的比例"""
+    if not sample:
+        return 0.0
+    controls = sum(1 for byte in sample if byte < 32 and byte not in _TEXT_CONTROLS)
+    return controls / len(sample)
+
+
+def _decodes(sample, encoding):
+    """样本能否用指定编码解码（允许末尾字符被截断）"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def _guess_utf16(sample):
+    """没有BOM时根据零字节的位置判断UTF-16"""
+    if len(sample) < 4:
+        return None
+    even_zeros = sample[0::2].count(0)
+    odd_zeros = sample[1::2].count(0)
+    half = len(sample) / 2
+    if odd_zeros > half * 0.4 and even_zeros < half * 0.05:
+        return "utf-16-le"
+    if even_zeros > half * 0.4 and odd_zeros < half * 0.05:
+        return "utf-16-be"
+    return None
+
+
+def sniff_bytes(sample):
+    """
+    根据文件开头的字节判断类型和编码
+
+    Args:
+        sample (bytes): 文件开头的字节
+
+    Returns:
+        dict: 包含以下键:
+            - kind: text/binary/empty
+            - encoding: 文本编码，二进制文件为None
+            - format: 识别出的二进制格式，无法识别时为None
+    """
+    if not sample:
+        return {"kind": "empty", "encoding": "utf-8", "format": None}
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return {"kind": "text", "encoding": encoding, "format": None}
+    for magic, file_format in MAGIC_NUMBERS:
+        if sample.startswith(magic):
+            return {"kind": "binary", "encoding": None, "format": file_format}
+    if b"\x00" in sample:
+        encoding = _guess_utf16(sample)
+        if encoding and _decodes(sample, encoding):
+            return {"kind": "text", "encoding": encoding, "format": None}
+        return {"kind": "binary", "encoding": None, "format": None}
+    if _control_ratio(sample) > CONTROL_RATIO_LIMIT:
+        return {"kind": "binary", "encoding": None, "format": None}
+    for encoding in ("utf-8", "gb18030"):
+        if _decodes(sample, encoding):
+            return {"kind": "text", "encoding": encoding, "format": None}
+    return {"kind": "text", "encoding": "latin-1", "format": None}
+
+
+def sniff_file(file_path, sample_size=SNIFF_SIZE):
+    """
+    读取文件开头的sample_size字节判断文件类型和编码
+
+    Args:
+        file_path (str): 文件路径
+        sample_size (int): 读取的字节数
+
+    Returns:
+        dict: sniff_bytes的结果，另外包含size字段
+
+    Raises:
+        OSError: 文件不存在或无法读取
+    """
+    with open(file_path, 'rb') as file:
+        sample = file.read(sample_size)
+        size = os.fstat(file.fileno()).st_size
+    result = sniff_bytes(sample)
+    result["size"] = size
+    return result
+
+
+def hex_window(file_path, offset=0, length=DEFAULT_HEX_LENGTH):
+    """
+    读取文件的一段字节并生成十六进制显示行
+
+    Args:
+        file_path (str): 文件路径
+        offset (int): 起始偏移
+        length (int): 读取的字节数
+
+    Returns:
+        list: 每行一个字典，包含offset、hex和ascii
+
+    Raises:
+        OSError: 文件不存在或无法读取
+    """
+    offset = max(0, int(offset))
+    with open(file_path, 'rb') as file:
+        file.seek(offset)
+        data = file.read(max(0, int(length)))
+    rows = []
+    for start in range(0, len(data), HEX_ROW_SIZE):
+        row = data[start:start + HEX_ROW_SIZE]
+        rows.append({
+            "offset": offset + start,
+            "hex": " ".join(f"{byte:02x}" for byte in row),
+            "ascii": "".join(chr(byte) if 32 <= byte < 127 else "." for byte in row)
+        })
+    return rows
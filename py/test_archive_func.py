@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+测试archive_func.py模块的功能
+"""
+
+import io
+import os
+import sys
+import stat
+import time
+import gzip
+import random
+import tarfile
+import zipfile
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import archive_func
+import job_func
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def _wait(job_id, timeout=30):
+    job = job_func.get_job(job_id)
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def _make_tree(root):
+    """生成包含被忽略文件和.git目录的目录树，返回应导出的文件内容"""
+    rng = random.Random(1)
+    expected = {
+        "a.txt": b"hello",
+        "sub/big.bin": bytes(rng.getrandbits(8) for _ in range(300000)),
+        ".gitignore": b"*.log\n",
+    }
+    for rel, content in expected.items():
+        _write(os.path.join(root, *rel.split("/")), content)
+    _write(os.path.join(root, "debug.log"), b"ignored")
+    _write(os.path.join(root, ".git", "HEAD"), b"ref")
+    return expected
+
+
+def test_parallel_gzip_writer():
+    """测试多成员gzip可以完整解压"""
+    print("测试多线程gzip...")
+    data = bytes(range(256)) * 5000
+    output = io.BytesIO()
+    writer = archive_func.ParallelGzipWriter(output, threads=4, chunk_size=10000)
+    for start in range(0, len(data), 7777):
+        writer.write(data[start:start + 7777])
+    writer.close()
+    print(f"   原始大小: {len(data)}, 压缩后: {len(output.getvalue())}")
+    return gzip.decompress(output.getvalue()) == data
+
+
+def test_export_tar_gz():
+    """测试导出tar.gz并跳过被忽略的文件"""
+    print("测试导出tar.gz...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        expected = _make_tree(root)
+        output = os.path.join(tmp, "out.tar.gz")
+        response = archive_func.export_archive(root, output, "tar.gz", respect_gitignore=True, threads=3)
+        job = _wait(response["job_id"])
+        with tarfile.open(output, "r:gz") as archive:
+            contents = {member.name: archive.extractfile(member).read()
+                        for member in archive.getmembers() if member.isfile()}
+        events = [event for event in job.snapshot()["events"] if event["type"] == "progress"]
+        print(f"   条目: {sorted(contents)}, 结果: {job.result['files']}个文件")
+        return contents == expected and events[-1]["files"] == 3 and not os.path.exists(output + ".part")
+
+
+def test_export_zip_into_root():
+    """测试导出zip到目录自身时不包含输出文件"""
+    print("测试导出zip...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        expected = _make_tree(root)
+        expected["debug.log"] = b"ignored"
+        output = os.path.join(root, "out.zip")
+        job = _wait(archive_func.export_archive(root, output)["job_id"])
+        with zipfile.ZipFile(output) as archive:
+            contents = {name: archive.read(name) for name in archive.namelist() if not name.endswith("/")}
+        print(f"   条目: {sorted(contents)}")
+        exists = archive_func.export_archive(root, output)
+        return contents == expected and job.result["skipped"] == 0 and "error" in exists
+
+
+def test_shrinking_file_padded():
+    """测试写入tar成员期间文件变短时补零，后续成员仍可读取"""
+    print("测试文件变短...")
+    progress = archive_func._ExportProgress(None, 0, 0)
+    output = io.BytesIO()
+    with tarfile.open(fileobj=output, mode="w|") as archive:
+        info = tarfile.TarInfo("shrunk.bin")
+        info.size = 10
+        archive.addfile(info, archive_func._PaddedReader(io.BytesIO(b"abc"), progress))
+        info = tarfile.TarInfo("next.txt")
+        info.size = 2
+        archive.addfile(info, io.BytesIO(b"ok"))
+    output.seek(0)
+    with tarfile.open(fileobj=output, mode="r") as archive:
+        contents = {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+    print(f"   条目: {contents}, 补零: {progress.truncated}")
+    return contents == {"shrunk.bin": b"abc" + b"\0" * 7, "next.txt": b"ok"} and progress.truncated == 1
+
+
+def test_dirs_and_symlinks():
+    """测试空目录和符号链接在zip和tar.gz中都保存为条目本身"""
+    print("测试目录和符号链接...")
+    if not hasattr(os, "symlink"):
+        print("   当前平台不支持符号链接，跳过")
+        return True
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        _write(os.path.join(root, "sub", "a.txt"), b"hello")
+        os.makedirs(os.path.join(root, "empty"))
+        os.symlink("sub", os.path.join(root, "dir_link"))
+        os.symlink(os.path.join("sub", "a.txt"), os.path.join(root, "file_link"))
+        zip_path = os.path.join(tmp, "out.zip")
+        tar_path = os.path.join(tmp, "out.tar.gz")
+        zip_job = _wait(archive_func.export_archive(root, zip_path)["job_id"])
+        tar_job = _wait(archive_func.export_archive(root, tar_path, "tar.gz")["job_id"])
+        with zipfile.ZipFile(zip_path) as archive:
+            zip_entries = {}
+            for info in archive.infolist():
+                if info.is_dir():
+                    zip_entries[info.filename.rstrip("/")] = "dir"
+                elif stat.S_ISLNK(info.external_attr >> 16):
+                    zip_entries[info.filename] = "link:" + archive.read(info).decode()
+                else:
+                    zip_entries[info.filename] = "file"
+        with tarfile.open(tar_path, "r:gz") as archive:
+            tar_entries = {}
+            for member in archive.getmembers():
+                if member.isdir():
+                    tar_entries[member.name] = "dir"
+                elif member.issym():
+                    tar_entries[member.name] = "link:" + member.linkname
+                else:
+                    tar_entries[member.name] = "file"
+        expected = {
+            "dir_link": "link:sub",
+            "empty": "dir",
+            "file_link": "link:" + os.path.join("sub", "a.txt"),
+            "sub": "dir",
+            "sub/a.txt": "file"
+        }
+        print(f"   zip: {zip_entries}, tar: {tar_entries}")
+        return (zip_entries == tar_entries == expected and zip_job.result["files"] == tar_job.result["files"] == 3
+                and zip_job.result["dirs"] == tar_job.result["dirs"] == 2)
+
+
+def test_invalid_format():
+    """测试不支持的格式"""
+    print("测试无效格式...")
+    with tempfile.TemporaryDirectory() as tmp:
+        result = archive_func.export_archive(tmp, os.path.join(tmp, "out.rar"), "rar")
+        print(f"   结果: {result.get('error')}")
+        return "error" in result
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试archive_func模块")
+    print("="*50)
+
+    tests = [
+        test_parallel_gzip_writer,
+        test_export_tar_gz,
+        test_export_zip_into_root,
+        test_shrinking_file_padded,
+        test_dirs_and_symlinks,
+        test_invalid_format
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
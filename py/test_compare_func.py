@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+测试compare_func.py模块的功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import compare_func
+import hash_cache
+import job_func
+
+
+def _write(path, content, mtime):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    os.utime(path, (mtime, mtime))
+
+
+def _wait(job_id, timeout=30):
+    job = job_func.get_job(job_id)
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def _make_trees(tmp):
+    """生成两棵有各种差异的目录树，返回(a, b)"""
+    a = os.path.join(tmp, "a")
+    b = os.path.join(tmp, "b")
+    old = time.time() - 3600
+    new = old + 600
+    for root in (a, b):
+        _write(os.path.join(root, "same.txt"), b"same", old)
+        # 内容相同但修改时间不同，需要比较摘要
+        _write(os.path.join(root, "touched.txt"), b"touch", old if root == a else new)
+    _write(os.path.join(a, "changed.txt"), b"newer content", new)
+    _write(os.path.join(b, "changed.txt"), b"old", old)
+    # 大小相同、内容不同、b较新
+    _write(os.path.join(a, "edited.txt"), b"aaaa", old)
+    _write(os.path.join(b, "edited.txt"), b"bbbb", new)
+    _write(os.path.join(a, "only_a", "x.bin"), b"x" * 10, old)
+    _write(os.path.join(a, "only_a", "deep", "y.bin"), b"y" * 5, old)
+    _write(os.path.join(b, "only_b.txt"), b"b", old)
+    _write(os.path.join(a, "kind"), b"file", old)
+    os.makedirs(os.path.join(b, "kind", "sub"))
+    return a, b
+
+
+def _run(a, b, mode):
+    previous_cache = hash_cache._global_cache
+    hash_cache._global_cache = hash_cache.ContentHashCache(os.path.join(os.path.dirname(a), "hash.db"))
+    try:
+        response = compare_func.compare_directories(a, b, mode)
+        return _wait(response["job_id"]).result
+    finally:
+        hash_cache._global_cache.close()
+        hash_cache._global_cache = previous_cache
+
+
+def test_mirror_plan():
+    """测试mirror模式的同步计划"""
+    print("测试mirror模式...")
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = _make_trees(tmp)
+        result = _run(a, b, "mirror")
+        copies = sorted((item["path"], item["reason"], item["size"]) for item in result["copy"])
+        deletes = sorted(item["path"] for item in result["delete"])
+        conflicts = sorted((item["path"], item["reason"]) for item in result["conflicts"])
+        print(f"   复制: {copies}")
+        print(f"   删除: {deletes}, 冲突: {conflicts}, 统计: {result['counts']}, 比较摘要: {result['hashed']}")
+        return (copies == [("changed.txt", "different", 13), ("only_a", "missing", 15)]
+                and deletes == ["only_b.txt"]
+                and conflicts == [("edited.txt", "target_newer"), ("kind", "type")]
+                and result["counts"]["identical"] == 2 and result["hashed"] == 2
+                and result["copy_bytes"] == 28)
+
+
+def test_two_way_plan():
+    """测试two_way模式中较新的一方覆盖另一方"""
+    print("测试two_way模式...")
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = _make_trees(tmp)
+        result = _run(a, b, "two_way")
+        copies = sorted((item["path"], item["from"]) for item in result["copy"])
+        print(f"   复制: {copies}")
+        return copies == [("changed.txt", "a"), ("edited.txt", "b"), ("only_a", "a"), ("only_b.txt", "b")] \
+            and result["delete"] == []
+
+
+def test_invalid_arguments():
+    """测试无效的模式和相同目录"""
+    print("测试无效参数...")
+    with tempfile.TemporaryDirectory() as tmp:
+        bad_mode = compare_func.compare_directories(tmp, tmp + os.sep, "merge")
+        same = compare_func.compare_directories(tmp, tmp + os.sep)
+        print(f"   结果: {bad_mode.get('error')}, {same.get('error')}")
+        return "error" in bad_mode and "error" in same
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试compare_func模块")
+    print("="*50)
+
+    tests = [
+        test_mirror_plan,
+        test_two_way_plan,
+        test_invalid_arguments
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
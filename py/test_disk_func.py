@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+测试disk_func.py模块的批量stat和后台目录大小计算功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import disk_func
+import job_func
+
+
+def test_stat_many():
+    """测试批量获取路径信息，结果顺序与输入一致"""
+    print("测试批量stat...")
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, "a.txt")
+        with open(file_path, 'w') as f:
+            f.write("hello")
+        repo = os.path.join(tmp, "repo")
+        os.makedirs(os.path.join(repo, ".git"))
+        missing = os.path.join(tmp, "missing")
+
+        result = disk_func.stat_many([file_path, repo, tmp, missing])
+        items = result.get("items", [])
+        print(f"   结果: {[(item['path'], item['type']) for item in items]}")
+        if "error" in result or [item["path"] for item in items] != [file_path, repo, tmp, missing]:
+            return False
+        file_item, repo_item, dir_item, missing_item = items
+        return (file_item["type"] == "file" and file_item["size"] == 5 and file_item["readable"]
+                and repo_item["type"] == "directory" and repo_item["is_git_repo"]
+                and not dir_item["is_git_repo"] and dir_item["size"] is None
+                and not missing_item["exists"] and "error" in missing_item)
+
+
+def test_stat_many_rejects_non_list():
+    """测试参数不是列表时返回错误"""
+    print("测试无效参数...")
+    result = disk_func.stat_many("/tmp")
+    print(f"   结果: {result}")
+    return "error" in result
+
+
+def test_get_files_page_rejects_bad_arguments():
+    """测试页面大小或游标不是数字时返回错误而不是抛出异常"""
+    print("测试无效分页参数...")
+    with tempfile.TemporaryDirectory() as tmp:
+        bad_size = disk_func.get_files_page(tmp, page_size="abc")
+        bad_cursor = disk_func.get_files_page(tmp, cursor=[1])
+    print(f"   结果: {bad_size}, {bad_cursor}")
+    return "error" in bad_size and "error" in bad_cursor
+
+
+def test_size_job_emits_estimates_first():
+    """测试后台大小任务先推送估算值，再推送精确值"""
+    print("测试估算事件...")
+    with tempfile.TemporaryDirectory() as tmp:
+        dirs = []
+        for name in ("a", "b"):
+            path = os.path.join(tmp, name)
+            os.makedirs(path)
+            with open(os.path.join(path, "data.bin"), 'wb') as f:
+                f.write(b"x" * 100)
+            dirs.append(path)
+        job = job_func.start_job("size", disk_func._compute_sizes_job, dirs, False, True)
+        deadline = time.time() + 30
+        while job.status == "running" and time.time() < deadline:
+            time.sleep(0.02)
+        events = [(event["type"], event.get("path"), event.get("size")) for event in job.snapshot()["events"]
+                  if event["type"] in ("estimate", "size")]
+        print(f"   事件: {events}")
+        types = [event[0] for event in events]
+        return (job.result == {path: 100 for path in dirs}
+                and "estimate" in types and "estimate" not in types[types.index("size"):])
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试disk_func模块")
+    print("="*50)
+
+    tests = [
+        test_stat_many,
+        test_stat_many_rejects_non_list,
+        test_get_files_page_rejects_bad_arguments,
+        test_size_job_emits_estimates_first
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+测试duplicate_func.py模块的功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import duplicate_func
+import hash_cache
+import job_func
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def _wait(job_id, timeout=30):
+    job = job_func.get_job(job_id)
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def test_partial_hash():
+    """测试小文件的部分摘要覆盖全部内容并与完整摘要一致"""
+    print("测试部分摘要...")
+    with tempfile.TemporaryDirectory() as tmp:
+        small = os.path.join(tmp, "small.bin")
+        large = os.path.join(tmp, "large.bin")
+        _write(small, b"abc")
+        _write(large, b"x" * (duplicate_func.PARTIAL_BLOCK_SIZE * 3))
+        small_result = duplicate_func.partial_hash(small)
+        large_result = duplicate_func.partial_hash(large)
+        print(f"   小文件覆盖全部内容: {small_result[1]}, 大文件: {large_result[1]}")
+        return small_result == (hash_cache.hash_file(small), True) and large_result[1] is False
+
+
+def test_find_duplicates():
+    """测试分阶段查找重复文件，跳过硬链接、符号链接和首尾相同但中间不同的文件"""
+    print("测试查找重复文件...")
+    block = duplicate_func.PARTIAL_BLOCK_SIZE
+    with tempfile.TemporaryDirectory() as tmp:
+        previous_cache = hash_cache._global_cache
+        hash_cache._global_cache = hash_cache.ContentHashCache(os.path.join(tmp, "hash.db"))
+        root = os.path.join(tmp, "tree")
+        try:
+            _write(os.path.join(root, "a", "small1.txt"), b"same")
+            _write(os.path.join(root, "b", "small2.txt"), b"same")
+            _write(os.path.join(root, "b", "other.txt"), b"diff")
+            big = b"h" * block + b"m" * block + b"t" * block
+            _write(os.path.join(root, "a", "big1.bin"), big)
+            _write(os.path.join(root, "c", "big2.bin"), big)
+            # 首尾数据块相同但中间不同
+            _write(os.path.join(root, "c", "big3.bin"), b"h" * block + b"M" * block + b"t" * block)
+            os.link(os.path.join(root, "a", "small1.txt"), os.path.join(root, "hardlink.txt"))
+            os.symlink(os.path.join(root, "b", "small2.txt"), os.path.join(root, "symlink.txt"))
+
+            response = duplicate_func.find_duplicates(root)
+            result = _wait(response["job_id"]).result
+            groups = [[os.path.relpath(path, root) for path in group["paths"]] for group in result["groups"]]
+            print(f"   重复组: {groups}")
+            print(f"   部分摘要: {result['partial_hashed']}, 完整摘要: {result['full_hashed']}")
+            # 硬链接只保留先遍历到的一个路径
+            return (len(groups) == 2
+                    and groups[0] == [os.path.join("a", "big1.bin"), os.path.join("c", "big2.bin")]
+                    and len(groups[1]) == 2 and os.path.join("b", "small2.txt") in groups[1]
+                    and result["wasted_bytes"] == len(big) + 4
+                    and result["full_hashed"] == 3)
+        finally:
+            hash_cache._global_cache.close()
+            hash_cache._global_cache = previous_cache
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试duplicate_func模块")
+    print("="*50)
+
+    tests = [
+        test_partial_hash,
+        test_find_duplicates
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
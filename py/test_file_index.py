@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+测试file_index.py模块的功能
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_index import FileNameIndex, fuzzy_score
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write("x")
+
+
+def _make_tree(root):
+    _touch(os.path.join(root, "demo", "file-operations.js"))
+    _touch(os.path.join(root, "demo", "index.html"))
+    _touch(os.path.join(root, "py", "disk_func.py"))
+    _touch(os.path.join(root, "py", "data_processing", "get_yaml.py"))
+    _touch(os.path.join(root, ".git", "config"))
+
+
+def test_build_and_substring_search():
+    """测试建立索引和子串查找"""
+    print("测试建立索引...")
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as db_dir:
+        _make_tree(tmp)
+        index = FileNameIndex(os.path.join(db_dir, "index.db"))
+        stats = index.refresh(tmp)
+        results = index.search(tmp, "operations")
+        print(f"   统计: {stats}, trigram: {index.has_trigram}, 结果: {results}")
+        index.close()
+        return stats["files"] == 4 and results == [os.path.join("demo", "file-operations.js")]
+
+
+def test_fuzzy_search():
+    """测试子序列模糊查找"""
+    print("测试模糊查找...")
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as db_dir:
+        _make_tree(tmp)
+        index = FileNameIndex(os.path.join(db_dir, "index.db"))
+        index.refresh(tmp)
+        results = index.search(tmp, "fopjs")
+        multi = index.search(tmp, "py yaml")
+        print(f"   结果: {results}, 多个关键词: {multi}")
+        index.close()
+        return (results[:1] == [os.path.join("demo", "file-operations.js")]
+                and multi == [os.path.join("py", "data_processing", "get_yaml.py")])
+
+
+def test_incremental_refresh():
+    """测试只重新列出变化的目录"""
+    print("测试增量刷新...")
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as db_dir:
+        _make_tree(tmp)
+        index = FileNameIndex(os.path.join(db_dir, "index.db"))
+        index.refresh(tmp)
+        unchanged = index.refresh(tmp)
+        _touch(os.path.join(tmp, "py", "watch_func.py"))
+        shutil.rmtree(os.path.join(tmp, "py", "data_processing"))
+        changed = index.refresh(tmp)
+        found = index.search(tmp, "watch_func")
+        gone = index.search(tmp, "get_yaml")
+        print(f"   未变化: {unchanged}, 变化后: {changed}")
+        index.close()
+        return (unchanged["scanned"] == 0 and changed["scanned"] == 1 and changed["files"] == 4
+                and found == [os.path.join("py", "watch_func.py")] and gone == [])
+
+
+def test_persistence():
+    """测试索引持久化"""
+    print("测试持久化...")
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as db_dir:
+        _make_tree(tmp)
+        db_path = os.path.join(db_dir, "index.db")
+        index = FileNameIndex(db_path)
+        index.refresh(tmp)
+        index.close()
+        reopened = FileNameIndex(db_path)
+        stats = reopened.refresh(tmp)
+        results = reopened.search(tmp, "disk")
+        print(f"   重新打开后统计: {stats}, 结果: {results}")
+        reopened.close()
+        return stats["scanned"] == 0 and results == [os.path.join("py", "disk_func.py")]
+
+
+def test_ancestor_root_covers_subdirectory():
+    """测试子目录使用祖先根目录的索引查找，祖先建立索引后删除重复的后代根目录"""
+    print("测试祖先根目录...")
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as db_dir:
+        _make_tree(tmp)
+        index = FileNameIndex(os.path.join(db_dir, "index.db"))
+        sub = os.path.join(tmp, "py")
+        index.refresh(sub)
+        index.refresh(tmp)
+        covering = index.covering_root(os.path.join(sub, "data_processing"))
+        scoped = index.search(tmp, "py", under=sub)
+        print(f"   根目录: {covering}, 子目录结果: {scoped}")
+        result = (covering == tmp and index.file_count(sub) == 0 and index.refreshed_at(sub) is None
+                  and sorted(scoped) == [os.path.join("py", "data_processing", "get_yaml.py"),
+                                         os.path.join("py", "disk_func.py")])
+        index.close()
+        return result
+
+
+def test_fuzzy_score():
+    """测试模糊匹配得分"""
+    print("测试匹配得分...")
+    direct = fuzzy_score("disk", os.path.join("py", "disk_func.py"))
+    scattered = fuzzy_score("disk", os.path.join("data", "is", "k.py"))
+    missing = fuzzy_score("xyz", "disk_func.py")
+    print(f"   得分: {direct}, {scattered}, {missing}")
+    return missing is None and direct > scattered
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试file_index模块")
+    print("="*50)
+
+    tests = [
+        test_build_and_substring_search,
+        test_fuzzy_search,
+        test_incremental_refresh,
+        test_persistence,
+        test_ancestor_root_covers_subdirectory,
+        test_fuzzy_score
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+测试gitignore_func.py模块的功能
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import gitignore_func
+import scan_func
+
+
+def _write(path, data=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _make_repo(root):
+    _write(os.path.join(root, ".git", "HEAD"), b"ref: refs/heads/main\n")
+    _write(os.path.join(root, ".gitignore"),
+           b"# comment\n*.log\n!keep.log\nbuild/\n/top.txt\ndocs/**/*.tmp\nnode_modules\n")
+    _write(os.path.join(root, "a.log"), b"x" * 10)
+    _write(os.path.join(root, "keep.log"), b"x" * 20)
+    _write(os.path.join(root, "top.txt"), b"x" * 30)
+    _write(os.path.join(root, "src", "top.txt"), b"x" * 40)
+    _write(os.path.join(root, "src", "build", "out.o"), b"x" * 50)
+    _write(os.path.join(root, "src", "build.txt"), b"x" * 5)
+    _write(os.path.join(root, "src", ".gitignore"), b"!debug.log\n*.py[co]\n")
+    _write(os.path.join(root, "src", "debug.log"), b"x" * 60)
+    _write(os.path.join(root, "src", "m.pyc"), b"x" * 70)
+    _write(os.path.join(root, "docs", "a", "b", "x.tmp"), b"x" * 80)
+    _write(os.path.join(root, "docs", "x.tmp"), b"x" * 90)
+    _write(os.path.join(root, "node_modules", "pkg", "index.js"), b"x" * 100)
+
+
+def test_patterns():
+    """测试否定、锚定、只匹配目录和**模式"""
+    print("测试模式匹配...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_repo(tmp)
+        matcher = gitignore_func.IgnoreMatcher(tmp)
+        expected = {
+            "a.log": True,
+            "keep.log": False,
+            "top.txt": True,
+            os.path.join("src", "top.txt"): False,
+            os.path.join("src", "build"): True,
+            os.path.join("src", "build", "out.o"): True,
+            os.path.join("src", "build.txt"): False,
+            os.path.join("src", "debug.log"): False,
+            os.path.join("src", "m.pyc"): True,
+            os.path.join("docs", "a", "b", "x.tmp"): True,
+            os.path.join("docs", "x.tmp"): True,
+            os.path.join("node_modules", "pkg", "index.js"): True,
+            os.path.join(".git", "HEAD"): True,
+        }
+        actual = {rel: matcher.is_ignored(os.path.join(tmp, rel)) for rel in expected}
+        wrong = {rel: value for rel, value in actual.items() if value != expected[rel]}
+        print(f"   不符合预期: {wrong}")
+        return not wrong
+
+
+def test_compile_pattern():
+    """测试空行、注释和转义"""
+    print("测试模式编译...")
+    comment = gitignore_func.compile_pattern("# note")
+    blank = gitignore_func.compile_pattern("   ")
+    escaped = gitignore_func.compile_pattern("\\#file")
+    trailing = gitignore_func.compile_pattern("name   ")
+    return (comment is None and blank is None
+            and escaped[0].match("#file") and trailing[0].match("name") and not trailing[0].match("name "))
+
+
+def test_bracket_expressions():
+    """测试以]开头的字符集合，以及无法解析的模式被跳过而不是抛出异常"""
+    print("测试字符集合...")
+    leading = gitignore_func.compile_pattern("[]a]")
+    negated = gitignore_func.compile_pattern("[!]a]")
+    unclosed = gitignore_func.compile_pattern("foo[]")
+    invalid = gitignore_func.compile_pattern("[z-a]")
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(os.path.join(tmp, ".git", "HEAD"), b"ref: refs/heads/main\n")
+        _write(os.path.join(tmp, ".gitignore"), b"foo[]\n[z-a]\n*.log\n")
+        _write(os.path.join(tmp, "a.log"), b"x" * 10)
+        _write(os.path.join(tmp, "b.txt"), b"x" * 20)
+        matcher = gitignore_func.IgnoreMatcher(tmp)
+        files = []
+        scan_func.walk_tree(tmp, on_file=lambda path, size, depth: files.append(os.path.basename(path)), ignore=matcher)
+    print(f"   文件: {sorted(files)}")
+    return (leading[0].match("]") and leading[0].match("a") and not leading[0].match("b")
+            and negated[0].match("b") and not negated[0].match("]")
+            and unclosed[0].match("foo[]") and invalid is None and sorted(files) == [".gitignore", "b.txt"])
+
+
+def test_walk_ignored_sizes():
+    """测试同时统计总大小和排除忽略内容后的大小"""
+    print("测试忽略部分的大小...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_repo(tmp)
+        matcher = gitignore_func.IgnoreMatcher(tmp)
+        total, ignored = scan_func.walk_ignored_sizes(tmp, matcher)
+        pruned = scan_func.walk_tree(tmp, ignore=matcher)
+        print(f"   总大小: {total}, 忽略: {ignored}, 剪枝遍历: {pruned}")
+        return total == scan_func.walk_size(tmp) and total - ignored == pruned
+
+
+def test_walk_from_subdirectory():
+    """测试从仓库子目录开始遍历时使用上层的规则"""
+    print("测试子目录遍历...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_repo(tmp)
+        src = os.path.join(tmp, "src")
+        matcher = gitignore_func.matcher_for(src)
+        files = []
+        scan_func.walk_tree(src, on_file=lambda path, size, depth: files.append(os.path.relpath(path, src)),
+                            ignore=matcher)
+        print(f"   仓库根目录: {matcher.root}, 文件: {sorted(files)}")
+        return matcher.root == os.path.abspath(tmp) and sorted(files) == [".gitignore", "build.txt", "debug.log", "top.txt"]
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试gitignore_func模块")
+    print("="*50)
+
+    tests = [
+        test_patterns,
+        test_compile_pattern,
+        test_bracket_expressions,
+        test_walk_ignored_sizes,
+        test_walk_from_subdirectory
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+测试hash_cache.py模块的功能
+"""
+
+import os
+import sys
+import time
+import hashlib
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import hash_cache
+from hash_cache import ContentHashCache
+
+
+def _write(path, content, age=10):
+    """写入文件并把mtime调早，避免处于不写入缓存的时间窗口内"""
+    with open(path, 'wb') as f:
+        f.write(content)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_digests_are_reused():
+    """测试键未变化时复用摘要，修改后重新计算"""
+    print("测试摘要复用...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "a.txt")
+        _write(path, b"hello")
+        cache = ContentHashCache(os.path.join(tmp, "hash.db"))
+        stats = {}
+        first = cache.get_digests([path], stats)[path]
+        expected = hashlib.new(hash_cache.HASH_ALGORITHM, b"hello").hexdigest()
+        print(f"   第一次: {stats}")
+        if first != expected or stats != {"hashed": 1, "reused": 0}:
+            return False
+
+        # 重新打开缓存，验证摘要已持久化
+        cache.close()
+        cache = ContentHashCache(os.path.join(tmp, "hash.db"))
+        stats = {}
+        second = cache.get_digests([path], stats)[path]
+        print(f"   重新打开后: {stats}")
+        if second != expected or stats != {"hashed": 0, "reused": 1}:
+            return False
+
+        _write(path, b"world", age=5)
+        stats = {}
+        third = cache.get_digests([path], stats)[path]
+        print(f"   修改后: {stats}")
+        cache.close()
+        return third == hashlib.new(hash_cache.HASH_ALGORITHM, b"world").hexdigest() and stats["hashed"] == 1
+
+
+def test_recent_files_are_not_cached():
+    """测试刚修改的文件不写入缓存"""
+    print("测试刚修改的文件...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "a.txt")
+        _write(path, b"hello", age=0)
+        cache = ContentHashCache(os.path.join(tmp, "hash.db"))
+        cache.get_digests([path])
+        stats = {}
+        cache.get_digests([path], stats)
+        cache.close()
+        print(f"   第二次: {stats}")
+        return stats == {"hashed": 1, "reused": 0}
+
+
+def test_missing_and_directories():
+    """测试不存在的路径和目录的摘要为None"""
+    print("测试无效路径...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ContentHashCache(os.path.join(tmp, "hash.db"))
+        missing = os.path.join(tmp, "missing")
+        digests = cache.get_digests([missing, tmp])
+        cache.close()
+        print(f"   结果: {digests}")
+        return digests == {missing: None, tmp: None}
+
+
+def test_tree_digest():
+    """测试目录树摘要只在内容或文件名变化时改变"""
+    print("测试目录树摘要...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        os.makedirs(os.path.join(root, "sub"))
+        for i in range(hash_cache.PROCESS_POOL_MIN_FILES + 5):
+            _write(os.path.join(root, "sub", f"f{i}.txt"), str(i).encode())
+        cache = ContentHashCache(os.path.join(tmp, "hash.db"))
+        stats = {}
+        first, files = cache.tree_digest(root, stats=stats)
+        print(f"   第一次: {files}个文件, {stats}")
+        stats = {}
+        second, _ = cache.tree_digest(root, stats=stats)
+        print(f"   第二次: {stats}")
+        os.rename(os.path.join(root, "sub", "f0.txt"), os.path.join(root, "sub", "g0.txt"))
+        renamed, _ = cache.tree_digest(root)
+        cache.close()
+        return first == second and stats["hashed"] == 0 and renamed != first and files == hash_cache.PROCESS_POOL_MIN_FILES + 5
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试hash_cache模块")
+    print("="*50)
+
+    tests = [
+        test_digests_are_reused,
+        test_recent_files_are_not_cached,
+        test_missing_and_directories,
+        test_tree_digest
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
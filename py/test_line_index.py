@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+测试line_index.py模块的功能
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import line_index
+
+
+def _write(path, text, mode='w'):
+    with open(path, mode, encoding='utf-8', newline='\n') as f:
+        f.write(text)
+
+
+def test_line_offsets():
+    """测试行偏移和行数"""
+    print("测试行偏移...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'a.log')
+        _write(path, "aa\nbbb\n\ncc")
+        index = line_index.get_line_index(path)
+        print(f"   偏移: {list(index.offsets)}, 行数: {index.line_count}")
+        return list(index.offsets) == [0, 3, 7, 8] and index.line_count == 4 and index.line_at_offset(5) == 1
+
+
+def test_incremental_append():
+    """测试追加内容时只扫描新增部分"""
+    print("测试增量追加...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'b.log')
+        _write(path, "one\ntwo\n")
+        index = line_index.get_line_index(path)
+        before = index.offsets
+        _write(path, "three\n", mode='a')
+        index = line_index.get_line_index(path)
+        print(f"   偏移: {list(index.offsets)}, 行数: {index.line_count}")
+        # 追加时沿用同一个数组，说明没有重新建立索引
+        return index.offsets is before and list(index.offsets) == [0, 4, 8, 14] and index.line_count == 3
+
+
+def test_rewrite_rebuilds():
+    """测试文件被改写后重新建立索引"""
+    print("测试改写后重建索引...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'c.log')
+        _write(path, "one\ntwo\n")
+        line_index.get_line_index(path)
+        _write(path, "x\ny\nz\nw\n")
+        start, end, total = line_index.get_line_range(path, 1, 2)
+        print(f"   范围: {start}-{end}, 行数: {total}")
+        return (start, end, total) == (2, 6, 4)
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试line_index模块")
+    print("="*50)
+
+    tests = [
+        test_line_offsets,
+        test_incremental_append,
+        test_rewrite_rebuilds
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
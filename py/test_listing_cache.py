@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+测试listing_cache.py模块的功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from listing_cache import ListingCache
+
+
+def _make_dir(root, count=3):
+    for i in range(count):
+        with open(os.path.join(root, f"f{i}.txt"), 'w') as f:
+            f.write("x")
+    # 将目录mtime调到过去，避开刚修改时不缓存的时间窗口
+    past = time.time() - 60
+    os.utime(root, (past, past))
+
+
+def test_hit_and_miss():
+    """测试未变化的目录命中缓存"""
+    print("测试缓存命中...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_dir(tmp)
+        cache = ListingCache()
+        first = cache.scan(tmp)
+        second = cache.scan(tmp)
+        stats = cache.stats()
+        print(f"   统计: {stats}")
+        return first is second and stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_mtime_change_invalidates():
+    """测试目录变化后重新扫描"""
+    print("测试目录变化后失效...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_dir(tmp)
+        cache = ListingCache()
+        cache.scan(tmp)
+        with open(os.path.join(tmp, "new.txt"), 'w') as f:
+            f.write("y")
+        entries = cache.scan(tmp)
+        print(f"   条目数: {len(entries)}")
+        return len(entries) == 4 and cache.stats()["misses"] == 2
+
+
+def test_count_eviction():
+    """测试按数量淘汰最久未使用的目录"""
+    print("测试按数量淘汰...")
+    with tempfile.TemporaryDirectory() as tmp:
+        dirs = []
+        for i in range(3):
+            path = os.path.join(tmp, f"d{i}")
+            os.makedirs(path)
+            _make_dir(path)
+            dirs.append(path)
+        cache = ListingCache(max_entries=2)
+        for path in dirs:
+            cache.scan(path)
+        stats = cache.stats()
+        print(f"   统计: {stats}")
+        return stats["entries"] == 2 and stats["evictions"] == 1
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试listing_cache模块")
+    print("="*50)
+
+    tests = [
+        test_hit_and_miss,
+        test_mtime_change_invalidates,
+        test_count_eviction
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+测试listing_snapshot.py模块的功能
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import listing_snapshot
+
+
+def _make_dir(root):
+    for index, name in enumerate(['b.txt', 'a.py', 'c.md']):
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(b'x' * (10 * (index + 1)))
+    os.makedirs(os.path.join(root, 'folder'))
+
+
+def test_sort_by_name():
+    """测试按名称排序"""
+    print("测试按名称排序...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_dir(tmp)
+        snapshot = listing_snapshot.create_snapshot(tmp, "name")
+        names = [entry[listing_snapshot.NAME] for entry in snapshot.entries]
+        print(f"   顺序: {names}")
+        return names == ['a.py', 'b.txt', 'c.md', 'folder']
+
+
+def test_sort_by_size_desc():
+    """测试按大小降序排序，目录大小由size_func提供"""
+    print("测试按大小降序排序...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_dir(tmp)
+        snapshot = listing_snapshot.create_snapshot(tmp, "size", True, size_func=lambda paths: [100] * len(paths))
+        names = [entry[listing_snapshot.NAME] for entry in snapshot.entries]
+        print(f"   顺序: {names}")
+        return names == ['folder', 'c.md', 'a.py', 'b.txt']
+
+
+def test_cursor_paging():
+    """测试游标分页"""
+    print("测试游标分页...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_dir(tmp)
+        snapshot = listing_snapshot.create_snapshot(tmp, "name")
+        cursor = listing_snapshot.encode_cursor(snapshot.snapshot_id, 2)
+        snapshot_id, offset = listing_snapshot.decode_cursor(cursor)
+        page = listing_snapshot.get_snapshot(snapshot_id).page(offset, 2)
+        names = [entry[listing_snapshot.NAME] for entry in page]
+        print(f"   第二页: {names}")
+        return names == ['c.md', 'folder'] and listing_snapshot.decode_cursor("bad") is None
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试listing_snapshot模块")
+    print("="*50)
+
+    tests = [
+        test_sort_by_name,
+        test_sort_by_size_desc,
+        test_cursor_paging
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
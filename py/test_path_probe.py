@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+测试path_probe.py模块的功能
+"""
+
+import os
+import sys
+import time
+import threading
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import path_probe
+
+
+def test_slow_probe_is_pending():
+    """测试超时的探测返回PENDING，完成后从缓存中得到结果"""
+    print("测试超时探测...")
+    cache = path_probe.ProbeCache(ttl=30)
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return True
+
+    probes = {"slow": slow, "fast": lambda: False}
+    start = time.monotonic()
+    first = cache.probe_many(probes, timeout=0.1)
+    elapsed = time.monotonic() - start
+    print(f"   第一次结果: slow={first['slow'] is path_probe.PENDING}, fast={first['fast']}, 用时{elapsed:.2f}秒")
+    if first["slow"] is not path_probe.PENDING or first["fast"] is not False or elapsed > 1:
+        return False
+
+    # 探测仍在进行时再次请求不会启动新的探测
+    second = cache.probe_many(probes, timeout=0.05)
+    release.set()
+    time.sleep(0.1)
+    third = cache.probe_many(probes, timeout=0.05)
+    print(f"   探测次数: {len(calls)}, 第三次结果: {third}")
+    return second["slow"] is path_probe.PENDING and third["slow"] is True and len(calls) == 1
+
+
+def test_results_expire():
+    """测试缓存过期后重新探测"""
+    print("测试缓存过期...")
+    cache = path_probe.ProbeCache(ttl=0.05)
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return len(calls)
+
+    first = cache.probe_many({"p": probe})["p"]
+    cached = cache.probe_many({"p": probe})["p"]
+    time.sleep(0.1)
+    expired = cache.probe_many({"p": probe})["p"]
+    print(f"   结果: {first}, {cached}, {expired}")
+    return first == 1 and cached == 1 and expired == 2
+
+
+def test_failed_probe_returns_none():
+    """测试抛出异常的探测结果为None"""
+    print("测试探测异常...")
+    cache = path_probe.ProbeCache()
+
+    def broken():
+        raise OSError("stale file handle")
+
+    result = cache.probe_many({"broken": broken})
+    print(f"   结果: {result}")
+    return result["broken"] is None
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试path_probe模块")
+    print("="*50)
+
+    tests = [
+        test_slow_probe_is_pending,
+        test_results_expire,
+        test_failed_probe_returns_none
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
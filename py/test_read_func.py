@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+测试read_func.py模块的功能
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import read_func
+
+
+def _make_file(tmp, line_count=100):
+    path = os.path.join(tmp, 'sample.txt')
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for i in range(line_count):
+            f.write(f"第{i}行\n")
+    return path
+
+
+def test_read_range_keeps_utf8_boundaries():
+    """测试按字节范围读取时不截断多字节字符"""
+    print("测试read_range字符边界...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_file(tmp)
+        # 偏移1落在"第"字中间，应跳到下一个完整字符
+        result = read_func.read_range(path, 1, 10)
+        print(f"   结果: {result}")
+        return result["success"] and "�" not in result["content"] and result["offset"] == 3
+
+
+def test_read_lines_window():
+    """测试按行窗口读取"""
+    print("测试read_lines...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_file(tmp)
+        result = read_func.read_lines(path, 10, 3)
+        print(f"   行: {result['lines']}")
+        return result["lines"] == ["第10行", "第11行", "第12行"] and not result["eof"]
+
+
+def test_read_lines_splits_on_newline_only():
+    """测试只按\\n分行（与行索引一致），截断时在完整行处结束"""
+    print("测试分行...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'mixed.txt')
+        with open(path, 'wb') as f:
+            f.write(b'a\rb\x0cx\nc\r\nd')
+        first = read_func.read_lines(path, 0, 1)
+        whole = read_func.read_lines(path, 0, 10)
+        get_max_file_size = read_func.get_max_file_size
+        read_func.get_max_file_size = lambda: 9
+        try:
+            capped = read_func.read_lines(path, 0, 10)
+        finally:
+            read_func.get_max_file_size = get_max_file_size
+        print(f"   第一行: {first['lines']}, 全部: {whole['lines']}, 截断: {capped['lines']}")
+        return (first["lines"] == ["a\rb\x0cx"] and not first["eof"]
+                and whole["lines"] == ["a\rb\x0cx", "c", "d"] and whole["eof"]
+                and capped["lines"] == ["a\rb\x0cx", "c"] and capped["next_offset"] == 9 and not capped["eof"])
+
+
+def test_wide_encodings():
+    """测试UTF-16/32文件按行和按范围读取时与代码单元对齐"""
+    print("测试UTF-16/32...")
+    lines = ["第0行 \u0a0a", "emoji 😀", "末行"]
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for encoding in ("utf-16", "utf-32"):
+            path = os.path.join(tmp, f"{encoding}.txt")
+            with open(path, 'w', encoding=encoding, newline='\n') as f:
+                f.write("\n".join(lines) + "\n")
+            window = read_func.read_lines(path, 1, 2)
+            info = read_func.get_line_info(path)
+            # 奇数偏移和长度落在代码单元中间
+            ranged = read_func.read_range(path, 3, 21)
+            whole = read_func.read_range(path, 0)
+            print(f"   {encoding}: {window['lines']}, 总行数: {info['total_lines']}, 范围: {ranged['content']!r}")
+            ok = ok and (window["lines"] == lines[1:] and window["total_lines"] == 3 and info["total_lines"] == 3
+                         and whole["content"] == "\n".join(lines) + "\n"
+                         and "\ufeff" not in ranged["content"] and "�" not in ranged["content"]
+                         and ranged["content"] in whole["content"])
+    return ok
+
+
+def test_read_preview_truncated():
+    """测试预览模式只返回开头部分"""
+    print("测试read_preview...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_file(tmp)
+        result = read_func.read_preview(path, 16)
+        print(f"   结果: {result}")
+        return result["truncated"] and result["next_offset"] <= 16
+
+
+def test_empty_file():
+    """测试空文件（无法映射）"""
+    print("测试空文件...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'empty.txt')
+        open(path, 'w').close()
+        result = read_func.read_range(path)
+        print(f"   结果: {result}")
+        return result["success"] and result["content"] == "" and result["eof"]
+
+
+def test_tail_file_detects_rotation():
+    """测试跟踪模式只返回新增内容，并识别截断和轮转"""
+    print("测试tail_file...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.log')
+        with open(path, 'w') as f:
+            f.write("first\n")
+        result = read_func.tail_file(path)
+        with open(path, 'a') as f:
+            f.write("second\n")
+        appended = read_func.tail_file(path, result["cursor"])
+        with open(path, 'w') as f:
+            f.write("")
+        truncated = read_func.tail_file(path, appended["cursor"])
+        os.rename(path, path + ".1")
+        with open(path, 'w') as f:
+            f.write("rotated\n")
+        rotated = read_func.tail_file(path, appended["cursor"])
+        print(f"   追加: {appended['content']!r}, 截断: {truncated['truncated']}, 轮转: {rotated['rotated']}")
+        return (appended["content"] == "second\n" and truncated["truncated"]
+                and rotated["rotated"] and rotated["content"] == "rotated\n")
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试read_func模块")
+    print("="*50)
+
+    tests = [
+        test_read_range_keeps_utf8_boundaries,
+        test_read_lines_window,
+        test_read_lines_splits_on_newline_only,
+        test_wide_encodings,
+        test_read_preview_truncated,
+        test_empty_file,
+        test_tail_file_detects_rotation
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
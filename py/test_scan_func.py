@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+测试scan_func.py模块的功能
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scan_func
+
+
+def _make_tree(root):
+    os.makedirs(os.path.join(root, 'sub', 'deep'))
+    for rel, size in (('a.txt', 10), ('sub/b.txt', 20), ('sub/deep/c.txt', 30)):
+        with open(os.path.join(root, rel), 'wb') as f:
+            f.write(b'x' * size)
+    if hasattr(os, 'symlink'):
+        try:
+            # 失效的符号链接不应导致扫描失败
+            os.symlink(os.path.join(root, 'missing'), os.path.join(root, 'broken'))
+            # 指向目录的符号链接不应被重复统计
+            os.symlink(os.path.join(root, 'sub'), os.path.join(root, 'sub_link'))
+        except OSError:
+            pass
+
+
+def _walk_size(path):
+    total_size = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            filepath = os.path.join(dirpath, filename)
+            if os.path.exists(filepath):
+                total_size += os.path.getsize(filepath)
+    return total_size
+
+
+def test_scan_directory():
+    """测试扫描目录直接条目"""
+    print("测试scan_directory...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        entries = {entry["name"]: entry for entry in scan_func.scan_directory(tmp)}
+        print(f"   条目: {sorted(entries)}")
+        return (entries['a.txt']["is_file"] and entries['a.txt']["size"] == 10
+                and not entries['sub']["is_file"] and entries['sub']["size"] is None)
+
+
+def test_walk_size_matches_os_walk():
+    """测试walk_size与os.walk实现结果一致"""
+    print("测试walk_size...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        size = scan_func.walk_size(tmp)
+        expected = _walk_size(tmp)
+        print(f"   walk_size: {size}, os.walk: {expected}")
+        return size == expected == 60
+
+
+def test_walk_tree_aggregates():
+    """测试后序遍历的目录聚合大小"""
+    print("测试walk_tree...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        files = {}
+        dirs = {}
+        total = scan_func.walk_tree(
+            tmp,
+            lambda path, size, depth: files.__setitem__(os.path.relpath(path, tmp), size),
+            lambda path, size, depth: dirs.__setitem__(os.path.relpath(path, tmp), (size, depth))
+        )
+        print(f"   文件: {files}, 目录: {dirs}")
+        expected_dirs = {
+            os.curdir: (60, 0),
+            'sub': (50, 1),
+            os.path.join('sub', 'deep'): (30, 2)
+        }
+        return total == 60 == _walk_size(tmp) and dirs == expected_dirs and files['a.txt'] == 10
+
+
+def test_hardlink_dedup():
+    """测试硬链接只统计一次"""
+    print("测试硬链接去重...")
+    if not hasattr(os, 'link'):
+        print("   当前平台不支持硬链接，跳过")
+        return True
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        os.link(os.path.join(tmp, 'a.txt'), os.path.join(tmp, 'sub', 'a_link.txt'))
+        raw = scan_func.walk_size(tmp)
+        dedup = scan_func.InodeDedup(tmp)
+        deduplicated = scan_func.walk_size(tmp, dedup)
+        tree_total = scan_func.walk_tree(tmp, dedup=scan_func.InodeDedup(tmp))
+        print(f"   原始: {raw}, 去重: {deduplicated}, 统计: {dedup.stats()}")
+        return (raw == 70 and deduplicated == 60 == tree_total
+                and dedup.stats()["duplicate_files"] == 1 and dedup.stats()["duplicate_bytes"] == 10)
+
+
+def test_dedup_skips_repeated_directories():
+    """测试同一目录第二次出现时不再遍历"""
+    print("测试重复目录...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        dedup = scan_func.InodeDedup(tmp)
+        st = os.stat(os.path.join(tmp, 'sub'))
+        first = dedup.enter_dir(st)
+        second = dedup.enter_dir(st)
+        other_fs = scan_func.InodeDedup(tmp, one_filesystem=True)
+        fake = os.stat_result((st.st_mode, st.st_ino + 1, st.st_dev + 1) + tuple(st)[3:])
+        print(f"   第一次: {first}, 第二次: {second}, 其他文件系统: {other_fs.enter_dir(fake)}")
+        return first and not second and not other_fs.enter_dir(fake) and other_fs.skipped_mounts == 2
+
+
+def test_iter_files_skips_ignored_and_vcs():
+    """测试遍历文件时跳过版本控制目录、被忽略的文件和目录符号链接"""
+    print("测试iter_files...")
+    import gitignore_func
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        os.makedirs(os.path.join(tmp, '.git'))
+        for rel, content in (('.git/HEAD', b'ref'), ('.gitignore', b'deep/\n*.log\n'), ('sub/x.log', b'log')):
+            with open(os.path.join(tmp, rel), 'wb') as f:
+                f.write(content)
+        found = [os.path.relpath(path, tmp) for path in scan_func.iter_files(tmp)]
+        ignore = gitignore_func.IgnoreMatcher(tmp)
+        kept = [os.path.relpath(path, tmp) for path in scan_func.iter_files(tmp, ('.txt',), ignore)]
+        print(f"   全部: {found}, 过滤后: {kept}")
+        expected = ['.gitignore', 'a.txt', 'broken', 'sub/b.txt', 'sub/x.log', 'sub/deep/c.txt']
+        return found == [path.replace('/', os.sep) for path in expected] and kept == ['a.txt', os.path.join('sub', 'b.txt')]
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试scan_func模块")
+    print("="*50)
+
+    tests = [
+        test_scan_directory,
+        test_walk_size_matches_os_walk,
+        test_walk_tree_aggregates,
+        test_hardlink_dedup,
+        test_dedup_skips_repeated_directories,
+        test_iter_files_skips_ignored_and_vcs
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+测试search_func.py模块的功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import job_func
+import search_func
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _make_tree(root):
+    _write(os.path.join(root, "a.py"), b"import os\nprint('Needle here')\n")
+    _write(os.path.join(root, "sub", "b.py"), b"x = 1\nneedle = 2\n")
+    _write(os.path.join(root, "sub", "c.txt"), b"needle in txt\n")
+    _write(os.path.join(root, "bin.py"), b"needle\x00\x01\x02" * 10)
+    _write(os.path.join(root, ".git", "d.py"), b"needle\n")
+
+
+def _run(root, pattern, timeout=30, **kwargs):
+    """启动搜索并等待结束，返回(任务, 全部匹配)"""
+    response = search_func.search_content(root, pattern, **kwargs)
+    job = job_func.get_job(response["job_id"])
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.05)
+    matches = [m for e in job.events if e["type"] == "matches" for m in e["matches"]]
+    return job, matches
+
+
+def test_extension_filter():
+    """测试按扩展名过滤并跳过二进制文件和.git目录"""
+    print("测试扩展名过滤...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        job, matches = _run(tmp, "needle", extensions=[".py"])
+        found = sorted((os.path.relpath(m["path"], tmp), m["line"]) for m in matches)
+        print(f"   匹配: {found}, 结果: {job.result}")
+        return (job.status == "done" and found == [("a.py", 2), (os.path.join("sub", "b.py"), 2)]
+                and job.result["skipped"] == 1)
+
+
+def test_case_and_regex():
+    """测试区分大小写和正则表达式"""
+    print("测试大小写和正则...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        _, sensitive = _run(tmp, "Needle", case_sensitive=True, extensions=[])
+        _, pattern = _run(tmp, r"needle\s*=", regex=True, extensions=[])
+        print(f"   区分大小写: {len(sensitive)}, 正则: {len(pattern)}")
+        return len(sensitive) == 1 and len(pattern) == 1 and pattern[0]["column"] == 0
+
+
+def test_invalid_regex():
+    """测试无效的正则表达式"""
+    print("测试无效正则...")
+    with tempfile.TemporaryDirectory() as tmp:
+        response = search_func.search_content(tmp, "(", regex=True)
+        print(f"   响应: {response}")
+        return response["success"] is False
+
+
+def test_max_matches():
+    """测试匹配数量上限"""
+    print("测试匹配数量上限...")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(100):
+            _write(os.path.join(tmp, f"f{i}.txt"), b"hit\nhit\n")
+        job, matches = _run(tmp, "hit", extensions=[".txt"], max_matches=10)
+        print(f"   匹配数量: {len(matches)}, 结果: {job.result}")
+        return len(matches) == 10 and job.result["truncated"]
+
+
+def test_cancel():
+    """测试取消搜索"""
+    print("测试取消搜索...")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(2000):
+            _write(os.path.join(tmp, f"f{i}.txt"), b"line\n" * 200 + b"hit\n")
+        response = search_func.search_content(tmp, "hit", extensions=[".txt"], max_matches=100000)
+        job_func.cancel_job(response["job_id"])
+        job = job_func.get_job(response["job_id"])
+        deadline = time.time() + 30
+        while job.status == "running" and time.time() < deadline:
+            time.sleep(0.05)
+        print(f"   状态: {job.status}")
+        return job.status == "cancelled"
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试search_func模块")
+    print("="*50)
+
+    tests = [
+        test_extension_filter,
+        test_case_and_regex,
+        test_invalid_regex,
+        test_max_matches,
+        test_cancel
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+测试size_estimate.py模块的功能
+"""
+
+import os
+import sys
+import random
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scan_func
+import size_estimate
+
+
+def _make_tree(root, fanout=4, depth=3, file_size=100):
+    """生成每层fanout个子目录、每个目录一个文件的均匀目录树"""
+    with open(os.path.join(root, "f.bin"), 'wb') as f:
+        f.write(b'x' * file_size)
+    if depth == 0:
+        return
+    for i in range(fanout):
+        child = os.path.join(root, f"d{i}")
+        os.mkdir(child)
+        _make_tree(child, fanout, depth - 1, file_size)
+
+
+def test_small_tree_is_exact():
+    """测试预算内扫描完成的目录返回精确值"""
+    print("测试精确值...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp, fanout=2, depth=2)
+        result = size_estimate.estimate_directory_size(tmp, time_budget=1.0)
+        print(f"   结果: {result}")
+        return result["exact"] and result["size"] == scan_func.walk_size(tmp) and result["error_bound"] == 0
+
+
+def test_probe_is_exact_for_uniform_tree():
+    """测试均匀目录树上每次抽样都等于精确值"""
+    print("测试均匀树抽样...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp, fanout=3, depth=3)
+        sampler = size_estimate.TreeSampler(tmp, random.Random(1))
+        probes = {sampler.probe() for _ in range(5)}
+        print(f"   抽样结果: {probes}, 精确值: {scan_func.walk_size(tmp)}")
+        return probes == {scan_func.walk_size(tmp)}
+
+
+def test_estimate_with_zero_budget():
+    """测试预算不足以完整扫描时返回估算值和误差范围"""
+    print("测试抽样估算...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp, fanout=3, depth=3)
+        # 使一个分支明显更大，抽样结果会有方差
+        with open(os.path.join(tmp, "d0", "big.bin"), 'wb') as f:
+            f.write(b'x' * 10000)
+        result = size_estimate.estimate_directory_size(tmp, time_budget=0, rng=random.Random(7))
+        exact = scan_func.walk_size(tmp)
+        print(f"   结果: {result}, 精确值: {exact}")
+        return not result["exact"] and result["samples"] >= 1 and result["error_bound"] > 0 and result["size"] > 0
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试size_estimate模块")
+    print("="*50)
+
+    tests = [
+        test_small_tree_is_exact,
+        test_probe_is_exact_for_uniform_tree,
+        test_estimate_with_zero_budget
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
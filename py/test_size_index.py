@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+测试size_index.py模块的功能
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from size_index import DirectorySizeIndex
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def _make_tree(root):
+    _write(os.path.join(root, 'a.txt'), 10)
+    _write(os.path.join(root, 'sub1', 'b.txt'), 20)
+    _write(os.path.join(root, 'sub1', 'deep', 'c.txt'), 30)
+    _write(os.path.join(root, 'sub2', 'd.txt'), 40)
+
+
+def test_size_matches_walk():
+    """测试索引计算结果与完整遍历一致"""
+    print("测试索引大小与os.walk结果一致...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'tree')
+        _make_tree(root)
+        index = DirectorySizeIndex(os.path.join(tmp, 'index.db'))
+        size = index.get_size(root)
+        index.close()
+        print(f"   索引大小: {size}")
+        return size == 100
+
+
+def test_second_visit_reuses_index():
+    """测试再次访问时只复用索引不重新扫描"""
+    print("测试再次访问复用索引...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'tree')
+        _make_tree(root)
+        index = DirectorySizeIndex(os.path.join(tmp, 'index.db'))
+        index.get_size(root)
+        stats = {}
+        size = index.get_size(root, stats=stats)
+        index.close()
+        print(f"   大小: {size}, 统计: {stats}")
+        return size == 100 and stats['scanned'] == 0 and stats['reused'] == 4
+
+
+def test_changed_subtree_rescanned():
+    """测试只重新扫描发生变化的目录"""
+    print("测试变化目录的增量更新...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'tree')
+        _make_tree(root)
+        index = DirectorySizeIndex(os.path.join(tmp, 'index.db'))
+        index.get_size(root)
+        _write(os.path.join(root, 'sub1', 'deep', 'e.txt'), 5)
+        stats = {}
+        size = index.get_size(root, stats=stats)
+        index.close()
+        print(f"   大小: {size}, 统计: {stats}")
+        return size == 105 and stats['scanned'] == 1
+
+
+def test_index_persists():
+    """测试索引在重新打开后仍然可用"""
+    print("测试索引持久化...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'tree')
+        _make_tree(root)
+        db_path = os.path.join(tmp, 'index.db')
+        index = DirectorySizeIndex(db_path)
+        index.get_size(root)
+        index.close()
+        index = DirectorySizeIndex(db_path)
+        stats = {}
+        size = index.get_size(root, stats=stats)
+        index.close()
+        print(f"   大小: {size}, 统计: {stats}")
+        return size == 100 and stats['scanned'] == 0
+
+
+def test_in_place_growth():
+    """测试原地追加内容后通过refresh或invalidate得到正确结果，其余目录仍复用记录"""
+    print("测试原地修改文件...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'tree')
+        _make_tree(root)
+        index = DirectorySizeIndex(os.path.join(tmp, 'index.db'))
+        index.get_size(root)
+        with open(os.path.join(root, 'sub2', 'd.txt'), 'ab') as f:
+            f.write(b'x' * 1000)
+        refreshed = index.get_size(root, refresh=True)
+
+        with open(os.path.join(root, 'a.txt'), 'ab') as f:
+            f.write(b'x' * 1000)
+        stale = index.get_size(root)
+        index.invalidate(root)
+        stats = {}
+        invalidated = index.get_size(root, stats=stats)
+        index.close()
+        print(f"   refresh: {refreshed}, 未失效: {stale}, 失效后: {invalidated}, 统计: {stats}")
+        return (refreshed == 1100 and stale == 1100 and invalidated == 2100
+                and stats['scanned'] == 1 and stats['reused'] > 0)
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试size_index模块")
+    print("="*50)
+
+    tests = [
+        test_size_matches_walk,
+        test_second_visit_reuses_index,
+        test_changed_subtree_rescanned,
+        test_index_persists,
+        test_in_place_growth
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+测试sniff_func.py模块的功能
+"""
+
+import os
+import sys
+import codecs
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sniff_func import sniff_bytes
+
+
+def test_text_encodings():
+    """测试文本编码识别"""
+    print("测试文本编码识别...")
+    results = {
+        "utf-8": sniff_bytes("普通文本 text\n".encode("utf-8"))["encoding"],
+        "utf-8-sig": sniff_bytes(codecs.BOM_UTF8 + b"abc")["encoding"],
+        "utf-16": sniff_bytes("abc".encode("utf-16"))["encoding"],
+        "utf-16-le": sniff_bytes("plain ascii text".encode("utf-16-le"))["encoding"],
+        "gb18030": sniff_bytes("中文内容".encode("gbk"))["encoding"],
+    }
+    print(f"   结果: {results}")
+    return all(expected == actual for expected, actual in results.items())
+
+
+def test_binary_detection():
+    """测试二进制文件识别"""
+    print("测试二进制识别...")
+    png = sniff_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+    unknown = sniff_bytes(bytes(range(256)) * 4)
+    empty = sniff_bytes(b"")
+    print(f"   png: {png}, 未知: {unknown}, 空文件: {empty}")
+    return (png["kind"] == "binary" and png["format"] == "png"
+            and unknown["kind"] == "binary" and empty["kind"] == "empty")
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试sniff_func模块")
+    print("="*50)
+
+    tests = [
+        test_text_encodings,
+        test_binary_detection
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
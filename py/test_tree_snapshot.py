@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+测试tree_snapshot.py模块的功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import job_func
+import tree_snapshot
+from tree_snapshot import TreeSnapshot
+
+
+def _write(path, content=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def _wait(job_id, timeout=10):
+    job = job_func.get_job(job_id)
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def test_write_and_read():
+    """测试快照按路径组成部分排序并能通过mmap读取"""
+    print("测试写入和读取快照...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        _write(os.path.join(root, "a", "b.txt"), b"hello")
+        _write(os.path.join(root, "a.txt"))
+        _write(os.path.join(root, ".git", "HEAD"))
+        snapshot_path = os.path.join(tmp, "tree.snap")
+        count = tree_snapshot.write_snapshot(root, snapshot_path)
+        with TreeSnapshot(snapshot_path) as snapshot:
+            entries = [snapshot.entry(i) for i in range(len(snapshot))]
+            snapshot_root = snapshot.root
+        print(f"   条目: {[(entry[0], entry[1], entry[2]) for entry in entries]}")
+        # a/b.txt 排在 a.txt 之前，与逐级比较路径的顺序一致；.git 被跳过
+        return (count == 3 and snapshot_root == root
+                and [entry[0] for entry in entries] == ["a", "a/b.txt", "a.txt"]
+                and entries[0][1] and entries[1][2] == 5)
+
+
+def test_invalid_snapshot():
+    """测试打开无效的快照文件时抛出ValueError"""
+    print("测试无效快照...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bad.snap")
+        _write(path, b"not a snapshot" * 10)
+        try:
+            TreeSnapshot(path)
+        except ValueError as e:
+            print(f"   错误: {e}")
+            return True
+        return False
+
+
+def test_diff():
+    """测试两次快照之间的新增、删除和修改"""
+    print("测试快照比较...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        snapshot_dir = os.path.join(tmp, "snapshots")
+        _write(os.path.join(root, "keep.txt"))
+        _write(os.path.join(root, "edit.txt"), b"one")
+        _write(os.path.join(root, "old", "gone.txt"))
+        _write(os.path.join(root, "ignored.log"))
+        _write(os.path.join(root, ".gitignore"), b"*.log\n")
+        os.mkdir(os.path.join(root, ".git"))
+        first = tree_snapshot.changed_paths(root, snapshot_dir=snapshot_dir)
+
+        _write(os.path.join(root, "edit.txt"), b"three")
+        os.remove(os.path.join(root, "old", "gone.txt"))
+        os.rmdir(os.path.join(root, "old"))
+        _write(os.path.join(root, "new", "added.txt"))
+        _write(os.path.join(root, "other.log"))
+        # changed_paths默认跳过.gitignore忽略的文件，ignored.log和other.log都不会出现
+        changes = []
+        result = tree_snapshot.update_snapshot(root, changes.append, respect_gitignore=True,
+                                               snapshot_dir=snapshot_dir)
+        summary = sorted((change["change"], change["path"]) for change in changes)
+        print(f"   第一次: {first}, 变化: {summary}")
+        again = tree_snapshot.changed_paths(root, snapshot_dir=snapshot_dir)
+        print(f"   没有修改时: {again}")
+        return (first is None and not result["baseline"] and again == [] and summary == [
+            ("added", "new"), ("added", "new/added.txt"), ("modified", "edit.txt"),
+            ("removed", "old"), ("removed", "old/gone.txt")
+        ])
+
+
+def test_consumers_are_independent():
+    """测试不同使用者和忽略模式各自保存快照，互不推进比较基准"""
+    print("测试快照使用者...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        snapshot_dir = os.path.join(tmp, "snapshots")
+        _write(os.path.join(root, "a.txt"))
+        for consumer in ("first", "second"):
+            tree_snapshot.changed_paths(root, snapshot_dir=snapshot_dir, consumer=consumer)
+        tree_snapshot.changed_paths(root, respect_gitignore=False, snapshot_dir=snapshot_dir, consumer="first")
+        _write(os.path.join(root, "b.txt"))
+        first = tree_snapshot.changed_paths(root, snapshot_dir=snapshot_dir, consumer="first")
+        second = tree_snapshot.changed_paths(root, snapshot_dir=snapshot_dir, consumer="second")
+        unfiltered = tree_snapshot.changed_paths(root, respect_gitignore=False, snapshot_dir=snapshot_dir,
+                                                 consumer="first")
+        print(f"   first: {first}, second: {second}, 不跳过忽略文件: {unfiltered}")
+        return first == second == unfiltered == ["b.txt"] and len(os.listdir(snapshot_dir)) == 3
+
+
+def test_changes_job():
+    """测试后台任务推送变化"""
+    print("测试变化任务...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        _write(os.path.join(root, "a.txt"))
+        previous_dir = tree_snapshot.DEFAULT_SNAPSHOT_DIR
+        tree_snapshot.DEFAULT_SNAPSHOT_DIR = os.path.join(tmp, "snapshots")
+        try:
+            baseline = _wait(tree_snapshot.get_changes_since_last(root)["job_id"]).result
+            _write(os.path.join(root, "b.txt"))
+            job = _wait(tree_snapshot.get_changes_since_last(root)["job_id"])
+        finally:
+            tree_snapshot.DEFAULT_SNAPSHOT_DIR = previous_dir
+        events = [event for event in job.snapshot()["events"] if event["type"] == "changes"]
+        print(f"   基线: {baseline}, 结果: {job.result}")
+        return (baseline["baseline"] and job.result["added"] == 1 and not job.result["truncated"]
+                and events[0]["changes"][0]["path"] == "b.txt")
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试tree_snapshot模块")
+    print("="*50)
+
+    tests = [
+        test_write_and_read,
+        test_invalid_snapshot,
+        test_diff,
+        test_consumers_are_independent,
+        test_changes_job
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
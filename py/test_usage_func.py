@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+测试usage_func.py模块的功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import job_func
+import usage_func
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def _make_tree(root):
+    _write(os.path.join(root, "small.txt"), 10)
+    _write(os.path.join(root, "big", "huge.bin"), 5000)
+    _write(os.path.join(root, "big", "medium.bin"), 1000)
+    _write(os.path.join(root, "other", "nested", "mid.bin"), 2000)
+    _write(os.path.join(root, "other", "tiny.txt"), 1)
+
+
+def _wait(job_id, timeout=10):
+    job = job_func.get_job(job_id)
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def test_top_n():
+    """测试有界堆只保留最大的N项"""
+    print("测试TopN...")
+    top = usage_func.TopN(3)
+    for size in [5, 1, 9, 3, 7, 2, 8]:
+        top.push(size, f"p{size}")
+    sizes = [item["size"] for item in top.items()]
+    print(f"   结果: {sizes}")
+    return sizes == [9, 8, 7]
+
+
+def test_largest_items():
+    """测试最大文件和目录报告"""
+    print("测试最大文件和目录...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        response = usage_func.get_largest_items(tmp, 2)
+        job = _wait(response["job_id"])
+        result = job.result
+        files = [os.path.relpath(item["path"], tmp) for item in result["files"]]
+        dirs = [(os.path.relpath(item["path"], tmp), item["size"]) for item in result["directories"]]
+        print(f"   文件: {files}, 目录: {dirs}")
+        progress = [e for e in job.events if e["type"] == "progress"]
+        return (job.status == "done"
+                and result["total_size"] == 8011
+                and result["file_count"] == 5
+                and files == [os.path.join("big", "huge.bin"), os.path.join("other", "nested", "mid.bin")]
+                and dirs == [("big", 6000), ("other", 2001)]
+                and progress and progress[-1]["files"] == 5)
+
+
+def test_treemap():
+    """测试树图聚合"""
+    print("测试树图...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        job = _wait(usage_func.get_treemap(tmp, depth=1)["job_id"])
+        tree = job.result["tree"]
+        children = [(c["name"], c["type"], c["size"], "children" in c) for c in tree["children"]]
+        print(f"   根节点: {tree['size']}, 子节点: {children}")
+        return (tree["size"] == 8011 and children == [
+            ("big", "dir", 6000, False),
+            ("other", "dir", 2001, False),
+            ("small.txt", "file", 10, False)
+        ])
+
+
+def test_treemap_merges_small_children():
+    """测试超出数量的子节点合并为其他"""
+    print("测试合并较小的子节点...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        job = _wait(usage_func.get_treemap(tmp, depth=2, max_children=1)["job_id"])
+        tree = job.result["tree"]
+        other = tree["children"][1]
+        nested = tree["children"][0]["children"]
+        print(f"   子节点: {tree['children']}")
+        return (len(tree["children"]) == 2 and other["type"] == "other"
+                and other["size"] == 2011 and other["count"] == 2
+                and nested == [{"name": "huge.bin", "type": "file", "size": 5000},
+                               {"name": usage_func.OTHER_NODE_NAME, "type": "other", "size": 1000, "count": 1}])
+
+
+def test_invalid_root():
+    """测试无效的根目录"""
+    print("测试无效路径...")
+    response = usage_func.get_largest_items("/path/that/does/not/exist")
+    print(f"   响应: {response}")
+    return response["success"] is False
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试usage_func模块")
+    print("="*50)
+
+    tests = [
+        test_top_n,
+        test_largest_items,
+        test_treemap,
+        test_treemap_merges_small_children,
+        test_invalid_root
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+测试watch_func.py模块的功能
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import job_func
+import watch_func
+
+
+def _write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def _wait_for(job, event_type, timeout=5.0):
+    """等待任务产生指定类型的事件"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in job.events:
+            if event["type"] == event_type:
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def _wait_finished(job, timeout=5.0):
+    """等待任务结束"""
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.05)
+    return job.status
+
+
+def test_diff_snapshots():
+    """测试快照比较"""
+    print("测试快照比较...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(os.path.join(tmp, "keep.txt"), "a")
+        _write(os.path.join(tmp, "change.txt"), "a")
+        _write(os.path.join(tmp, "remove.txt"), "a")
+        old = watch_func.take_snapshot(tmp)
+
+        os.remove(os.path.join(tmp, "remove.txt"))
+        _write(os.path.join(tmp, "change.txt"), "longer")
+        _write(os.path.join(tmp, "new.txt"), "a")
+        added, removed, modified = watch_func.diff_snapshots(old, watch_func.take_snapshot(tmp))
+        names = ([e["name"] for e in added], [e["name"] for e in removed], [e["name"] for e in modified])
+        print(f"   新增/删除/修改: {names}")
+        return names == (["new.txt"], ["remove.txt"], ["change.txt"])
+
+
+def test_directory_items_pending():
+    """测试增量中的目录不同步计算大小，标记为待计算"""
+    print("测试目录条目...")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.mkdir(os.path.join(tmp, "sub"))
+        _write(os.path.join(tmp, "sub", "data.txt"), "hello")
+        _write(os.path.join(tmp, "file.txt"), "abc")
+        items = {entry["name"]: watch_func._to_item(entry) for entry in watch_func.take_snapshot(tmp).values()}
+        print(f"   条目: {items}")
+        return (items["sub"]["size"] is None and items["sub"]["size_pending"]
+                and items["file.txt"]["size"] == 3 and "size_pending" not in items["file.txt"])
+
+
+def _run_watch(backend_cls):
+    """在指定后端下运行监视任务，返回delta事件"""
+    original = watch_func.InotifyWatch
+    if backend_cls is not None:
+        watch_func.InotifyWatch = backend_cls
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            _write(os.path.join(tmp, "old.txt"), "a")
+            job = job_func.start_job("watch", watch_func._watch_job, tmp, 0.2)
+            started = _wait_for(job, "started")
+            _write(os.path.join(tmp, "new.txt"), "hello")
+            os.remove(os.path.join(tmp, "old.txt"))
+            delta = _wait_for(job, "delta")
+            job.cancel_event.set()
+            _wait_finished(job)
+            return started, delta, job
+    finally:
+        watch_func.InotifyWatch = original
+
+
+def _check_delta(delta):
+    if delta is None:
+        return False
+    added = {f["name"] for f in delta["added"]}
+    removed = {f["name"] for f in delta["removed"]}
+    return "new.txt" in added or "old.txt" in removed
+
+
+def test_polling_backend():
+    """测试轮询方式推送增量"""
+    print("测试轮询监视...")
+
+    def unsupported(path):
+        raise OSError("inotify不可用")
+
+    started, delta, job = _run_watch(unsupported)
+    print(f"   后端: {started and started['backend']}, 增量: {delta}")
+    return started["backend"] == "polling" and _check_delta(delta) and job.status == "cancelled"
+
+
+def test_inotify_backend():
+    """测试inotify方式推送增量（不支持inotify的平台跳过）"""
+    print("测试inotify监视...")
+    started, delta, job = _run_watch(None)
+    print(f"   后端: {started and started['backend']}, 增量: {delta}")
+    if started["backend"] != "inotify":
+        print("   当前平台不支持inotify，跳过")
+        return True
+    return _check_delta(delta) and job.status == "cancelled"
+
+
+def test_watch_replaces_previous():
+    """测试监视新目录时停止之前的监视"""
+    print("测试切换监视目录...")
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        r1 = watch_func.watch_directory(first)
+        r2 = watch_func.watch_directory(second)
+        job1 = job_func.get_job(r1["job_id"])
+        _wait_finished(job1)
+        watch_func.unwatch_directory()
+        job2 = job_func.get_job(r2["job_id"])
+        _wait_finished(job2)
+        print(f"   状态: {job1.status}, {job2.status}")
+        return job1.status == "cancelled" and job2.status == "cancelled"
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试watch_func模块")
+    print("="*50)
+
+    tests = [
+        test_diff_snapshots,
+        test_directory_items_pending,
+        test_polling_backend,
+        test_inotify_backend,
+        test_watch_replaces_previous
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+测试worker_pool.py模块的功能
+"""
+
+import os
+import sys
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import worker_pool
+
+
+def _slow_square(n):
+    # 让后提交的任务先完成，检查结果顺序是否仍与输入一致
+    time.sleep(0.01 * (10 - n))
+    return n * n
+
+
+def test_map_keeps_order():
+    """测试并行结果顺序与输入一致"""
+    print("测试map_in_pool结果顺序...")
+    result = worker_pool.map_in_pool(_slow_square, range(10))
+    print(f"   结果: {result}")
+    return result == [n * n for n in range(10)]
+
+
+def test_nested_map_runs_serially():
+    """测试在池内线程中再次调用时串行执行，不会死锁"""
+    print("测试池内嵌套调用...")
+    result = worker_pool.map_in_pool(lambda n: sum(worker_pool.map_in_pool(_slow_square, range(n))), range(5))
+    print(f"   结果: {result}")
+    return result == [sum(k * k for k in range(n)) for n in range(5)]
+
+
+# 只在父进程中运行时修改；fork出的子进程会继承修改后的值，spawn的子进程重新导入模块
+_parent_state = {"modified": False}
+
+
+def _inherited_parent_state():
+    return _parent_state["modified"]
+
+
+def test_process_pool_uses_spawn():
+    """测试进程池以spawn方式启动子进程，不继承父进程的内存状态"""
+    print("测试进程池启动方式...")
+    _parent_state["modified"] = True
+    inherited = worker_pool.get_process_executor().submit(_inherited_parent_state).result(timeout=60)
+    print(f"   子进程继承父进程状态: {inherited}")
+    return inherited is False
+
+
+def test_max_workers_cached_until_settings_reload():
+    """测试最大线程数只读取一次，配置更新后重新读取并重建线程池"""
+    print("测试最大线程数缓存...")
+    from data_processing.get_yaml import set_config_needs_reload
+    reads = []
+    values = {"max_workers": "3"}
+    original = worker_pool.get_yaml_str_value
+
+    def fake_get_yaml_str_value(path, default=""):
+        reads.append(path)
+        return values["max_workers"]
+
+    worker_pool.get_yaml_str_value = fake_get_yaml_str_value
+    worker_pool._max_workers = None
+    try:
+        first = [worker_pool.get_max_workers() for _ in range(5)]
+        executor = worker_pool.get_io_executor()
+        set_config_needs_reload()
+        unchanged = worker_pool.get_io_executor() is executor
+        values["max_workers"] = "5"
+        set_config_needs_reload()
+        replaced = worker_pool.get_io_executor() is not executor
+        second = worker_pool.get_max_workers()
+    finally:
+        worker_pool.get_yaml_str_value = original
+        worker_pool._max_workers = None
+        worker_pool.shutdown()
+    print(f"   读取次数: {len(reads)}, 线程数: {first[0]} -> {second}")
+    return first == [3] * 5 and second == 5 and len(reads) == 3 and unchanged and replaced
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*50)
+    print("开始测试worker_pool模块")
+    print("="*50)
+
+    tests = [
+        test_map_keeps_order,
+        test_nested_map_runs_serially,
+        test_process_pool_uses_spawn,
+        test_max_workers_cached_until_settings_reload
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                print("   测试失败")
+        except Exception as e:
+            print(f"   测试失败: {e}")
+        print()  # 空行分隔测试结果
+
+    print("="*50)
+    print(f"测试完成: {passed}/{total} 个测试通过")
+    print("="*50)
+
+    return passed == total
+
+if __name__ == "__main__":
+    # 运行所有测试
+    success = run_all_tests()
+
+    if success:
+        print("所有测试通过!")
+    else:
+        print("部分测试失败!")
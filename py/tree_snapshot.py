@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录树快照模块
+将整棵目录树的路径、大小、修改时间和inode保存为紧凑的二进制文件。
+条目按路径排序并使用定长记录，快照通过mmap按需读取，
+两个快照的差异用一次归并扫描得到，耗时与条目数量成线性关系，且不需要把快照载入字典
+
+文件格式（小端）:
+    文件头: 魔数、版本、条目数量、记录区偏移、字符串区偏移、创建时间，之后是根目录路径
+    记录区: 每个条目一条定长记录(路径偏移, 路径长度, 标志, 大小, mtime_ns, inode)
+    字符串区: 各条目相对根目录的路径（/分隔，UTF-8）
+"""
+
+import os
+import mmap
+import time
+import struct
+import hashlib
+import threading
+from pathlib import Path
+
+from response_utils import create_response_dict
+import gitignore_func
+import job_func
+import scan_func
+
+# 快照文件保存目录（与settings.yaml同目录）
+DEFAULT_SNAPSHOT_DIR = os.path.join(Path(__file__).parent.parent, 'data', 'snapshots')
+MAGIC = b"DSNP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQQd")
+RECORD = struct.Struct("<QIIQqQ")
+# 记录中的标志位
+FLAG_DIR = 1
+FLAG_SYMLINK = 2
+# 快照中跳过的版本控制目录
+SKIP_DIRS = {".git", ".svn", ".hg"}
+# 默认最多返回的变化数量
+DEFAULT_MAX_CHANGES = 1000
+# 每个changes事件包含的变化数量
+CHANGES_BATCH_SIZE = 200
+# 默认的快照使用者；不同使用者各自保存快照，互不推进对方的比较基准
+DEFAULT_CONSUMER = "changes"
+
+# 同一根目录的快照不能同时更新
+_update_lock = threading.Lock()
+
+
+def _encode(rel):
+    return rel.encode("utf-8", "surrogateescape")
+
+
+def _sort_key(rel_bytes):
+    """排序键：分隔符替换为\\0，使字节序与逐级比较路径组成部分的顺序一致"""
+    return rel_bytes.replace(b"/", b"\0")
+
+
+def _iter_entries(root, ignore=None, should_stop=None):
+    """
+    遍历目录树，生成(相对路径, 标志, 大小, mtime_ns, inode)，不跟随目录符号链接
+    """
+    stack = [(root, "", None)]
+    while stack:
+        if should_stop is not None and should_stop():
+            return
+        path, prefix, parent_rules = stack.pop()
+        try:
+            entries = scan_func.scan_directory(path)
+        except OSError:
+            continue
+        rules = None
+        if ignore is not None:
+            if parent_rules is None:
+                rules = ignore.rules_for_path(path)
+            else:
+                rules = ignore.rules_for(path, parent_rules, [entry["name"] for entry in entries])
+        for entry in entries:
+            is_dir = not entry["is_file"]
+            if is_dir and entry["name"] in SKIP_DIRS:
+                continue
+            if rules is not None and rules.ignored(entry["path"], is_dir):
+                continue
+            rel = prefix + entry["name"]
+            flags = (FLAG_DIR if is_dir else 0) | (FLAG_SYMLINK if entry["is_symlink"] else 0)
+            yield rel, flags, entry["size"] or 0, entry["mtime_ns"], entry["inode"]
+            if is_dir and not entry["is_symlink"]:
+                stack.append((entry["path"], rel + "/", rules))
+
+
+def write_snapshot(root, snapshot_path, ignore=None, should_stop=None):
+    """
+    遍历目录树并写入快照文件，先写入临时文件再替换，读取中的旧快照不受影响
+
+    Args:
+        root (str): 根目录
+        snapshot_path (str): 快照文件路径
+        ignore (IgnoreMatcher): 可选，gitignore_func的匹配器，被忽略的文件和子树不写入快照
+        should_stop (callable): 返回True时停止遍历，此时不写入快照
+
+    Returns:
+        int: 写入的条目数量，提前停止时返回None
+    """
+    root = os.path.abspath(root)
+    records = []
+    for rel, flags, size, mtime_ns, inode in _iter_entries(root, ignore, should_stop):
+        rel_bytes = _encode(rel)
+        records.append((_sort_key(rel_bytes), rel_bytes, flags, size, mtime_ns, inode))
+    if should_stop is not None and should_stop():
+        return None
+    records.sort(key=lambda record: record[0])
+
+    root_bytes = _encode(root)
+    records_offset = HEADER.size + len(root_bytes)
+    strings_offset = records_offset + RECORD.size * len(records)
+    os.makedirs(os.path.dirname(os.path.abspath(snapshot_path)), exist_ok=True)
+    temp_path = snapshot_path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(records), records_offset, strings_offset, time.time()))
+        file.write(root_bytes)
+        offset = 0
+        for _, rel_bytes, flags, size, mtime_ns, inode in records:
+            file.write(RECORD.pack(offset, len(rel_bytes), flags, size, mtime_ns, inode))
+            offset += len(rel_bytes)
+        for record in records:
+            file.write(record[1])
+    os.replace(temp_path, snapshot_path)
+    return len(records)
+
+
+class TreeSnapshot:
+    """
+    通过mmap读取的目录树快照，条目按下标随机访问
+    """
+
+    def __init__(self, snapshot_path):
+        """
+        Args:
+            snapshot_path (str): 快照文件路径
+
+        Raises:
+            OSError: 文件无法打开
+            ValueError: 文件不是有效的快照
+        """
+        self.path = snapshot_path
+        with open(snapshot_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError("快照文件不完整")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, records_offset, strings_offset, created = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or strings_offset != records_offset + RECORD.size * count:
+            self._map.close()
+            raise ValueError("不是有效的目录树快照")
+        self.count = count
+        self.created = created
+        self.root = self._map[HEADER.size:records_offset].decode("utf-8", "surrogateescape")
+        self._records_offset = records_offset
+        self._strings_offset = strings_offset
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, index):
+        """
+        读取一条记录
+
+        Returns:
+            tuple: (相对路径的字节串, 标志, 大小, mtime_ns, inode)
+        """
+        offset, length, flags, size, mtime_ns, inode = RECORD.unpack_from(
+            self._map, self._records_offset + index * RECORD.size
+        )
+        start = self._strings_offset + offset
+        return self._map[start:start + length], flags, size, mtime_ns, inode
+
+    def entry(self, index):
+        """读取一条记录并解码路径，返回(相对路径, 是否为目录, 大小, mtime_ns, inode)"""
+        rel_bytes, flags, size, mtime_ns, inode = self.record(index)
+        return rel_bytes.decode("utf-8", "surrogateescape"), bool(flags & FLAG_DIR), size, mtime_ns, inode
+
+    def close(self):
+        """释放内存映射"""
+        self._map.close()
+
+
+def _changed(old, new):
+    """同一路径的两条记录是否表示内容发生了变化；目录只比较类型"""
+    if (old[1] ^ new[1]) & (FLAG_DIR | FLAG_SYMLINK):
+        return True
+    if new[1] & FLAG_DIR:
+        return False
+    return old[2] != new[2] or old[3] != new[3] or old[4] != new[4]
+
+
+def _change(kind, record):
+    return {
+        "change": kind,
+        "path": record[0].decode("utf-8", "surrogateescape"),
+        "is_dir": bool(record[1] & FLAG_DIR),
+        "size": record[2]
+    }
+
+
+def merge_snapshots(old, new):
+    """
+    按路径顺序归并两个快照
+
+    Args:
+        old (TreeSnapshot): 第一个快照
+        new (TreeSnapshot): 第二个快照
+
+    Yields:
+        tuple: (第一个快照的记录, 第二个快照的记录)，路径只在一侧存在时另一侧为None，
+            记录格式见TreeSnapshot.record
+    """
+    i = j = 0
+    old_record = old.record(0) if len(old) else None
+    new_record = new.record(0) if len(new) else None
+    while old_record is not None or new_record is not None:
+        if new_record is None:
+            order = -1
+        elif old_record is None:
+            order = 1
+        else:
+            old_key = _sort_key(old_record[0])
+            new_key = _sort_key(new_record[0])
+            order = -1 if old_key < new_key else (1 if old_key > new_key else 0)
+        yield (old_record if order <= 0 else None), (new_record if order >= 0 else None)
+        if order <= 0:
+            i += 1
+            old_record = old.record(i) if i < len(old) else None
+        if order >= 0:
+            j += 1
+            new_record = new.record(j) if j < len(new) else None
+
+
+def diff_snapshots(old, new):
+    """
+    归并比较两个快照，依次生成变化
+
+    文件的大小、mtime或inode（被替换）任一不同即视为修改；目录本身只报告新增和删除
+
+    Args:
+        old (TreeSnapshot): 旧快照
+        new (TreeSnapshot): 新快照
+
+    Yields:
+        dict: 包含change("added"/"removed"/"modified")、path(相对路径)、is_dir和size的变化
+    """
+    for old_record, new_record in merge_snapshots(old, new):
+        if new_record is None:
+            yield _change("removed", old_record)
+        elif old_record is None:
+            yield _change("added", new_record)
+        elif _changed(old_record, new_record):
+            if (old_record[1] ^ new_record[1]) & FLAG_DIR:
+                yield _change("removed", old_record)
+                yield _change("added", new_record)
+            else:
+                yield _change("modified", new_record)
+
+
+def snapshot_path_for(root, snapshot_dir=None, respect_gitignore=False, consumer=DEFAULT_CONSUMER):
+    """
+    获取根目录对应的快照文件路径
+
+    快照按(根目录, 是否跳过忽略的文件, 使用者)区分，不同模式的快照不会互相比较
+
+    Args:
+        root (str): 根目录
+        snapshot_dir (str): 快照保存目录，为None时使用默认目录
+        respect_gitignore (bool): 快照是否跳过.gitignore忽略的文件和子树
+        consumer (str): 快照使用者的名称
+
+    Returns:
+        str: 快照文件路径
+    """
+    key = f"{os.path.abspath(root)}\0{int(bool(respect_gitignore))}\0{consumer}"
+    name = hashlib.blake2b(_encode(key), digest_size=16).hexdigest()
+    return os.path.join(snapshot_dir or DEFAULT_SNAPSHOT_DIR, name + ".snap")
+
+
+def update_snapshot(root, on_change=None, respect_gitignore=False, snapshot_dir=None, should_stop=None,
+                    consumer=DEFAULT_CONSUMER):
+    """
+    生成根目录的新快照，与同一使用者上次保存的快照比较后替换
+
+    Args:
+        root (str): 根目录
+        on_change (callable): on_change(变化)，对每个变化调用一次，变化的格式见diff_snapshots
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+        snapshot_dir (str): 快照保存目录，为None时使用默认目录
+        should_stop (callable): 返回True时停止，此时保留上次的快照
+        consumer (str): 快照使用者的名称
+
+    Returns:
+        dict: entries为新快照的条目数量，baseline表示没有上次的快照（未进行比较），
+            提前停止时返回None
+    """
+    root = os.path.abspath(root)
+    snapshot_path = snapshot_path_for(root, snapshot_dir, respect_gitignore, consumer)
+    new_path = snapshot_path + ".new"
+    ignore = gitignore_func.matcher_for(root) if respect_gitignore else None
+    with _update_lock:
+        count = write_snapshot(root, new_path, ignore, should_stop)
+        if count is None:
+            return None
+        try:
+            previous = TreeSnapshot(snapshot_path)
+        except (OSError, ValueError):
+            previous = None
+        if previous is not None:
+            try:
+                with TreeSnapshot(new_path) as current:
+                    for change in diff_snapshots(previous, current):
+                        if should_stop is not None and should_stop():
+                            return None
+                        if on_change is not None:
+                            on_change(change)
+            finally:
+                # Windows上不能替换仍被映射的文件，关闭映射后再替换
+                previous.close()
+        os.replace(new_path, snapshot_path)
+    return {"entries": count, "baseline": previous is None}
+
+
+def changed_paths(root, respect_gitignore=True, snapshot_dir=None, consumer=DEFAULT_CONSUMER):
+    """
+    获取根目录自同一使用者上次调用以来发生变化的路径（不需要调用git）
+
+    Args:
+        root (str): 根目录
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+        snapshot_dir (str): 快照保存目录，为None时使用默认目录
+        consumer (str): 快照使用者的名称
+
+    Returns:
+        list: 变化的相对路径，第一次调用（没有上次的快照）时返回None
+    """
+    paths = []
+    result = update_snapshot(root, lambda change: paths.append(change["path"]), respect_gitignore, snapshot_dir,
+                             consumer=consumer)
+    return None if result["baseline"] else paths
+
+
+def _changes_job(job, root, respect_gitignore, max_changes):
+    """
+    比较快照的任务：变化通过changes事件分批推送，超过max_changes后只计数
+    """
+    counts = {"added": 0, "removed": 0, "modified": 0}
+    batch = []
+
+    def on_change(change):
+        counts[change["change"]] += 1
+        if sum(counts.values()) <= max_changes:
+            batch.append(change)
+            if len(batch) >= CHANGES_BATCH_SIZE:
+                job.emit("changes", changes=list(batch))
+                batch.clear()
+
+    result = update_snapshot(root, on_change, respect_gitignore, should_stop=lambda: job.cancelled)
+    if result is None:
+        return None
+    if batch:
+        job.emit("changes", changes=batch)
+    result.update(counts)
+    result["root"] = root
+    result["truncated"] = sum(counts.values()) > max_changes
+    return result
+
+
+def get_changes_since_last(root, respect_gitignore=False, max_changes=DEFAULT_MAX_CHANGES):
+    """
+    在后台比较目录树与上次查看时的快照，并保存新的快照
+
+    Args:
+        root (str): 根目录
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+        max_changes (int): 最多推送的变化数量，超出部分只计数
+
+    Returns:
+        dict: 包含job_id的响应字典，变化通过changes事件推送，
+            结果包含added/removed/modified数量，第一次查看时baseline为True
+    """
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    job = job_func.start_job("tree_changes", _changes_job, os.path.abspath(root), bool(respect_gitignore),
+                             max(1, int(max_changes)))
+    return create_response_dict(success=True, job_id=job.job_id)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+磁盘占用报告模块
+基于scan_func.walk_tree的单次遍历生成磁盘占用报告，在后台任务中运行并推送进度
+"""
+
+import os
+import time
+import heapq
+
+from response_utils import create_response_dict
+import format_func
+import gitignore_func
+import job_func
+import scan_func
+
+# 默认返回的最大文件/目录数量
+DEFAULT_TOP_N = 20
+# 推送进度事件的最小间隔（秒）
+PROGRESS_INTERVAL = 0.5
+# 树图默认的深度和每个节点最多保留的子节点数量
+DEFAULT_TREEMAP_DEPTH = 2
+DEFAULT_MAX_CHILDREN = 50
+# 合并较小子节点后生成的节点名称
+OTHER_NODE_NAME = "(其他)"
+
+
+class TopN:
+    """
+    保留最大的N项的有界最小堆，内存占用为O(N)
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self._heap = []
+
+    def push(self, size, path):
+        """
+        加入一项，超出数量时丢弃最小的一项
+
+        Returns:
+            tuple: 被丢弃的(大小, 路径)，没有丢弃时返回None
+        """
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, (size, path))
+            return None
+        if size > self._heap[0][0]:
+            return heapq.heappushpop(self._heap, (size, path))
+        return (size, path)
+
+    def raw_items(self):
+        """按大小从大到小排序的(大小, 路径)列表"""
+        return sorted(self._heap, reverse=True)
+
+    def items(self):
+        """
+        Returns:
+            list: 按大小从大到小排序的条目，每项包含path、size和size_formatted
+        """
+        return [
+            {"path": path, "size": size, "size_formatted": format_func.format_size(size)}
+            for size, path in self.raw_items()
+        ]
+
+
+class Progress:
+    """统计遍历进度，并按时间间隔推送progress事件"""
+
+    def __init__(self, job, root):
+        self.job = job
+        self.root = root
+        self.files = 0
+        self.directories = 0
+        self.bytes = 0
+        self._last_emit = time.monotonic()
+
+    def add_file(self, size):
+        self.files += 1
+        self.bytes += size
+
+    def add_directory(self):
+        self.directories += 1
+        now = time.monotonic()
+        if now - self._last_emit >= PROGRESS_INTERVAL:
+            self._last_emit = now
+            self.emit()
+
+    def emit(self):
+        self.job.emit(
+            "progress",
+            root=self.root,
+            files=self.files,
+            directories=self.directories,
+            bytes=self.bytes,
+            bytes_formatted=format_func.format_size(self.bytes)
+        )
+
+
+def _ignore_matcher(root, respect_gitignore):
+    return gitignore_func.matcher_for(root) if respect_gitignore else None
+
+
+def _largest_items_job(job, root, n, respect_gitignore=False):
+    """
+    遍历目录树，分别保留最大的n个文件和n个目录（不含root本身）
+    """
+    top_files = TopN(n)
+    top_dirs = TopN(n)
+    progress = Progress(job, root)
+
+    def on_file(path, size, depth):
+        progress.add_file(size)
+        top_files.push(size, path)
+
+    def on_dir(path, size, depth):
+        progress.add_directory()
+        if depth > 0:
+            top_dirs.push(size, path)
+
+    total_size = scan_func.walk_tree(root, on_file, on_dir, lambda: job.cancelled,
+                                     _ignore_matcher(root, respect_gitignore))
+    progress.emit()
+    return {
+        "root": root,
+        "total_size": total_size,
+        "total_size_formatted": format_func.format_size(total_size),
+        "file_count": progress.files,
+        "directory_count": progress.directories,
+        "files": top_files.items(),
+        "directories": top_dirs.items(),
+        "complete": not job.cancelled
+    }
+
+
+def get_largest_items(root, n=DEFAULT_TOP_N, respect_gitignore=False):
+    """
+    在后台统计目录树中最大的N个文件和N个目录
+
+    Args:
+        root (str): 根目录
+        n (int): 返回的文件和目录数量
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+
+    Returns:
+        dict: 包含job_id的响应字典，遍历期间推送progress事件，结果在任务结束事件的result中
+    """
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    job = job_func.start_job("largest_items", _largest_items_job, os.path.abspath(root), max(1, int(n)),
+                             bool(respect_gitignore))
+    return create_response_dict(success=True, job_id=job.job_id)
+
+
+class _TreemapChildren:
+    """
+    树图节点的子节点集合，只保留最大的max_children项，其余合并为一个节点
+    """
+
+    def __init__(self, max_children):
+        self.top = TopN(max_children)
+        self.nodes = {}
+        self.other_size = 0
+        self.other_count = 0
+
+    def add(self, node):
+        key = (node["type"], node["name"])
+        self.nodes[key] = node
+        dropped = self.top.push(node["size"], key)
+        if dropped is not None:
+            self.nodes.pop(dropped[1], None)
+            self.other_size += dropped[0]
+            self.other_count += 1
+
+    def to_list(self):
+        children = [self.nodes[key] for _, key in self.top.raw_items()]
+        if self.other_count:
+            children.append({
+                "name": OTHER_NODE_NAME,
+                "type": "other",
+                "size": self.other_size,
+                "count": self.other_count
+            })
+        return children
+
+
+def _treemap_job(job, root, max_depth, max_children, respect_gitignore=False):
+    """
+    单次遍历生成深度不超过max_depth的目录树聚合大小
+
+    深度小于max_depth的目录节点包含children（子目录节点和文件叶子），
+    深度等于max_depth的目录节点只包含聚合大小
+    """
+    progress = Progress(job, root)
+    # 目录路径到其子节点集合的映射，只保存当前遍历路径上深度小于max_depth的目录
+    pending = {}
+
+    def children_of(path):
+        children = pending.get(path)
+        if children is None:
+            children = pending[path] = _TreemapChildren(max_children)
+        return children
+
+    def on_file(path, size, depth):
+        progress.add_file(size)
+        if depth < max_depth:
+            children_of(os.path.dirname(path)).add(
+                {"name": os.path.basename(path), "type": "file", "size": size}
+            )
+
+    def on_dir(path, size, depth):
+        progress.add_directory()
+        if depth > max_depth:
+            return
+        node = {"name": os.path.basename(path) or path, "type": "dir", "size": size}
+        if depth < max_depth:
+            children = pending.pop(path, None)
+            node["children"] = children.to_list() if children is not None else []
+        if depth == 0:
+            node["path"] = path
+            tree.append(node)
+        else:
+            children_of(os.path.dirname(path)).add(node)
+
+    tree = []
+    scan_func.walk_tree(root, on_file, on_dir, lambda: job.cancelled, _ignore_matcher(root, respect_gitignore))
+    progress.emit()
+    return {
+        "tree": tree[0],
+        "depth": max_depth,
+        "file_count": progress.files,
+        "directory_count": progress.directories,
+        "complete": not job.cancelled
+    }
+
+
+def get_treemap(root, depth=DEFAULT_TREEMAP_DEPTH, max_children=DEFAULT_MAX_CHILDREN, respect_gitignore=False):
+    """
+    在后台单次遍历目录树，生成用于树图/旭日图的嵌套聚合大小
+
+    Args:
+        root (str): 根目录
+        depth (int): 展开的目录深度，root为0
+        max_children (int): 每个节点最多保留的子节点数量，其余合并为"(其他)"节点
+        respect_gitignore (bool): 是否跳过.gitignore忽略的文件和子树
+
+    Returns:
+        dict: 包含job_id的响应字典，结果在任务结束事件的result中，
+            result["tree"]为根节点，每个节点包含name、type(dir/file/other)、size，
+            展开的目录节点另外包含children
+    """
+    if not os.path.isdir(root):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    job = job_func.start_job(
+        "treemap", _treemap_job, os.path.abspath(root), max(0, int(depth)), max(1, int(max_children)),
+        bool(respect_gitignore)
+    )
+    return create_response_dict(success=True, job_id=job.job_id)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录监视模块
+监视当前打开的目录：Linux下使用inotify，其他平台定期比较scandir快照。
+目录发生变化时使相关的列表、快照、大小和行索引缓存失效，
+并把新增/删除/修改的条目作为增量推送到页面，页面无需重新调用get_files
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import threading
+from datetime import datetime
+
+from response_utils import create_response_dict
+import disk_func
+import format_func
+import job_func
+import scan_func
+import size_index
+import line_index
+import listing_cache
+import listing_snapshot
+
+# 轮询方式检查目录的间隔（秒）
+DEFAULT_POLL_INTERVAL = 2.0
+# 收到inotify事件后等待后续事件的时间（秒），合并短时间内的连续修改
+DEBOUNCE_DELAY = 0.2
+# 合并事件的最长等待时间（秒）
+DEBOUNCE_MAX_DELAY = 1.0
+# 监视任务最多保留的事件数量
+MAX_WATCH_EVENTS = 1000
+
+# inotify事件掩码
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct('iIII')
+
+_current_job = None
+_current_lock = threading.Lock()
+
+
+class InotifyWatch:
+    """
+    基于inotify的单目录监视（通过ctypes调用libc，不依赖第三方库）
+
+    不支持inotify时构造函数抛出OSError，调用方应退回到轮询方式
+    """
+
+    def __init__(self, path):
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith('linux'):
+            raise OSError("当前平台不支持inotify")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("libc不支持inotify")
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1失败")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, "inotify_add_watch失败")
+
+    def _read_events(self):
+        """读取当前可读的全部事件，返回(掩码, 名称)列表"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b'\0')
+                offset += name_len
+                events.append((mask, os.fsdecode(name)))
+        return events
+
+    def wait(self, timeout):
+        """
+        等待目录发生变化
+
+        Args:
+            timeout (float): 最长等待时间（秒）
+
+        Returns:
+            bool: 目录内容有变化时为True，超时为False；目录本身被删除或移动时返回None
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        events = self._read_events()
+        # 合并短时间内的连续事件
+        deadline = time.monotonic() + DEBOUNCE_MAX_DELAY
+        while time.monotonic() < deadline:
+            ready, _, _ = select.select([self.fd], [], [], DEBOUNCE_DELAY)
+            if not ready:
+                break
+            events.extend(self._read_events())
+        if any(mask & (IN_DELETE_SELF | IN_MOVE_SELF) for mask, _ in events):
+            return None
+        # 事件队列溢出时丢失了部分事件，同样需要重新扫描
+        return any(name or mask & IN_Q_OVERFLOW for mask, name in events)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatch:
+    """基于定期比较scandir快照的单目录监视"""
+
+    def __init__(self, path, interval=DEFAULT_POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.next_check = time.monotonic() + interval
+
+    def wait(self, timeout):
+        """
+        等待到下一次轮询时间（最多timeout秒）
+
+        Returns:
+            bool: 到达轮询时间、需要重新扫描比较时为True；目录不存在时返回None
+        """
+        remaining = self.next_check - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return False
+        time.sleep(max(0.0, remaining))
+        self.next_check = time.monotonic() + self.interval
+        if not os.path.isdir(self.path):
+            return None
+        return True
+
+    def close(self):
+        pass
+
+
+def take_snapshot(path):
+    """
+    扫描目录并生成用于比较的快照
+
+    Returns:
+        dict: 条目名称到扫描信息的映射
+    """
+    return {entry["name"]: entry for entry in scan_func.scan_directory(path)}
+
+
+def diff_snapshots(old, new):
+    """
+    比较两个目录快照
+
+    Returns:
+        tuple: (新增条目列表, 删除条目列表, 修改条目列表)，条目均为扫描信息
+    """
+    added = [new[name] for name in sorted(new.keys() - old.keys())]
+    removed = [old[name] for name in sorted(old.keys() - new.keys())]
+    modified = []
+    for name in sorted(new.keys() & old.keys()):
+        before, after = old[name], new[name]
+        if (before["is_file"], before["size"], before["mtime"], before["inode"]) != \
+                (after["is_file"], after["size"], after["mtime"], after["inode"]):
+            modified.append(after)
+    return added, removed, modified
+
+
+def _to_item(entry):
+    """
+    将扫描信息转换为与get_files(async_sizes=True)一致的条目格式，
+    目录的大小标记为待计算（size_pending），由后台大小任务推送
+    """
+    item = {
+        "name": entry["name"],
+        "path": entry["path"],
+        "size": entry["size"] if entry["is_file"] else None,
+        "modified_time": datetime.fromtimestamp(entry["mtime"]).strftime('%Y-%m-%d %H:%M:%S'),
+        "is_file": entry["is_file"]
+    }
+    if entry["is_file"]:
+        item["size_formatted"] = format_func.format_size(entry["size"])
+    else:
+        item["size_pending"] = True
+        item["size_formatted"] = "计算中... (目录)"
+    return item
+
+
+def invalidate_caches(path, changed_entries=(), removed_paths=()):
+    """
+    使目录相关的缓存失效
+
+    Args:
+        path (str): 发生变化的目录
+        changed_entries (iterable): 新增或修改的条目
+        removed_paths (iterable): 被删除条目的路径
+    """
+    listing_cache.invalidate_listing(path)
+    listing_snapshot.drop_snapshots(path)
+    # 原地修改文件不会改变目录mtime，需要显式让该目录的大小重新统计
+    size_index.invalidate_directory_size(path)
+    for entry in changed_entries:
+        if entry["is_file"]:
+            line_index.drop_line_index(entry["path"])
+        else:
+            listing_cache.invalidate_listing(entry["path"])
+            size_index.invalidate_directory_size(entry["path"])
+    for removed_path in removed_paths:
+        line_index.drop_line_index(removed_path)
+        listing_cache.invalidate_listing(removed_path)
+
+
+def _watch_job(job, path, poll_interval):
+    """
+    监视任务：目录变化时推送delta事件，目录被删除时推送gone事件并结束
+    """
+    try:
+        watch = InotifyWatch(path)
+        backend = "inotify"
+    except OSError:
+        watch = PollingWatch(path, poll_interval)
+        backend = "polling"
+    try:
+        snapshot = take_snapshot(path)
+        job.emit("started", path=path, backend=backend)
+        while not job.cancelled:
+            changed = watch.wait(0.5)
+            if changed is None:
+                invalidate_caches(path)
+                job.emit("gone", path=path)
+                break
+            if not changed:
+                continue
+            try:
+                new_snapshot = take_snapshot(path)
+            except OSError:
+                continue
+            added, removed, modified = diff_snapshots(snapshot, new_snapshot)
+            snapshot = new_snapshot
+            if not (added or removed or modified):
+                continue
+            invalidate_caches(path, added + modified, [entry["path"] for entry in removed])
+            pending_dirs = [entry["path"] for entry in added + modified if not entry["is_file"]]
+            job.emit(
+                "delta",
+                path=path,
+                added=[_to_item(entry) for entry in added],
+                removed=[{"name": entry["name"], "path": entry["path"]} for entry in removed],
+                modified=[_to_item(entry) for entry in modified],
+                size_job_id=disk_func.start_size_job(pending_dirs).job_id if pending_dirs else None
+            )
+    finally:
+        watch.close()
+    return {"path": path, "backend": backend}
+
+
+def watch_directory(path, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    开始监视目录，同时停止之前的监视
+
+    Args:
+        path (str): 目录路径
+        poll_interval (float): 不支持inotify时的轮询间隔（秒）
+
+    Returns:
+        dict: 包含job_id的响应字典，增量通过任务的delta事件推送
+    """
+    global _current_job
+    if not os.path.isdir(path):
+        return create_response_dict(success=False, error="指定路径不是目录")
+    with _current_lock:
+        if _current_job is not None:
+            _current_job.cancel_event.set()
+        _current_job = job_func.start_job(
+            "watch", _watch_job, os.path.abspath(path), max(0.2, float(poll_interval)),
+            max_events=MAX_WATCH_EVENTS
+        )
+        return create_response_dict(success=True, job_id=_current_job.job_id)
+
+
+def unwatch_directory():
+    """
+    停止当前的目录监视
+
+    Returns:
+        dict: 响应字典
+    """
+    global _current_job
+    with _current_lock:
+        if _current_job is not None:
+            _current_job.cancel_event.set()
+            _current_job = None
+    return create_response_dict(success=True, message="已停止监视目录")
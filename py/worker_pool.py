@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+磁盘IO线程池模块
+提供进程内共享的有界线程池，所有窗口和API调用的磁盘任务都提交到同一个池中，
+从而限制同时访问磁盘的线程总数；CPU密集的任务（内容搜索等）使用共享的进程池
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from data_processing.get_yaml import get_yaml_str_value, add_reload_listener
+
+# 配置项：userSettings.disk.max_workers，未配置时使用默认值
+MAX_WORKERS_KEY = "userSettings.disk.max_workers"
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_executor = None
+_process_executor = None
+# 缓存的最大线程数，首次使用时读取配置，配置更新后重新读取
+_max_workers = None
+_executor_lock = threading.Lock()
+# 标记当前线程是否为池内工作线程，避免在池内再次等待池任务导致死锁
+_worker_state = threading.local()
+
+
+def _read_max_workers():
+    try:
+        max_workers = int(get_yaml_str_value(MAX_WORKERS_KEY, default=str(DEFAULT_MAX_WORKERS)))
+    except ValueError:
+        max_workers = DEFAULT_MAX_WORKERS
+    return max(1, max_workers)
+
+
+def get_max_workers():
+    """
+    获取线程池的最大线程数，只在首次调用和配置更新后读取配置
+
+    Returns:
+        int: 最大线程数，至少为1
+    """
+    global _max_workers
+    if _max_workers is None:
+        _max_workers = _read_max_workers()
+    return _max_workers
+
+
+def reload_settings():
+    """
+    配置更新后重新读取最大线程数，数值变化时关闭现有的线程池和进程池，
+    下次使用时按新的数量创建（已提交的任务继续执行）
+    """
+    global _max_workers, _executor, _process_executor
+    if _max_workers is None:
+        # 还没有读取过配置，首次使用时自然会读到新值
+        return
+    max_workers = _read_max_workers()
+    with _executor_lock:
+        if max_workers == _max_workers:
+            return
+        _max_workers = max_workers
+        executors = (_executor, _process_executor)
+        _executor = _process_executor = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _mark_worker():
+    _worker_state.in_pool = True
+
+
+def in_worker_thread():
+    """当前线程是否为磁盘IO线程池的工作线程"""
+    return getattr(_worker_state, 'in_pool', False)
+
+
+def get_io_executor():
+    """获取全局磁盘IO线程池（首次调用时创建）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_max_workers(),
+                thread_name_prefix="disk-io",
+                initializer=_mark_worker
+            )
+        return _executor
+
+
+def get_process_executor():
+    """
+    获取全局进程池（首次调用时创建），进程数与线程池的最大线程数相同
+
+    提交的函数和参数必须可以pickle，即模块级函数和基本类型。
+    子进程总是以spawn方式启动：fork会复制GUI线程、线程池和已打开的SQLite连接的状态，
+    在多线程进程中可能导致子进程死锁
+    """
+    global _process_executor
+    with _executor_lock:
+        if _process_executor is None:
+            _process_executor = ProcessPoolExecutor(
+                max_workers=get_max_workers(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_executor
+
+
+def map_in_pool(func, items):
+    """
+    在全局线程池中并行执行func，结果顺序与items一致
+
+    只有一个任务、线程池只有一个线程或已经在池内线程中时直接串行执行
+
+    Args:
+        func (callable): 处理单个元素的函数
+        items (iterable): 待处理的元素
+
+    Returns:
+        list: 与items顺序一致的结果列表
+    """
+    items = list(items)
+    if len(items) <= 1 or in_worker_thread() or get_max_workers() <= 1:
+        return [func(item) for item in items]
+    return list(get_io_executor().map(func, items))
+
+
+def shutdown():
+    """关闭全局线程池和进程池"""
+    global _executor, _process_executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _process_executor is not None:
+            _process_executor.shutdown(wait=False, cancel_futures=True)
+            _process_executor = None
+
+
+add_reload_listener(reload_settings)